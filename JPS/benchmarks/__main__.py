@@ -0,0 +1,477 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import click
+import pandas as pd
+
+from benchmarks.corpus import DEFAULT_CHECKPOINT_DIR, bucket_report, map_report, run_corpus
+from benchmarks.generators import GENERATORS, WEIGHTED_ONLY, write_map_set
+from benchmarks.harness import (
+    MapSet,
+    ScenarioSet,
+    SyntheticSet,
+    engine_names,
+    git_revision,
+    machine_info,
+    peak_memory,
+    pin_cpu,
+    run_benchmark,
+    summarize,
+    to_json,
+)
+from benchmarks.helpers import REPO_PATH, save_rows
+from benchmarks.micro import CASES, DEFAULT_BASELINE, load_baseline, run_micro
+from benchmarks.micro import save_baseline as save_baseline_file
+from benchmarks.replay import TIMING_MODES, format_histogram, latency_histogram, read_query_log, replay, summarize_replay
+from benchmarks.store import DEFAULT_DB, BenchmarkStore, compare_revisions, machine_fingerprint
+from pathfinding.engines import WEIGHTED_ENGINES, get_engine
+
+SYNTHETIC_DIR = REPO_PATH / "artifacts" / "JPS" / "synthetic"
+
+db_option = click.option(
+    "--db", type=click.Path(dir_okay=False), default=str(DEFAULT_DB), show_default=True, help="SQLite benchmark store."
+)
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command(help="Time engines over .scen sets and synthetic maps and write a JSON report.")
+@click.option("--engine", "-e", "engines", type=click.Choice(engine_names()), multiple=True, default=("astar", "jps"), show_default=True)
+@click.option("--scen", "-s", "scens", type=click.Path(exists=True), multiple=True, help="A .scen file or a directory of them.")
+@click.option("--synthetic", "synthetics", type=str, multiple=True, help="Synthetic map spec, e.g. random:256:0.2.")
+@click.option("--queries", type=int, default=20, show_default=True, help="Queries per synthetic map.")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--max-problems", type=int, default=None, help="Last N problems of every .scen file (the hardest ones).")
+@click.option("--weighted-oracle", is_flag=True, help="Check weighted engines on .scen maps with an exact Dijkstra oracle.")
+@click.option("--warmup", type=int, default=1, show_default=True, help="Untimed runs per query.")
+@click.option("--repeat", type=int, default=5, show_default=True, help="Timed runs per query.")
+@click.option("--gc/--no-gc", "keep_gc", default=False, show_default=True, help="Leave the garbage collector on while timing.")
+@click.option("--cpu", type=int, default=None, help="Pin the process to this CPU.")
+@click.option("--per-query", is_flag=True, help="Include every query and its raw timings in the JSON.")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True), default="-", show_default=True)
+@click.option("--record", is_flag=True, help="Store the raw samples in --db under the current git revision.")
+@db_option
+def run(
+    engines: Tuple[str, ...],
+    scens: Tuple[str, ...],
+    synthetics: Tuple[str, ...],
+    queries: int,
+    seed: int,
+    max_problems: Optional[int],
+    weighted_oracle: bool,
+    warmup: int,
+    repeat: int,
+    keep_gc: bool,
+    cpu: Optional[int],
+    per_query: bool,
+    output: str,
+    record: bool,
+    db: str,
+) -> None:
+    if not scens and not synthetics:
+        raise click.UsageError("Give at least one --scen or --synthetic source.")
+    try:
+        if cpu is not None:
+            pin_cpu(cpu)
+        map_sets: List[MapSet] = [ScenarioSet(path, max_problems, weighted_oracle) for path in scens]
+        map_sets += [SyntheticSet(spec, queries, seed) for spec in synthetics]
+        measurements = run_benchmark(map_sets, engines, warmup=warmup, repeat=repeat, disable_gc=not keep_gc)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+
+    settings = {
+        "engines": list(engines),
+        "scens": list(scens),
+        "synthetic": list(synthetics),
+        "queries": queries,
+        "seed": seed,
+        "max_problems": max_problems,
+        "warmup": warmup,
+        "repeat": repeat,
+        "gc_disabled": not keep_gc,
+        "cpu": cpu,
+    }
+    report = to_json(measurements, settings, per_query=per_query)
+    if record:
+        with BenchmarkStore(db) as store:
+            run_id = store.record_run(measurements, settings, revision=report["revision"])  # type: ignore[arg-type]
+        click.echo(f"Recorded run {run_id} in {db}", err=True)
+    text = json.dumps(report, indent=2)
+    if output == "-":
+        click.echo(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    mismatches = 0
+    for row in report["summary"]:  # type: ignore[union-attr]
+        mismatches += row["mismatches"]
+        click.echo(
+            f"{row['engine']:>8} {row['source']:<24} p50={row['p50'] * 1e3:.3f}ms p95={row['p95'] * 1e3:.3f}ms "
+            f"p99={row['p99'] * 1e3:.3f}ms qps={row['queries_per_sec']:.1f} exp/s={row['expansions_per_sec']:.0f} "
+            f"checked={row['checked']} mismatches={row['mismatches']}",
+            err=True,
+        )
+    if mismatches:
+        click.echo(f"{mismatches} queries did not match the optimal length", err=True)
+        sys.exit(1)
+
+
+@cli.command(help="Flag statistically significant slowdowns of CANDIDATE against BASELINE (git revisions or prefixes).")
+@click.option("--baseline", "-b", required=True, help="Baseline revision.")
+@click.option("--candidate", "-c", default=None, help="Candidate revision; the latest stored run by default.")
+@click.option("--machine", default=None, help="Machine fingerprint; this machine by default.")
+@click.option("--any-machine", is_flag=True, help="Pool runs from every machine.")
+@click.option("--alpha", type=float, default=0.01, show_default=True, help="Significance level of the Mann-Whitney U test.")
+@click.option("--min-effect", type=float, default=0.05, show_default=True, help="Smallest relative median change to report.")
+@db_option
+def compare(
+    baseline: str,
+    candidate: Optional[str],
+    machine: Optional[str],
+    any_machine: bool,
+    alpha: float,
+    min_effect: float,
+    db: str,
+) -> None:
+    if not any_machine:
+        machine = machine or machine_fingerprint()
+    else:
+        machine = None
+    try:
+        with BenchmarkStore(db) as store:
+            baseline = store.resolve_revision(baseline)
+            candidate = store.resolve_revision(candidate) if candidate else store.latest_revision(machine)
+            results = compare_revisions(store, baseline, candidate, machine=machine, alpha=alpha, min_effect=min_effect)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    if not results:
+        raise click.ClickException(f"No common benchmark keys between {baseline[:10]} and {candidate[:10]}")
+
+    click.echo(f"baseline {baseline[:10]} -> candidate {candidate[:10]}")
+    regressions = 0
+    for row in results:
+        status = "REGRESSION" if row.regression else "improved" if row.improvement else "ok"
+        regressions += row.regression
+        bucket = "" if row.bucket is None else f" bucket={row.bucket}"
+        click.echo(
+            f"{status:>10} {row.engine:>8} {row.source}/{row.map_name}{bucket}: "
+            f"{row.baseline_median * 1e3:.3f}ms -> {row.candidate_median * 1e3:.3f}ms "
+            f"(x{row.ratio:.3f}, p={row.p_value:.2g}, n={row.baseline_samples}/{row.candidate_samples})"
+        )
+    if regressions:
+        click.echo(f"{regressions} significant regressions", err=True)
+        sys.exit(1)
+
+
+@cli.command(help="Plot median/p95 time and expansions of every stored run over time.")
+@click.option("--engine", "-e", default=None)
+@click.option("--source", "-s", default=None)
+@click.option("--machine", default=None, help="Only runs from this machine fingerprint.")
+@click.option("--title", default="benchmark_trend", show_default=True)
+@db_option
+def trend(engine: Optional[str], source: Optional[str], machine: Optional[str], title: str, db: str) -> None:
+    from benchmarks.plot_graphics import plot_trend
+
+    with BenchmarkStore(db) as store:
+        rows = store.trend(engine=engine, source=source, machine=machine)
+    if not rows:
+        raise click.ClickException("No stored runs match the filters")
+    df = pd.DataFrame(rows)
+    df["series"] = df["engine"] + " | " + df["source"]
+    click.echo(f"Saved trend plot to {plot_trend(df, ['median_time', 'p95_time', 'mean_expanded'], title)}")
+
+
+@cli.command(help="Write a generated MovingAI .map with a .scen of oracle optimal lengths.")
+@click.option("--generator", "-g", type=click.Choice(GENERATORS), default="random", show_default=True)
+@click.option("--size", type=int, default=1024, show_default=True)
+@click.option("--density", type=float, default=0.2, show_default=True, help="Obstacles (random, terrain), clutter (rooms) or loops (maze).")
+@click.option("--terrains", type=int, default=4, show_default=True, help="Terrain kinds of the terrain generator.")
+@click.option("--queries", type=int, default=50, show_default=True)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--out-dir", "-o", type=click.Path(file_okay=False), default=str(SYNTHETIC_DIR), show_default=True)
+def generate(generator: str, size: int, density: float, terrains: int, queries: int, seed: int, out_dir: str) -> None:
+    try:
+        scen_path = write_map_set(out_dir, generator, size, density, seed, queries, terrains=terrains, overwrite=True)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(scen_path)
+
+
+@cli.command(help="Time engines on generated maps over a grid of sizes and densities and plot how they scale.")
+@click.option("--generator", "-g", type=click.Choice(GENERATORS), default="random", show_default=True)
+@click.option("--size", "sizes", type=int, multiple=True, default=(64, 128, 256), show_default=True)
+@click.option("--density", "densities", type=float, multiple=True, default=(0.1, 0.2), show_default=True)
+@click.option("--terrains", type=int, default=4, show_default=True)
+@click.option("--engine", "-e", "engines", type=click.Choice(engine_names()), multiple=True, default=("astar", "jps"), show_default=True)
+@click.option("--queries", type=int, default=10, show_default=True, help="Queries per map.")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--warmup", type=int, default=1, show_default=True)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--memory/--no-memory", default=True, show_default=True, help="Measure peak traced memory per query.")
+@click.option("--cache-dir", type=click.Path(file_okay=False), default=str(SYNTHETIC_DIR), show_default=True)
+@click.option("--title", default=None, help="CSV and plot name; derived from the generator by default.")
+def sweep(
+    generator: str,
+    sizes: Tuple[int, ...],
+    densities: Tuple[float, ...],
+    terrains: int,
+    engines: Tuple[str, ...],
+    queries: int,
+    seed: int,
+    warmup: int,
+    repeat: int,
+    memory: bool,
+    cache_dir: str,
+    title: Optional[str],
+) -> None:
+    from benchmarks.plot_graphics import plot_scaling
+
+    if generator in WEIGHTED_ONLY:
+        engines = tuple(e for e in engines if e in WEIGHTED_ENGINES)
+        if not engines:
+            raise click.UsageError(f"The {generator} generator needs at least one weighted engine.")
+    # Generated maps write "." with weight 1, so their lengths hold for both
+    # representations; terrain lengths are weighted only.
+    lengths_for = (True,) if generator in WEIGHTED_ONLY else (False, True)
+    title = title or f"sweep_{generator}"
+    rows = []
+    mismatches = 0
+    for size in sizes:
+        for density in densities:
+            try:
+                scen_path = write_map_set(cache_dir, generator, size, density, seed, queries, terrains=terrains)
+                map_set = ScenarioSet(scen_path, lengths_for=lengths_for)
+                measurements = run_benchmark([map_set], engines, warmup=warmup, repeat=repeat)
+            except ValueError as exc:
+                raise click.ClickException(str(exc)) from exc
+            peaks = {}
+            if memory:
+                for map_name, map_queries in map_set.maps():
+                    for engine in engines:
+                        search, weighted = get_engine(engine)
+                        grid = map_set.load(map_name, weighted)
+                        peaks[engine] = sum(peak_memory(search, grid, q) for q in map_queries) / len(map_queries)
+            for row in summarize(measurements):
+                engine = str(row["engine"])
+                group = [m for m in measurements if m.engine == engine]
+                mean_expanded = sum(m.expanded for m in group) / len(group)
+                mismatches += int(row["mismatches"])  # type: ignore[call-overload]
+                rows.append({
+                    "generator": generator,
+                    "size": size,
+                    "density": density,
+                    "engine": engine,
+                    "queries": row["queries"],
+                    "mean_time": row["mean"],
+                    "p95_time": row["p95"],
+                    "mean_expanded": mean_expanded,
+                    "peak_memory": peaks.get(engine),
+                    "bytes_per_expanded": peaks[engine] / max(mean_expanded, 1) if engine in peaks else None,
+                    "mismatches": row["mismatches"],
+                })
+                click.echo(
+                    f"{generator} size={size} density={density:g} {engine:>8} mean={row['mean'] * 1e3:.3f}ms "  # type: ignore[operator]
+                    f"expanded={rows[-1]['mean_expanded']:.0f}"
+                    + (f" peak={peaks[engine] / 1024:.0f}KiB" if engine in peaks else "")
+                    + f" mismatches={row['mismatches']}",
+                    err=True,
+                )
+    save_rows(rows, title)
+    df = pd.DataFrame(rows)
+    metrics = ["mean_time", "mean_expanded"] + (["peak_memory", "bytes_per_expanded"] if memory else [])
+    click.echo(f"Saved scaling plot to {plot_scaling(df, metrics, title)}")
+    if mismatches:
+        click.echo(f"{mismatches} queries did not match the optimal length", err=True)
+        sys.exit(1)
+
+
+@cli.command(help="Per-call nanoseconds of the search primitives, compared with the stored baseline of this machine.")
+@click.option("--case", "-c", "cases", type=click.Choice(list(CASES)), multiple=True, help="Only these primitives.")
+@click.option("--processes", type=int, default=3, show_default=True, help="Fresh interpreters, run one after another.")
+@click.option("--samples", type=int, default=7, show_default=True, help="Samples per process.")
+@click.option("--min-time", type=float, default=0.05, show_default=True, help="Seconds per sample after calibration.")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--baseline", "baseline_path", type=click.Path(dir_okay=False), default=str(DEFAULT_BASELINE), show_default=True)
+@click.option("--save-baseline", is_flag=True, help="Store these results as the baseline of this machine.")
+@click.option("--threshold", type=float, default=0.1, show_default=True, help="Relative slowdown reported as a regression.")
+@click.option("--fail-on-regression", is_flag=True)
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True), default=None, help="Also write the results as JSON.")
+def micro(
+    cases: Tuple[str, ...],
+    processes: int,
+    samples: int,
+    min_time: float,
+    seed: int,
+    baseline_path: str,
+    save_baseline: bool,
+    threshold: float,
+    fail_on_regression: bool,
+    output: Optional[str],
+) -> None:
+    machine = machine_fingerprint()
+    try:
+        results = run_micro(cases or None, processes=processes, samples=samples, min_time=min_time, seed=seed)
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    baseline = load_baseline(baseline_path, machine)
+    regressions = 0
+    for result in results:
+        result.baseline_ns = baseline.get(result.name)
+        ratio = result.ratio
+        status = ""
+        if ratio is not None:
+            regressed = ratio > 1.0 + threshold
+            regressions += regressed
+            status = f"  baseline={result.baseline_ns:.1f}ns x{ratio:.3f}" + ("  REGRESSION" if regressed else "")
+        click.echo(
+            f"{result.name:<40} {result.median_ns:>12.1f} ns/call  +-{result.stdev_ns:.1f}  "
+            f"n={result.samples} outliers={result.outliers}{status}"
+        )
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump({"machine": machine, "results": [dict(vars(r), ratio=r.ratio) for r in results]}, f, indent=2)
+    if save_baseline:
+        save_baseline_file(baseline_path, machine, results, git_revision())
+        click.echo(f"Saved baseline for machine {machine} to {baseline_path}", err=True)
+    if regressions:
+        click.echo(f"{regressions} primitives are slower than the baseline by more than {threshold:.0%}", err=True)
+        if fail_on_regression:
+            sys.exit(1)
+
+
+@cli.command(name="replay", help="Replay a JSONL query log against an engine and report the latency distribution.")
+@click.argument("log_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--engine", "-e", type=click.Choice(engine_names()), default=None, help="Serve every query with this engine instead of the logged algorithm.")
+@click.option("--timing", type=click.Choice(TIMING_MODES), default="max", show_default=True, help="Submit all queries at once, or at their logged inter-arrival times.")
+@click.option("--speed", type=float, default=1.0, show_default=True, help="Time compression of --timing original.")
+@click.option("--concurrency", "-c", type=int, default=1, show_default=True, help="Worker processes serving queries.")
+@click.option("--map-dir", type=click.Path(exists=True, file_okay=False), default=None, help="Base of relative map paths; the log's directory by default.")
+@click.option("--terrain-weights", "terrain_weights_path", type=click.Path(exists=True, dir_okay=False), default=None)
+@click.option("--limit", type=int, default=None, help="Only the first N queries of the log.")
+@click.option("--bins", type=int, default=16, show_default=True, help="Latency histogram buckets.")
+@click.option("--per-query", is_flag=True, help="Include every query in the JSON.")
+@click.option("--output", "-o", type=click.Path(dir_okay=False, writable=True), default="-", show_default=True)
+def replay_log(
+    log_path: str,
+    engine: Optional[str],
+    timing: str,
+    speed: float,
+    concurrency: int,
+    map_dir: Optional[str],
+    terrain_weights_path: Optional[str],
+    limit: Optional[int],
+    bins: int,
+    per_query: bool,
+    output: str,
+) -> None:
+    try:
+        queries = read_query_log(log_path, map_dir)[:limit]
+        if not queries:
+            raise ValueError(f"No queries in {log_path}")
+        results, wall_time = replay(queries, engine, timing, concurrency, speed, terrain_weights_path)
+    except (OSError, ValueError) as exc:
+        raise click.ClickException(str(exc)) from exc
+    summary = summarize_replay(results, wall_time, bins)
+    report: Dict[str, object] = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "machine": machine_info(),
+        "settings": {
+            "log": log_path,
+            "engine": engine,
+            "timing": timing,
+            "speed": speed,
+            "concurrency": concurrency,
+            "limit": limit,
+        },
+        "summary": summary,
+    }
+    if per_query:
+        report["queries"] = [dict(vars(r), cost=r.cost if math.isfinite(r.cost) else None) for r in results]
+    text = json.dumps(report, indent=2)
+    if output == "-":
+        click.echo(text)
+    else:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    latency = summary["latency"]
+    service = summary["service"]
+    click.echo(format_histogram(latency_histogram([r.latency for r in results], bins)), err=True)
+    click.echo(
+        f"{len(results)} queries in {wall_time:.3f}s ({summary['throughput']:.1f} q/s); "
+        f"latency p50={latency['p50'] * 1e3:.3f}ms p99={latency['p99'] * 1e3:.3f}ms max={latency['max'] * 1e3:.3f}ms; "  # type: ignore[index]
+        f"service p50={service['p50'] * 1e3:.3f}ms p99={service['p99'] * 1e3:.3f}ms",  # type: ignore[index]
+        err=True,
+    )
+
+
+@cli.command(help="Run every problem of every .scen file, resumably, and report time and expansions per bucket.")
+@click.option("--scen", "-s", "scens", type=click.Path(exists=True), multiple=True, required=True, help="A .scen file or a directory of them.")
+@click.option("--engine", "-e", "engines", type=click.Choice(engine_names()), multiple=True, default=("astar", "jps"), show_default=True)
+@click.option("--processes", "-p", type=int, default=1, show_default=True, help="Worker processes, one .scen file per task.")
+@click.option("--warmup", type=int, default=0, show_default=True)
+@click.option("--repeat", type=int, default=1, show_default=True)
+@click.option("--weighted-oracle", is_flag=True, help="Check weighted engines with an exact Dijkstra oracle.")
+@click.option("--title", default="corpus", show_default=True, help="Name of the checkpoint and the CSV reports.")
+@click.option("--checkpoint", "checkpoint_path", type=click.Path(dir_okay=False), default=None, help="Checkpoint JSONL; artifacts/JPS/corpus/<title>.jsonl by default.")
+@click.option("--fresh", is_flag=True, help="Discard an existing checkpoint instead of resuming from it.")
+@click.option("--record", is_flag=True, help="Store the samples in --db under the current git revision.")
+@db_option
+def corpus(
+    scens: Tuple[str, ...],
+    engines: Tuple[str, ...],
+    processes: int,
+    warmup: int,
+    repeat: int,
+    weighted_oracle: bool,
+    title: str,
+    checkpoint_path: Optional[str],
+    fresh: bool,
+    record: bool,
+    db: str,
+) -> None:
+    checkpoint_path = checkpoint_path or str(DEFAULT_CHECKPOINT_DIR / f"{title}.jsonl")
+
+    def progress(scen_path: str, measurements, done: int, total: int) -> None:
+        mismatches = sum(1 for m in measurements if m.correct is False)
+        click.echo(f"[{done}/{total}] {os.path.basename(scen_path)}: {len(measurements)} measurements, {mismatches} mismatches", err=True)
+
+    try:
+        measurements = run_corpus(
+            scens, list(engines), checkpoint_path, processes, warmup, repeat, weighted_oracle, fresh, progress
+        )
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    buckets = bucket_report(measurements)
+    save_rows(buckets, f"{title}_buckets")
+    save_rows(map_report(measurements), f"{title}_maps")
+    if record:
+        settings = {"corpus": list(scens), "engines": list(engines), "warmup": warmup, "repeat": repeat, "processes": processes}
+        with BenchmarkStore(db) as store:
+            run_id = store.record_run(measurements, settings)
+        click.echo(f"Recorded run {run_id} in {db}", err=True)
+    mismatches = 0
+    for row in buckets:
+        mismatches += row["mismatches"]  # type: ignore[operator]
+        click.echo(
+            f"{row['engine']:>8} bucket={row['bucket']:<4} n={row['queries']:<6} mean={row['mean_time'] * 1e3:.3f}ms "  # type: ignore[operator]
+            f"p95={row['p95_time'] * 1e3:.3f}ms expanded={row['mean_expanded']:.0f} mismatches={row['mismatches']}"  # type: ignore[operator]
+        )
+    click.echo(f"Checkpoint: {checkpoint_path}", err=True)
+    if mismatches:
+        click.echo(f"{mismatches} queries did not match the optimal length", err=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    cli()
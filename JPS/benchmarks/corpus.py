@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+from dataclasses import asdict
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.harness import QueryMeasurement, ScenarioSet, run_benchmark, scen_files
+from benchmarks.helpers import REPO_PATH
+
+DEFAULT_CHECKPOINT_DIR = REPO_PATH / "artifacts" / "JPS" / "corpus"
+
+
+def measure_scen_file(
+    scen_path: str, engines: List[str], warmup: int, repeat: int, weighted_oracle: bool
+) -> Tuple[str, List[QueryMeasurement]]:
+    # One pool task: every problem of one .scen file. run_benchmark loads each
+    # map once per representation and runs all of its problems.
+    map_set = ScenarioSet(scen_path, weighted_oracle=weighted_oracle)
+    return scen_path, run_benchmark([map_set], engines, warmup=warmup, repeat=repeat)
+
+
+def _from_record(record: Dict) -> QueryMeasurement:
+    record = dict(record, start=tuple(record["start"]), goal=tuple(record["goal"]))
+    return QueryMeasurement(**record)
+
+
+class Checkpoint:
+    # Append-only JSONL: a settings header, then one line per finished .scen
+    # file with all its measurements, flushed to disk before the next file
+    # starts. An interrupted run leaves at most a torn last line, which is
+    # cut on resume; that file is measured again.
+
+    def __init__(self, path: str, settings: Dict[str, object], fresh: bool = False) -> None:
+        self.path = path
+        self.done: Dict[str, List[QueryMeasurement]] = {}
+        if fresh or not os.path.isfile(path):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"settings": settings}) + "\n")
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        if not text.endswith("\n"):
+            # Drop the torn tail so the next append starts on a fresh line.
+            text = text[: text.rfind("\n") + 1]
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        lines = text.splitlines()
+        try:
+            stored = json.loads(lines[0])["settings"] if lines else None
+        except (ValueError, KeyError) as exc:
+            raise ValueError(f"{path} is not a corpus checkpoint") from exc
+        if stored != json.loads(json.dumps(settings)):
+            raise ValueError(f"{path} was written with different settings; start over with --fresh")
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self.done[entry["scen"]] = [_from_record(r) for r in entry["measurements"]]
+
+    def append(self, scen_path: str, measurements: List[QueryMeasurement]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"scen": scen_path, "measurements": [asdict(m) for m in measurements]}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.done[scen_path] = measurements
+
+
+def run_corpus(
+    paths: Iterable[str],
+    engines: List[str],
+    checkpoint_path: str,
+    processes: int = 1,
+    warmup: int = 0,
+    repeat: int = 1,
+    weighted_oracle: bool = False,
+    fresh: bool = False,
+    progress: Optional[Callable[[str, List[QueryMeasurement], int, int], None]] = None,
+) -> List[QueryMeasurement]:
+    # Every problem of every .scen file under `paths`, one pool task per file,
+    # resuming from `checkpoint_path`. Workers share the machine, so absolute
+    # times are only comparable between runs with the same `processes`.
+    if processes < 1:
+        raise ValueError("processes must be positive")
+    if repeat < 1 or warmup < 0:
+        raise ValueError("repeat must be positive and warmup non-negative")
+    files = [os.path.abspath(scen) for path in paths for scen in scen_files(path)]
+    if not files:
+        raise ValueError("No .scen files found")
+    settings = {"engines": list(engines), "warmup": warmup, "repeat": repeat, "weighted_oracle": weighted_oracle}
+    checkpoint = Checkpoint(checkpoint_path, settings, fresh=fresh)
+    pending = [scen for scen in files if scen not in checkpoint.done]
+    measure = partial(measure_scen_file, engines=list(engines), warmup=warmup, repeat=repeat, weighted_oracle=weighted_oracle)
+
+    def finished(results: Iterable[Tuple[str, List[QueryMeasurement]]]) -> None:
+        for scen_path, measurements in results:
+            checkpoint.append(scen_path, measurements)
+            if progress is not None:
+                progress(scen_path, measurements, len(checkpoint.done), len(files))
+
+    if processes == 1:
+        finished(measure(scen) for scen in pending)
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            finished(pool.imap_unordered(measure, pending))
+    return [m for scen in files for m in checkpoint.done[scen]]
+
+
+def _group_rows(measurements: Iterable[QueryMeasurement], key: Callable[[QueryMeasurement], Tuple]) -> List[Dict[str, object]]:
+    groups: Dict[Tuple, List[QueryMeasurement]] = {}
+    for m in measurements:
+        groups.setdefault(key(m), []).append(m)
+    rows = []
+    for group_key, group in sorted(groups.items(), key=lambda item: item[0]):
+        # One time per problem: the median of its timed repetitions.
+        times = np.array([np.median(m.times) for m in group])
+        expanded = np.array([m.expanded for m in group], dtype=float)
+        checked = [m.correct for m in group if m.correct is not None]
+        rows.append({
+            "key": group_key,
+            "queries": len(group),
+            "mean_time": float(times.mean()),
+            "p50_time": float(np.percentile(times, 50)),
+            "p95_time": float(np.percentile(times, 95)),
+            "total_time": float(times.sum()),
+            "mean_expanded": float(expanded.mean()),
+            "p95_expanded": float(np.percentile(expanded, 95)),
+            "checked": len(checked),
+            "mismatches": sum(1 for ok in checked if not ok),
+        })
+    return rows
+
+
+def bucket_report(measurements: Iterable[QueryMeasurement]) -> List[Dict[str, object]]:
+    # Problems without a bucket column are reported under bucket -1.
+    rows = []
+    for row in _group_rows(measurements, lambda m: (m.engine, -1 if m.bucket is None else m.bucket)):
+        engine, bucket = row.pop("key")  # type: ignore[misc]
+        rows.append({"engine": engine, "bucket": bucket, **row})
+    return rows
+
+
+def map_report(measurements: Iterable[QueryMeasurement]) -> List[Dict[str, object]]:
+    rows = []
+    for row in _group_rows(measurements, lambda m: (m.engine, m.source, m.map_name)):
+        engine, source, map_name = row.pop("key")  # type: ignore[misc]
+        rows.append({"engine": engine, "source": source, "map": map_name, **row})
+    return rows
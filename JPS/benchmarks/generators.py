@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.ndimage import zoom
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+GENERATORS = ["random", "rooms", "maze", "terrain"]
+# GridMap treats terrain letters as obstacles, so these maps only make sense
+# for weighted engines.
+WEIGHTED_ONLY = {"terrain"}
+
+FREE, BLOCKED = ord("."), ord("@")
+# Terrain k is written as TERRAIN_CHARS[k] and costs k + 1; "." costs 1 so that
+# plain maps have the same optimal lengths as unit-cost grids.
+TERRAIN_CHARS = "ABCDEFGHIJ"
+TERRAIN_WEIGHTS: Dict[str, float] = {".": 1.0, **{ch: float(k + 1) for k, ch in enumerate(TERRAIN_CHARS)}}
+
+
+def random_obstacles(width: int, height: int, density: float, rng: np.random.Generator) -> np.ndarray:
+    return np.where(rng.random((height, width)) < density, BLOCKED, FREE).astype(np.uint8)
+
+
+def rooms(width: int, height: int, density: float, rng: np.random.Generator, room_size: int = 16) -> np.ndarray:
+    # Square rooms separated by one-cell walls, one door per wall segment, and
+    # random clutter of the given density inside the rooms.
+    if room_size < 4:
+        raise ValueError("room_size must be at least 4")
+    codes = random_obstacles(width, height, density, rng)
+    codes[::room_size, :] = BLOCKED
+    codes[:, ::room_size] = BLOCKED
+    door = max(1, room_size // 4)
+    rows_y = np.arange(room_size, height, room_size)
+    cols_x = np.arange(room_size, width, room_size)
+    room_cols = np.arange(0, width, room_size)
+    room_rows = np.arange(0, height, room_size)
+    for walls, spans, horizontal in ((rows_y, room_cols, True), (cols_x, room_rows, False)):
+        if walls.size == 0:
+            continue
+        wall, span = np.meshgrid(walls, spans, indexing="ij")
+        offsets = span + 1 + rng.integers(0, room_size - door - 1, size=wall.shape)
+        cells = (offsets[..., None] + np.arange(door)).reshape(-1)
+        lines = np.repeat(wall.reshape(-1), door)
+        limit = width if horizontal else height
+        keep = cells < limit
+        if horizontal:
+            codes[lines[keep], cells[keep]] = FREE
+        else:
+            codes[cells[keep], lines[keep]] = FREE
+    return codes
+
+
+def maze(width: int, height: int, density: float, rng: np.random.Generator, corridor: int = 1) -> np.ndarray:
+    # Binary-tree maze: every cell opens towards north or east (the top row and
+    # right column are forced), which is fully vectorizable. `density` is the
+    # share of the remaining inner walls knocked out to create loops.
+    if corridor < 1:
+        raise ValueError("corridor must be positive")
+    cells_x = max(1, (width // corridor - 1) // 2)
+    cells_y = max(1, (height // corridor - 1) // 2)
+    small = np.full((2 * cells_y + 1, 2 * cells_x + 1), BLOCKED, dtype=np.uint8)
+    small[1::2, 1::2] = FREE
+    north = rng.random((cells_y, cells_x)) < 0.5
+    north[0, :] = False
+    north[:, -1] = True
+    north[0, -1] = False
+    ys, xs = np.nonzero(north)
+    small[2 * ys, 2 * xs + 1] = FREE
+    ys, xs = np.nonzero(~north)
+    east = xs < cells_x - 1
+    small[2 * ys[east] + 1, 2 * xs[east] + 2] = FREE
+    if density > 0:
+        inner = np.zeros_like(small, dtype=bool)
+        inner[1:-1:2, 2:-1:2] = True
+        inner[2:-1:2, 1:-1:2] = True
+        knock = inner & (small == BLOCKED) & (rng.random(small.shape) < density)
+        small[knock] = FREE
+    scaled = np.repeat(np.repeat(small, corridor, axis=0), corridor, axis=1)
+    codes = np.full((height, width), BLOCKED, dtype=np.uint8)
+    h, w = min(height, scaled.shape[0]), min(width, scaled.shape[1])
+    codes[:h, :w] = scaled[:h, :w]
+    return codes
+
+
+def fractal_noise(width: int, height: int, rng: np.random.Generator, octaves: int = 5) -> np.ndarray:
+    # Value noise: bilinearly upsampled random lattices, halving the amplitude
+    # and doubling the frequency every octave.
+    noise = np.zeros((height, width))
+    amplitude = 1.0
+    for octave in range(octaves):
+        cells = 2 ** (octave + 1) + 1
+        lattice = rng.random((cells, cells))
+        layer = zoom(lattice, (height / cells, width / cells), order=1)
+        noise += amplitude * layer[:height, :width]
+        amplitude /= 2.0
+    return noise
+
+
+def terrain(
+    width: int, height: int, density: float, rng: np.random.Generator, terrains: int = 4, octaves: int = 5
+) -> np.ndarray:
+    # Terrain classes are equal-sized quantile bands of fractal noise; the top
+    # `density` share of a second noise field becomes obstacles.
+    if not 1 <= terrains <= len(TERRAIN_CHARS):
+        raise ValueError(f"terrains must be between 1 and {len(TERRAIN_CHARS)}")
+    noise = fractal_noise(width, height, rng, octaves)
+    edges = np.quantile(noise, np.linspace(0.0, 1.0, terrains + 1)[1:-1])
+    levels = np.digitize(noise, edges)
+    codes = np.frombuffer(TERRAIN_CHARS.encode("ascii"), dtype=np.uint8)[levels]
+    if density > 0:
+        blockers = fractal_noise(width, height, rng, octaves)
+        codes = np.where(blockers >= np.quantile(blockers, 1.0 - density), BLOCKED, codes).astype(np.uint8)
+    return codes
+
+
+def generate(
+    generator: str, width: int, height: int, density: float, seed: int, terrains: int = 4
+) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    if generator == "random":
+        return random_obstacles(width, height, density, rng)
+    if generator == "rooms":
+        return rooms(width, height, density, rng)
+    if generator == "maze":
+        return maze(width, height, density, rng)
+    if generator == "terrain":
+        return terrain(width, height, density, rng, terrains=terrains)
+    raise ValueError(f"Unknown map generator '{generator}'")
+
+
+def cell_weights(codes: np.ndarray) -> np.ndarray:
+    # Per-cell weights as WeightedGridMap reads them with TERRAIN_WEIGHTS;
+    # inf marks obstacles.
+    table = np.full(256, np.inf)
+    for ch, weight in TERRAIN_WEIGHTS.items():
+        table[ord(ch)] = weight
+    return table[codes]
+
+
+# (dx, dy) of the eight moves; every undirected edge is stored in both rows.
+MOVES: List[Tuple[int, int]] = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)]
+
+# Cells per block while filling the graph, which bounds the temporaries.
+GRAPH_BAND_CELLS = 2**18
+
+# Upper bound on the distance rows one dijkstra call returns (8 bytes per cell
+# per start); starts are batched to stay under it.
+ORACLE_BATCH_BYTES = 64 * 2**20
+
+
+def _span(d: int, n: int) -> Tuple[slice, slice]:
+    # Coordinates c with c + d inside [0, n), and the matching c + d.
+    if d > 0:
+        return slice(0, n - d), slice(d, n)
+    if d < 0:
+        return slice(-d, n), slice(0, n + d)
+    return slice(0, n), slice(0, n)
+
+
+def _move_mask(free: np.ndarray, dx: int, dy: int) -> np.ndarray:
+    # Flat mask of the cells the move (dx, dy) can leave.
+    height, width = free.shape
+    (sx, tx), (sy, ty) = _span(dx, width), _span(dy, height)
+    ok = np.zeros((height, width), dtype=bool)
+    ok[sy, sx] = free[sy, sx] & free[ty, tx]
+    if dx and dy:
+        ok[sy, sx] &= free[sy, tx] & free[ty, sx]
+    return ok.ravel()
+
+
+def _grid_graph(weights: np.ndarray) -> csr_matrix:
+    # Symmetric 8-connected graph with the engines' transition costs: straight
+    # moves average the two cells, diagonal moves average the 2x2 block and
+    # need both side cells free (no corner cutting). The CSR arrays are filled
+    # in place with int32 indices, one move and one band of cells at a time:
+    # the graph costs 12 bytes per move plus 4 per cell, and building it a few
+    # bytes per cell more.
+    height, width = weights.shape
+    size = height * width
+    if len(MOVES) * size >= 2**31:
+        raise ValueError("Maps above 2**28 cells need 64-bit graph indices")
+    free = np.isfinite(weights)
+    flat_weights = weights.ravel()
+    indptr = np.zeros(size + 1, dtype=np.int32)
+    for dx, dy in MOVES:
+        indptr[1:] += _move_mask(free, dx, dy)
+    np.cumsum(indptr, out=indptr)
+    indices = np.empty(int(indptr[-1]), dtype=np.int32)
+    data = np.empty(int(indptr[-1]), dtype=np.float64)
+    slot = indptr[:-1].copy()  # next free position in each row
+    for dx, dy in MOVES:
+        mask = _move_mask(free, dx, dy)
+        offset = dy * width + dx
+        for lo in range(0, size, GRAPH_BAND_CELLS):
+            rows = (np.flatnonzero(mask[lo : lo + GRAPH_BAND_CELLS]) + lo).astype(np.int32)
+            pos = slot[rows]
+            indices[pos] = rows + offset
+            if dx and dy:
+                total = flat_weights[rows] + flat_weights[rows + offset]
+                total += flat_weights[rows + dx]
+                total += flat_weights[rows + dy * width]
+                data[pos] = total * (math.sqrt(2.0) / 4.0)
+            else:
+                data[pos] = (flat_weights[rows] + flat_weights[rows + offset]) / 2.0
+            slot[rows] += 1
+    return csr_matrix((data, indices, indptr), shape=(size, size), copy=False)
+
+
+def optimal_lengths(
+    codes: np.ndarray, queries: List[Tuple[Tuple[int, int], Tuple[int, int]]]
+) -> List[float]:
+    # Exact oracle: scipy's compiled Dijkstra over the sparse cell graph, from
+    # batches of distinct starts. On open maps the graph takes 100 bytes per
+    # cell (eight moves of 12 bytes and the row pointer) and building it peaks
+    # near 120; each start in flight adds a distance row of 8 bytes per cell.
+    # An 8192x8192 map therefore needs about 8 GB. There is no cost bound to
+    # pass as `limit`, since the lengths of random pairs are what is asked for.
+    width = codes.shape[1]
+    graph = _grid_graph(cell_weights(codes))
+    lengths: List[float] = [math.inf] * len(queries)
+    by_start: Dict[int, List[int]] = {}
+    for i, (start, _) in enumerate(queries):
+        by_start.setdefault(start[1] * width + start[0], []).append(i)
+    starts = list(by_start)
+    batch = max(1, ORACLE_BATCH_BYTES // (8 * graph.shape[0]))
+    for first in range(0, len(starts), batch):
+        chunk = starts[first : first + batch]
+        # The CSR already holds both directions of every edge, so the directed
+        # search avoids the transposed copy scipy makes for directed=False.
+        distances = dijkstra(graph, directed=True, indices=chunk)
+        for row, start in zip(distances, chunk):
+            for i in by_start[start]:
+                gx, gy = queries[i][1]
+                lengths[i] = float(row[gy * width + gx])
+    return lengths
+
+
+def sample_queries(
+    codes: np.ndarray, count: int, rng: np.random.Generator
+) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    ys, xs = np.nonzero(codes != BLOCKED)
+    if ys.size < 2:
+        raise ValueError("The generated map has fewer than two free cells")
+    picks = rng.integers(0, ys.size, size=(count, 2))
+    return [((int(xs[a]), int(ys[a])), (int(xs[b]), int(ys[b]))) for a, b in picks]
+
+
+def write_movingai_map(path: str, codes: np.ndarray) -> None:
+    height, width = codes.shape
+    with open(path, "wb") as f:
+        f.write(f"type octile\nheight {height}\nwidth {width}\nmap\n".encode("ascii"))
+        rows = np.concatenate([codes, np.full((height, 1), ord("\n"), dtype=np.uint8)], axis=1)
+        f.write(rows.tobytes())
+
+
+def write_scenarios(
+    path: str, map_name: str, codes: np.ndarray, queries: List[Tuple[Tuple[int, int], Tuple[int, int]]], lengths: List[float]
+) -> None:
+    # Unreachable pairs are dropped; buckets follow the MovingAI convention of
+    # optimal length // 4.
+    height, width = codes.shape
+    lines = ["version 1"]
+    for ((sx, sy), (gx, gy)), length in zip(queries, lengths):
+        if math.isinf(length):
+            continue
+        lines.append(f"{int(length // 4)}\t{map_name}\t{width}\t{height}\t{sx}\t{sy}\t{gx}\t{gy}\t{length:.8f}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_map_set(
+    out_dir: str,
+    generator: str,
+    size: int,
+    density: float,
+    seed: int,
+    queries: int,
+    terrains: int = 4,
+    overwrite: bool = False,
+) -> str:
+    # Writes <name>.map, <name>.map.scen and terrain_weights.json into out_dir
+    # and returns the scenario path; existing files are reused unless
+    # `overwrite` is set, since the output depends only on the arguments.
+    name = f"{generator}-{size}-{density:g}-{seed}" + (f"-t{terrains}" if generator == "terrain" else "")
+    map_name = f"{name}.map"
+    map_path = os.path.join(out_dir, map_name)
+    scen_path = map_path + ".scen"
+    if not overwrite and os.path.isfile(map_path) and os.path.isfile(scen_path):
+        return scen_path
+    os.makedirs(out_dir, exist_ok=True)
+    codes = generate(generator, size, size, density, seed, terrains=terrains)
+    pairs = sample_queries(codes, queries, np.random.default_rng(seed + 1))
+    write_movingai_map(map_path, codes)
+    write_scenarios(scen_path, map_name, codes, pairs, optimal_lengths(codes, pairs))
+    with open(os.path.join(out_dir, "terrain_weights.json"), "w", encoding="utf-8") as f:
+        json.dump(TERRAIN_WEIGHTS, f, indent=2)
+    return scen_path
+
@@ -0,0 +1,338 @@
+from __future__ import annotations
+
+import gc
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from benchmarks.memory import measure_memory
+from pathfinding.engines import SEARCH_ENGINES, get_engine
+from pathfinding.flow_field import FlowField, compute_flow_field
+from pathfinding.grid import GridMap, load_scenarios
+from pathfinding.weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+
+SYNTHETIC_WEIGHTS = {".": 1.0, ",": 2.0, "~": 4.0}
+COST_TOLERANCE = 1e-6
+
+
+@dataclass
+class BenchQuery:
+    source: str
+    map_name: str
+    start: Tuple[int, int]
+    goal: Tuple[int, int]
+    optimal: Optional[float] = None
+    bucket: Optional[int] = None
+
+
+@dataclass
+class QueryMeasurement:
+    engine: str
+    source: str
+    map_name: str
+    start: Tuple[int, int]
+    goal: Tuple[int, int]
+    optimal: Optional[float]
+    cost: float
+    expanded: int
+    times: List[float] = field(default_factory=list)
+    bucket: Optional[int] = None
+
+    @property
+    def correct(self) -> Optional[bool]:
+        if self.optimal is None:
+            return None
+        if math.isinf(self.optimal):
+            return math.isinf(self.cost)
+        return math.isclose(self.cost, self.optimal, rel_tol=COST_TOLERANCE, abs_tol=COST_TOLERANCE)
+
+
+class MapSet(ABC):
+    # A named group of maps and queries; `load(weighted)` returns the map in the
+    # representation an engine needs and `check(weighted)` says how costs are
+    # verified: against the query's own length, an exact Dijkstra oracle, or
+    # not at all.
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    @abstractmethod
+    def maps(self) -> Iterator[Tuple[str, List[BenchQuery]]]:
+        ...
+
+    @abstractmethod
+    def load(self, map_name: str, weighted: bool) -> GridLike:
+        ...
+
+    def check(self, weighted: bool) -> str:
+        return "oracle"
+
+
+def scen_files(path: str) -> List[str]:
+    # `path` itself, or the .scen files directly inside it, sorted.
+    if os.path.isfile(path):
+        return [path]
+    return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith(".scen")]
+
+
+class ScenarioSet(MapSet):
+    # Every `.scen` file under `path` (a file or a directory). `lengths_for`
+    # lists the representations (weighted or not) the scenario optimal lengths
+    # are valid for: MovingAI lengths refer to unit costs, so weighted engines
+    # are checked only when `weighted_oracle` is set.
+
+    def __init__(
+        self,
+        path: str,
+        max_problems: Optional[int] = None,
+        weighted_oracle: bool = False,
+        lengths_for: Tuple[bool, ...] = (False,),
+    ) -> None:
+        super().__init__(Path(path).stem if os.path.isfile(path) else os.path.basename(os.path.normpath(path)))
+        self.path = path
+        self.max_problems = max_problems
+        self.weighted_oracle = weighted_oracle
+        self.lengths_for = lengths_for
+        self._paths: Dict[str, str] = {}
+
+    def maps(self) -> Iterator[Tuple[str, List[BenchQuery]]]:
+        for scen_path in scen_files(self.path):
+            problems = load_scenarios(scen_path)
+            if self.max_problems is not None:
+                problems = problems[-self.max_problems :]
+            by_map: Dict[str, List[BenchQuery]] = {}
+            for prob in problems:
+                map_name = os.path.basename(prob.map_path)
+                self._paths[map_name] = prob.map_path
+                by_map.setdefault(map_name, []).append(
+                    BenchQuery(
+                        self.name, map_name, (prob.start_x, prob.start_y), (prob.goal_x, prob.goal_y), prob.optimal_length, prob.bucket
+                    )
+                )
+            yield from by_map.items()
+
+    def load(self, map_name: str, weighted: bool) -> GridLike:
+        if weighted:
+            return WeightedGridMap.from_movingai_map(self._paths[map_name])
+        return GridMap.from_movingai_map(self._paths[map_name])
+
+    def check(self, weighted: bool) -> str:
+        if weighted in self.lengths_for:
+            return "given"
+        return "oracle" if weighted and self.weighted_oracle else "none"
+
+
+class SyntheticSet(MapSet):
+    # Spec "random:<size>:<obstacle probability>": one seeded square map with
+    # random obstacles and three terrain kinds, plus `queries` random pairs.
+
+    def __init__(self, spec: str, queries: int, seed: int) -> None:
+        super().__init__(spec)
+        try:
+            kind, size, prob = spec.split(":")
+            self.size, self.prob = int(size), float(prob)
+        except ValueError as exc:
+            raise ValueError(f"Invalid synthetic map spec '{spec}', expected random:<size>:<prob>") from exc
+        if kind != "random" or self.size < 2 or not 0.0 <= self.prob < 1.0:
+            raise ValueError(f"Invalid synthetic map spec '{spec}', expected random:<size>:<prob>")
+        rng = random.Random(seed)
+        self.rows = [
+            "".join(rng.choice("...,,~") if rng.random() >= self.prob else "#" for _ in range(self.size))
+            for _ in range(self.size)
+        ]
+        free = [(x, y) for y, row in enumerate(self.rows) for x, ch in enumerate(row) if ch != "#"]
+        if len(free) < 2:
+            raise ValueError(f"Synthetic map '{spec}' has fewer than two free cells")
+        self.queries = [BenchQuery(spec, spec, rng.choice(free), rng.choice(free)) for _ in range(queries)]
+
+    def maps(self) -> Iterator[Tuple[str, List[BenchQuery]]]:
+        yield self.name, self.queries
+
+    def load(self, map_name: str, weighted: bool) -> GridLike:
+        if weighted:
+            return WeightedGridMap.from_ascii(self.rows, SYNTHETIC_WEIGHTS)
+        return GridMap.from_ascii(self.rows)
+
+
+@contextmanager
+def gc_disabled(enabled: bool = True) -> Iterator[None]:
+    # Collect once up front so that no garbage from earlier runs is pending,
+    # then keep the collector out of the timed region.
+    if not enabled:
+        yield
+        return
+    was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def pin_cpu(cpu: int) -> None:
+    if not hasattr(os, "sched_setaffinity"):
+        raise ValueError("CPU pinning is not supported on this platform")
+    try:
+        os.sched_setaffinity(0, {cpu})
+    except OSError as exc:
+        raise ValueError(f"Cannot pin to CPU {cpu}: {exc}") from exc
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def machine_info() -> Dict[str, object]:
+    affinity = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    return {
+        "node": platform.node(),
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "affinity": affinity,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+    }
+
+
+def measure_query(search, grid: GridLike, query: BenchQuery, engine: str, warmup: int, repeat: int) -> QueryMeasurement:
+    for _ in range(warmup):
+        search(grid, query.start, query.goal)
+    result = QueryMeasurement(
+        engine, query.source, query.map_name, query.start, query.goal, query.optimal, math.inf, 0, bucket=query.bucket
+    )
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        _, cost, expanded, _ = search(grid, query.start, query.goal)
+        result.times.append(time.perf_counter() - start_time)
+        result.cost, result.expanded = cost, expanded
+    return result
+
+
+def peak_memory(search, grid: GridLike, query: BenchQuery) -> int:
+    # Peak bytes allocated by one untimed run; tracemalloc slows the search
+    # down, so this is kept apart from the timed repetitions.
+    return measure_memory(search, grid, query.start, query.goal)[1].peak_bytes
+
+
+def run_benchmark(
+    map_sets: Iterable[MapSet],
+    engines: Iterable[str],
+    warmup: int = 1,
+    repeat: int = 5,
+    disable_gc: bool = True,
+) -> List[QueryMeasurement]:
+    if repeat < 1:
+        raise ValueError("repeat must be positive")
+    if warmup < 0:
+        raise ValueError("warmup must be non-negative")
+    engines = list(engines)
+    resolved = {name: get_engine(name) for name in engines}
+    measurements: List[QueryMeasurement] = []
+    for map_set in map_sets:
+        for map_name, queries in map_set.maps():
+            grids: Dict[bool, GridLike] = {}
+            for engine in engines:
+                search, weighted = resolved[engine]
+                if weighted not in grids:
+                    grids[weighted] = map_set.load(map_name, weighted)
+                grid = grids[weighted]
+                check = map_set.check(weighted)
+                oracle_fields: Dict[Tuple[int, int], FlowField] = {}
+                for query in queries:
+                    if check == "oracle":
+                        flow = oracle_fields.get(query.goal)
+                        if flow is None:
+                            flow = oracle_fields[query.goal] = compute_flow_field(grid, query.goal)
+                        query = replace(query, optimal=flow.cost_from(query.start))
+                    elif check == "none":
+                        query = replace(query, optimal=None)
+                    with gc_disabled(disable_gc):
+                        measurements.append(measure_query(search, grid, query, engine, warmup, repeat))
+    return measurements
+
+
+def summarize(measurements: Iterable[QueryMeasurement]) -> List[Dict[str, object]]:
+    groups: Dict[Tuple[str, str], List[QueryMeasurement]] = {}
+    for m in measurements:
+        groups.setdefault((m.engine, m.source), []).append(m)
+    rows: List[Dict[str, object]] = []
+    for (engine, source), group in groups.items():
+        times = np.array([t for m in group for t in m.times])
+        expanded = sum(m.expanded * len(m.times) for m in group)
+        checked = [m.correct for m in group if m.correct is not None]
+        rows.append({
+            "engine": engine,
+            "source": source,
+            "queries": len(group),
+            "samples": int(times.size),
+            "mean": float(times.mean()),
+            "p50": float(np.percentile(times, 50)),
+            "p95": float(np.percentile(times, 95)),
+            "p99": float(np.percentile(times, 99)),
+            "queries_per_sec": float(times.size / times.sum()) if times.sum() > 0 else math.inf,
+            "expansions_per_sec": float(expanded / times.sum()) if times.sum() > 0 else math.inf,
+            "checked": len(checked),
+            "mismatches": sum(1 for ok in checked if not ok),
+        })
+    return rows
+
+
+def _finite(value: float) -> Optional[float]:
+    return value if math.isfinite(value) else None
+
+
+def to_json(
+    measurements: List[QueryMeasurement], settings: Dict[str, object], per_query: bool = False
+) -> Dict[str, object]:
+    report: Dict[str, object] = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "machine": machine_info(),
+        "settings": settings,
+        "summary": summarize(measurements),
+    }
+    if per_query:
+        report["queries"] = [
+            {
+                "engine": m.engine,
+                "source": m.source,
+                "map": m.map_name,
+                "bucket": m.bucket,
+                "start": list(m.start),
+                "goal": list(m.goal),
+                "optimal": None if m.optimal is None else _finite(m.optimal),
+                "cost": _finite(m.cost),
+                "expanded": m.expanded,
+                "correct": m.correct,
+                "times": m.times,
+            }
+            for m in measurements
+        ]
+    return report
+
+
+def engine_names() -> List[str]:
+    return sorted(SEARCH_ENGINES)
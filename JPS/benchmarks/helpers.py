@@ -3,6 +3,9 @@ import numpy as np
 import pandas as pd
 from pathlib import Path
 
+from benchmarks.memory import measure_memory, scaling_exponent
+from pathfinding.stats import STAT_FIELDS, SearchStats, mean_stats
+
 
 REPO_PATH = Path(__file__).parents[2]
 
@@ -16,34 +19,105 @@ def get_mean_and_ci95(a: List[float]) -> Tuple[float, float]:
     return mean, ci95
 
 
+def _result_key(search_name, kwargs):
+    return " | ".join([search_name] + [f"{x}={y}" for x, y in kwargs.items()])
+
+
+def _key_columns(key):
+    search_name = key.split(" | ")[0]
+    kvs = "=".join(key.split(" | ")[1:]).split("=")
+    row = dict(zip(kvs[::2], kvs[1::2]))
+    row["search_name"] = search_name
+    return row
+
+
 def run_search(search_func, search_name, grid, start, goal, elapsed_times, expanded_nodes, **kwargs):
     path, cost, expanded, elapsed_time = search_func(grid, start, goal)
-    key = " | ".join([search_name] + [f"{x}={y}" for x, y in kwargs.items()])
+    key = _result_key(search_name, kwargs)
     elapsed_times[key].append(elapsed_time)
     expanded_nodes[key].append(expanded)
     return path, cost
 
-def save_results(elapsed_times, expanded_nodes, name):
+def save_results(elapsed_times, expanded_nodes, name, memory_usage=None):
     res = []
     for key, times in elapsed_times.items():
         mean_times, ci95_times = get_mean_and_ci95(times)
         mean_expanded, ci95_expanded = get_mean_and_ci95(expanded_nodes[key])
-        search_name = key.split(" | ")[0]
-        kvs = "=".join(key.split(" | ")[1:]).split("=")
-        ks = kvs[::2]
-        vs = kvs[1::2]
-        row = dict()
-        for k, v in zip(ks, vs):
-            row[k] = v
+        row = _key_columns(key)
         row.update({
-            "search_name": search_name,
             "mean_times": mean_times, 
             "ci95_times": ci95_times, 
             "mean_expanded": mean_expanded, 
             "ci95_expanded": ci95_expanded,
         })
+        if memory_usage and key in memory_usage:
+            row.update(memory_columns(memory_usage[key]))
         res.append(row)
-    df = pd.DataFrame(res)
+    save_rows(res, name)
+
+
+def save_rows(rows, name):
+    df = pd.DataFrame(rows)
     SAVE_DIR = REPO_PATH / "artifacts" / "JPS" / "csvs"
     SAVE_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(SAVE_DIR / f"{name}.csv", index=False)
\ No newline at end of file
+    df.to_csv(SAVE_DIR / f"{name}.csv", index=False)
+
+
+def run_search_stats(search_func, search_name, grid, start, goal, search_stats, **kwargs):
+    # Like run_search for engines that accept `stats` (INSTRUMENTED_ENGINES);
+    # search_stats maps the same keys to lists of SearchStats.
+    stats = SearchStats()
+    path, cost, _, _ = search_func(grid, start, goal, stats=stats)
+    search_stats[_result_key(search_name, kwargs)].append(stats)
+    return path, cost
+
+
+def save_stats(search_stats, name):
+    rows = []
+    for key, stats in search_stats.items():
+        row = _key_columns(key)
+        means = mean_stats(stats)
+        row.update({f"mean_{field}": means[field] for field in STAT_FIELDS})
+        row["queries"] = len(stats)
+        rows.append(row)
+    save_rows(rows, name)
+
+
+def run_search_memory(search_func, search_name, grid, start, goal, memory_usage, **kwargs):
+    # Untimed companion of run_search; memory_usage maps the same keys to
+    # lists of MemoryUsage.
+    (path, cost, _, _), usage = measure_memory(search_func, grid, start, goal)
+    memory_usage[_result_key(search_name, kwargs)].append(usage)
+    return path, cost
+
+
+def memory_columns(usages):
+    columns = {}
+    for name, values in (
+        ("peak_bytes", [u.peak_bytes for u in usages]),
+        ("structure_bytes", [u.structures_total for u in usages]),
+        ("bytes_per_expanded", [u.bytes_per_expanded for u in usages]),
+    ):
+        columns[f"mean_{name}"], columns[f"ci95_{name}"] = get_mean_and_ci95(values)
+    return columns
+
+
+def save_memory_scaling(memory_usage, name, size_column="n"):
+    # One row per engine and map size, pooling the other labels, with the
+    # log-log slope of the mean peak over the size for every engine.
+    groups = {}
+    for key, usages in memory_usage.items():
+        row = _key_columns(key)
+        groups.setdefault((row["search_name"], float(row[size_column])), []).extend(usages)
+    rows = []
+    for (search_name, size), usages in sorted(groups.items()):
+        row = {"search_name": search_name, size_column: size, "queries": len(usages)}
+        row.update(memory_columns(usages))
+        rows.append(row)
+    for search_name in {row["search_name"] for row in rows}:
+        own = [row for row in rows if row["search_name"] == search_name]
+        exponent = scaling_exponent([row[size_column] for row in own], [row["mean_peak_bytes"] for row in own])
+        for row in own:
+            row["peak_bytes_exponent"] = exponent
+    save_rows(rows, f"{name}_memory_scaling")
+    return rows
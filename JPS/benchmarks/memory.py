@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import math
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from pathfinding.astar import AStarSearch
+from pathfinding.astarw import AStarWSearch
+from pathfinding.engines import SEARCH_ENGINES, SearchResult
+from pathfinding.epea import EPEASearch, EPEAWSearch
+from pathfinding.jps import JumpPointSearch
+from pathfinding.jpsw import JumpPointSearchWeighted
+
+# Engines with a StepwiseSearch class behind their search function; for these
+# the open list and maps are still reachable after the run and can be sized.
+SEARCH_CLASSES = {
+    "astar": AStarSearch,
+    "jps": JumpPointSearch,
+    "astarw": AStarWSearch,
+    "jpsw": JumpPointSearchWeighted,
+    "epea": EPEASearch,
+    "epeaw": EPEAWSearch,
+}
+_CLASS_BY_FUNCTION = {SEARCH_ENGINES[name]: cls for name, cls in SEARCH_CLASSES.items()}
+
+# Inputs and outputs rather than search state.
+_SKIPPED_ATTRIBUTES = {"path", "grid", "stats", "trace"}
+
+
+@dataclass
+class MemoryUsage:
+    # peak_bytes is the tracemalloc peak over construction and search;
+    # retained_bytes what the finished search still holds (its structures plus
+    # the path); structure_bytes the deep size of every container the search
+    # object keeps, by attribute. That deep size includes objects allocated
+    # before the search (cached small ints, coordinate tuples from the grid),
+    # so it can exceed the peak. Functional engines (fringe) free everything
+    # on return, so they only report the peak.
+    peak_bytes: int
+    retained_bytes: int
+    expanded: int
+    structure_bytes: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def structures_total(self) -> int:
+        return sum(self.structure_bytes.values())
+
+    @property
+    def bytes_per_expanded(self) -> float:
+        return self.peak_bytes / max(self.expanded, 1)
+
+
+def deep_sizeof(obj: object, seen: Optional[Set[int]] = None) -> int:
+    # sys.getsizeof over dict keys and values and list/tuple/set items.
+    # Objects reached twice count once, so coordinate tuples shared by
+    # g_scores and parent_map are not double-counted across a shared `seen`.
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return total
+
+
+def structure_sizes(search: object) -> Dict[str, int]:
+    seen: Set[int] = set()
+    sizes = {}
+    for name, value in vars(search).items():
+        if name not in _SKIPPED_ATTRIBUTES and isinstance(value, (list, dict, set)):
+            sizes[name] = deep_sizeof(value, seen)
+    return sizes
+
+
+def measure_memory(search_func, grid, start, goal) -> Tuple[SearchResult, MemoryUsage]:
+    # One untimed run under tracemalloc. Lazily cached grid data (the weighted
+    # grid's min cell cost) is allocated on the first search of a grid, so
+    # measure after a timed run when comparing engines.
+    search_class = _CLASS_BY_FUNCTION.get(search_func)
+    search = None
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        if search_class is None:
+            result = search_func(grid, start, goal)
+        else:
+            search = search_class(grid, start, goal)
+            search.run()
+            result = search.result()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    usage = MemoryUsage(
+        peak_bytes=peak - base,
+        retained_bytes=current - base,
+        expanded=result[2],
+        structure_bytes=structure_sizes(search) if search is not None else {},
+    )
+    return result, usage
+
+
+def scaling_exponent(sizes: Sequence[float], values: Sequence[float]) -> float:
+    # Least-squares slope of log(value) over log(size): 2 means memory grows
+    # with the cell count of a square map.
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v > 0]
+    if len({x for x, _ in points}) < 2:
+        return math.nan
+    xs, ys = np.array(points).T
+    return float(np.polyfit(xs, ys, 1)[0])
+
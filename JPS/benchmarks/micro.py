@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import random
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from benchmarks.generators import TERRAIN_WEIGHTS, generate
+from benchmarks.harness import gc_disabled
+from benchmarks.helpers import REPO_PATH
+from pathfinding import jps, jpsw
+from pathfinding.grid import GridMap
+from pathfinding.heuristics import octile_distance, weighted_octile_distance
+from pathfinding.jps import DIRECTIONS_8
+from pathfinding.path_utils import expand_path, reconstruct_path
+from pathfinding.weighted_grid import WeightedGridMap
+
+DEFAULT_BASELINE = REPO_PATH / "artifacts" / "JPS" / "micro_baseline.json"
+
+FIXTURE_SIZE = 128
+ARGUMENT_SETS = 256
+PATH_LENGTH = 256
+
+Cell = Tuple[int, int]
+Case = Tuple[Callable, List[tuple]]
+
+
+class Fixtures:
+    # The same seeded maps in every worker: a random-obstacle unit grid and a
+    # terrain grid, plus the free cells used to draw call arguments.
+
+    def __init__(self, seed: int = 0) -> None:
+        rows = [row.tobytes().decode("ascii") for row in generate("random", FIXTURE_SIZE, FIXTURE_SIZE, 0.2, seed)]
+        self.grid = GridMap.from_ascii([row.replace("@", "#") for row in rows])
+        rows = [row.tobytes().decode("ascii") for row in generate("terrain", FIXTURE_SIZE, FIXTURE_SIZE, 0.1, seed)]
+        self.wgrid = WeightedGridMap.from_ascii(rows, TERRAIN_WEIGHTS)
+        self.rng = random.Random(seed)
+
+    def free_cell(self, grid) -> Cell:
+        while True:
+            x, y = self.rng.randrange(grid.width), self.rng.randrange(grid.height)
+            if grid.is_walkable(x, y):
+                return x, y
+
+    def step(self, grid) -> Tuple[Cell, Cell]:
+        # A cell and a valid neighbour of it.
+        while True:
+            x, y = self.free_cell(grid)
+            moves = [(dx, dy) for dx, dy in DIRECTIONS_8 if grid.valid_step(x, y, dx, dy)]
+            if moves:
+                dx, dy = self.rng.choice(moves)
+                return (x, y), (x + dx, y + dy)
+
+
+def _valid_step(fx: Fixtures) -> Case:
+    args = []
+    for _ in range(ARGUMENT_SETS):
+        x, y = fx.free_cell(fx.grid)
+        args.append((x, y) + fx.rng.choice(DIRECTIONS_8))
+    return fx.grid.valid_step, args
+
+
+def _neighbors8(fx: Fixtures) -> Case:
+    # The generator is drained with list(), as every caller does.
+    neighbors8 = fx.grid.neighbors8
+    return (lambda x, y: list(neighbors8(x, y))), [fx.free_cell(fx.grid) for _ in range(ARGUMENT_SETS)]
+
+
+def _jps_jump(fx: Fixtures) -> Case:
+    goal = fx.free_cell(fx.grid)
+    args = []
+    for _ in range(ARGUMENT_SETS):
+        x, y = fx.free_cell(fx.grid)
+        dx, dy = fx.rng.choice(DIRECTIONS_8)
+        args.append((fx.grid, x, y, dx, dy, goal))
+    return jps.jump, args
+
+
+def _jps_prune(fx: Fixtures) -> Case:
+    args = []
+    for _ in range(ARGUMENT_SETS):
+        parent, current = fx.step(fx.grid)
+        args.append((fx.grid, current, parent))
+    return jps.prune_neighbors, args
+
+
+def _jpsw_prune(fx: Fixtures) -> Case:
+    args = []
+    for _ in range(ARGUMENT_SETS):
+        parent, current = fx.step(fx.wgrid)
+        args.append((fx.wgrid, current, parent))
+    return jpsw.prune_neighbors_weighted, args
+
+
+def _jpsw_local_dijkstra(fx: Fixtures) -> Case:
+    # Parent-to-neighbour queries inside the 3x3 patch, as pruning issues them.
+    args = []
+    while len(args) < ARGUMENT_SETS:
+        parent, current = fx.step(fx.wgrid)
+        patch = jpsw._local_patch_nodes(fx.wgrid, current)
+        goal = fx.rng.choice(sorted(patch))
+        args.append((fx.wgrid, parent, goal, patch))
+    return jpsw.local_dijkstra, args
+
+
+def _transition_cost(fx: Fixtures) -> Case:
+    args = []
+    for _ in range(ARGUMENT_SETS):
+        (x, y), (nx, ny) = fx.step(fx.wgrid)
+        args.append((x, y, nx, ny))
+    return fx.wgrid.transition_cost, args
+
+
+def _octile(fx: Fixtures) -> Case:
+    return octile_distance, [(fx.free_cell(fx.grid), fx.free_cell(fx.grid)) for _ in range(ARGUMENT_SETS)]
+
+
+def _weighted_octile(fx: Fixtures) -> Case:
+    # The grid's min cell cost is cached after the first call, as during a search.
+    args = [(fx.free_cell(fx.wgrid), fx.free_cell(fx.wgrid), fx.wgrid) for _ in range(ARGUMENT_SETS)]
+    weighted_octile_distance(*args[0])
+    return weighted_octile_distance, args
+
+
+def _random_walk(fx: Fixtures, length: int) -> List[Cell]:
+    # x grows by one every step, so the cells are distinct.
+    cells = [(0, 0)]
+    for x in range(1, length):
+        cells.append((x, cells[-1][1] + fx.rng.choice((-1, 0, 1))))
+    return cells
+
+
+def _reconstruct(fx: Fixtures) -> Case:
+    args = []
+    for _ in range(8):
+        cells = _random_walk(fx, PATH_LENGTH)
+        parents: Dict[Cell, Optional[Cell]] = dict(zip(cells[1:], cells))
+        parents[cells[0]] = None
+        args.append((parents, cells[-1]))
+    return reconstruct_path, args
+
+
+def _expand(fx: Fixtures) -> Case:
+    # Jump-point paths of PATH_LENGTH cells made of straight and diagonal runs.
+    args = []
+    for _ in range(8):
+        path, (x, y), covered = [(0, 0)], (0, 0), 0
+        while covered < PATH_LENGTH - 1:
+            dx, dy = fx.rng.choice(DIRECTIONS_8)
+            run = min(fx.rng.randint(1, 24), PATH_LENGTH - 1 - covered)
+            x, y = x + dx * run, y + dy * run
+            covered += run
+            path.append((x, y))
+        args.append((path,))
+    return expand_path, args
+
+
+CASES: Dict[str, Callable[[Fixtures], Case]] = {
+    "grid.valid_step": _valid_step,
+    "grid.neighbors8": _neighbors8,
+    "jps.jump": _jps_jump,
+    "jps.prune_neighbors": _jps_prune,
+    "jpsw.prune_neighbors_weighted": _jpsw_prune,
+    "jpsw.local_dijkstra": _jpsw_local_dijkstra,
+    "weighted_grid.transition_cost": _transition_cost,
+    "heuristics.octile_distance": _octile,
+    "heuristics.weighted_octile_distance": _weighted_octile,
+    f"path_utils.reconstruct_path[{PATH_LENGTH}]": _reconstruct,
+    f"path_utils.expand_path[{PATH_LENGTH}]": _expand,
+}
+
+
+def _noop(*args) -> None:
+    return None
+
+
+def _time_loops(func: Callable, args: List[tuple], loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        for a in args:
+            func(*a)
+    return time.perf_counter() - start
+
+
+def calibrate(func: Callable, args: List[tuple], min_time: float) -> int:
+    # Doubles the outer loop count until one sample lasts at least `min_time`,
+    # like timeit.autorange.
+    loops = 1
+    while _time_loops(func, args, loops) < min_time:
+        loops *= 2
+    return loops
+
+
+def measure_cases(names: Sequence[str], samples: int, min_time: float, seed: int = 0) -> Dict[str, List[float]]:
+    # Nanoseconds per call for every case; each sample has the cost of the same
+    # loop around a no-op with the same arguments subtracted.
+    fx = Fixtures(seed)
+    results: Dict[str, List[float]] = {}
+    for name in names:
+        func, args = CASES[name](fx)
+        with gc_disabled():
+            loops = calibrate(func, args, min_time)
+            calls = loops * len(args)
+            values = []
+            for _ in range(samples):
+                elapsed = _time_loops(func, args, loops) - _time_loops(_noop, args, loops)
+                values.append(max(elapsed, 0.0) / calls * 1e9)
+        results[name] = values
+    return results
+
+
+def reject_outliers(values: Sequence[float], fence: float = 1.5) -> Tuple[List[float], int]:
+    # Tukey fences around the inter-quartile range.
+    arr = np.asarray(values, dtype=float)
+    q1, q3 = np.percentile(arr, [25, 75])
+    low, high = q1 - fence * (q3 - q1), q3 + fence * (q3 - q1)
+    kept = arr[(arr >= low) & (arr <= high)]
+    return kept.tolist(), int(arr.size - kept.size)
+
+
+@dataclass
+class MicroResult:
+    name: str
+    median_ns: float
+    mean_ns: float
+    stdev_ns: float
+    min_ns: float
+    samples: int
+    outliers: int
+    baseline_ns: Optional[float] = None
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if not self.baseline_ns:
+            return None
+        return self.median_ns / self.baseline_ns
+
+
+def run_micro(
+    names: Optional[Sequence[str]] = None,
+    processes: int = 3,
+    samples: int = 5,
+    min_time: float = 0.02,
+    seed: int = 0,
+) -> List[MicroResult]:
+    # Workers run one after another in fresh spawned interpreters, so each
+    # process gets its own memory layout and hash seed and none of them
+    # compete for the CPU.
+    names = list(names or CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise ValueError(f"Unknown microbenchmark(s): {', '.join(unknown)}")
+    if processes < 1 or samples < 1:
+        raise ValueError("processes and samples must be positive")
+    pooled: Dict[str, List[float]] = {name: [] for name in names}
+    context = multiprocessing.get_context("spawn")
+    for _ in range(processes):
+        with context.Pool(1) as pool:
+            for name, values in pool.apply(measure_cases, (names, samples, min_time, seed)).items():
+                pooled[name].extend(values)
+    results = []
+    for name in names:
+        kept, outliers = reject_outliers(pooled[name])
+        arr = np.asarray(kept)
+        results.append(MicroResult(
+            name=name,
+            median_ns=float(np.median(arr)),
+            mean_ns=float(arr.mean()),
+            stdev_ns=float(arr.std(ddof=1)) if arr.size > 1 else 0.0,
+            min_ns=float(arr.min()),
+            samples=int(arr.size),
+            outliers=outliers,
+        ))
+    return results
+
+
+def load_baseline(path: "str | Path", machine: str) -> Dict[str, float]:
+    # Baselines are kept per machine fingerprint: nanoseconds do not transfer
+    # between machines.
+    path = Path(path)
+    if not path.is_file():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: entry["median_ns"] for name, entry in data.get(machine, {}).get("cases", {}).items()}
+
+
+def save_baseline(path: "str | Path", machine: str, results: List[MicroResult], revision: Optional[str]) -> None:
+    path = Path(path)
+    data: Dict[str, Dict] = {}
+    if path.is_file():
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    entry = data.setdefault(machine, {"cases": {}})
+    entry["revision"] = revision
+    entry["saved"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    for result in results:
+        fields = asdict(result)
+        fields.pop("baseline_ns")
+        entry["cases"][result.name] = fields
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
@@ -18,6 +18,39 @@ def plot_jps_vs_astar_random(df: pd.DataFrame, metrics: List[str], title: str) -
     fig.update_layout(title_text=title)
     fig.write_html(SAVE_DIR / f"{title}.html")
 
+def plot_trend(df: pd.DataFrame, metrics: List[str], title: str) -> Path:
+    # One line per engine/source across stored runs, oldest run first.
+    df = df.sort_values("created").assign(run=lambda d: pd.to_datetime(d["created"], unit="s"))
+    fig = make_subplots(rows=len(metrics), cols=1, subplot_titles=metrics)
+    for i, metric in enumerate(metrics):
+        fig_i = px.line(df, x="run", y=metric, color="series", markers=True, hover_data=["revision", "machine"])
+        for trace in fig_i.data:
+            trace.showlegend = i == 0
+            fig.add_trace(trace, row=i+1, col=1)
+    fig.update_layout(title_text=title)
+    SAVE_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = SAVE_DIR / f"{title}.html"
+    fig.write_html(out_path)
+    return out_path
+
+def plot_scaling(df: pd.DataFrame, metrics: List[str], title: str) -> Path:
+    # Metric against map size, one line per engine and density.
+    df = df.sort_values("size").assign(series=lambda d: d["engine"] + " | density=" + d["density"].astype(str))
+    fig = make_subplots(rows=len(metrics), cols=1, subplot_titles=metrics)
+    for i, metric in enumerate(metrics):
+        fig_i = px.line(df, x="size", y=metric, color="series", markers=True)
+        for trace in fig_i.data:
+            trace.showlegend = i == 0
+            fig.add_trace(trace, row=i+1, col=1)
+        fig.update_xaxes(type="log", title_text="map size", row=i+1, col=1)
+        fig.update_yaxes(type="log", row=i+1, col=1)
+    fig.update_layout(title_text=title)
+    SAVE_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = SAVE_DIR / f"{title}.html"
+    fig.write_html(out_path)
+    return out_path
+
+
 @click.command()
 @click.option("--input", "-i", type=click.Path(exists=True), required=True)
 @click.option("--label", "-l", type=str, required=True, multiple=True)
@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from benchmarks.harness import GridLike
+from pathfinding.engines import SEARCH_ENGINES, get_engine
+from pathfinding.grid import GridMap
+from pathfinding.weighted_grid import WeightedGridMap
+
+TIMING_MODES = ["max", "original"]
+
+
+@dataclass
+class LoggedQuery:
+    # One line of a query log:
+    # {"map": ..., "start": [x, y], "goal": [x, y], "algorithm": ..., "timestamp": ...}
+    # The timestamp is epoch seconds or an ISO 8601 string; relative map
+    # paths are resolved against the log's directory.
+    map_path: str
+    start: Tuple[int, int]
+    goal: Tuple[int, int]
+    algorithm: Optional[str]
+    timestamp: float
+
+
+@dataclass
+class ReplayResult:
+    index: int
+    engine: str
+    map_path: str
+    cost: float
+    expanded: int
+    # Search time reported by the engine, and the time from the query's
+    # scheduled arrival to its completion as the replayer saw it.
+    service_time: float
+    latency: float
+
+
+def _parse_timestamp(value: object) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    raise ValueError(f"Invalid timestamp {value!r}")
+
+
+def _parse_cell(value: object, name: str) -> Tuple[int, int]:
+    if not isinstance(value, list) or len(value) != 2 or not all(isinstance(v, int) for v in value):
+        raise ValueError(f"'{name}' must be [x, y], got {value!r}")
+    return value[0], value[1]
+
+
+def read_query_log(path: str, map_dir: Optional[str] = None) -> List[LoggedQuery]:
+    # Queries come back ordered by timestamp (stable for ties).
+    base_dir = map_dir or os.path.dirname(os.path.abspath(path))
+    queries: List[LoggedQuery] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                map_path = record["map"]
+                query = LoggedQuery(
+                    map_path=map_path if os.path.isabs(map_path) else os.path.join(base_dir, map_path),
+                    start=_parse_cell(record["start"], "start"),
+                    goal=_parse_cell(record["goal"], "goal"),
+                    algorithm=record.get("algorithm"),
+                    timestamp=_parse_timestamp(record["timestamp"]),
+                )
+            except (KeyError, TypeError, ValueError) as exc:
+                raise ValueError(f"{path}:{line_no}: invalid query record ({exc})") from exc
+            queries.append(query)
+    queries.sort(key=lambda q: q.timestamp)
+    return queries
+
+
+def write_query_log(path: str, queries: Iterable[LoggedQuery]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for q in queries:
+            record = {
+                "map": q.map_path,
+                "start": list(q.start),
+                "goal": list(q.goal),
+                "algorithm": q.algorithm,
+                "timestamp": q.timestamp,
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def _engine_for(query: LoggedQuery, engine: Optional[str]) -> str:
+    name = engine or query.algorithm
+    if name is None:
+        raise ValueError("A logged query has no algorithm; choose an engine for the replay")
+    if name not in SEARCH_ENGINES:
+        raise ValueError(f"Unknown search algorithm '{name}'")
+    return name
+
+
+def load_maps(specs: Iterable[Tuple[str, bool]], terrain_weights_path: Optional[str] = None) -> Dict[Tuple[str, bool], GridLike]:
+    grids: Dict[Tuple[str, bool], GridLike] = {}
+    for map_path, weighted in specs:
+        if (map_path, weighted) not in grids:
+            if weighted:
+                grids[map_path, weighted] = WeightedGridMap.from_movingai_map(map_path, terrain_weights_path=terrain_weights_path)
+            else:
+                grids[map_path, weighted] = GridMap.from_movingai_map(map_path)
+    return grids
+
+
+# Maps of a pool worker, loaded once by its initializer.
+_worker_grids: Dict[Tuple[str, bool], GridLike] = {}
+
+
+def _init_worker(specs: List[Tuple[str, bool]], terrain_weights_path: Optional[str]) -> None:
+    _worker_grids.update(load_maps(specs, terrain_weights_path))
+
+
+def _serve(
+    grids: Dict[Tuple[str, bool], GridLike], engine: str, map_path: str, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[float, int, float]:
+    search, weighted = get_engine(engine)
+    _, cost, expanded, elapsed = search(grids[map_path, weighted], start, goal)
+    return cost, expanded, elapsed
+
+
+def _serve_in_worker(engine: str, map_path: str, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[float, int, float]:
+    return _serve(_worker_grids, engine, map_path, start, goal)
+
+
+def replay(
+    queries: List[LoggedQuery],
+    engine: Optional[str] = None,
+    timing: str = "max",
+    concurrency: int = 1,
+    speed: float = 1.0,
+    terrain_weights_path: Optional[str] = None,
+) -> Tuple[List[ReplayResult], float]:
+    # Returns the per-query results in log order and the wall time of the
+    # replay. "original" submits every query at its logged offset from the
+    # first one (divided by `speed`), so latency includes queueing behind
+    # busy workers; "max" submits everything at once, so latency is the time
+    # to drain the queue and service_time is the one to compare. With
+    # concurrency > 1 queries are served by a process pool; maps are loaded
+    # before the clock starts, in every worker.
+    if timing not in TIMING_MODES:
+        raise ValueError(f"Unknown timing mode '{timing}'")
+    if concurrency < 1 or speed <= 0:
+        raise ValueError("concurrency and speed must be positive")
+    engines = [_engine_for(q, engine) for q in queries]
+    specs = sorted({(q.map_path, get_engine(name)[1]) for q, name in zip(queries, engines)})
+    first = queries[0].timestamp if queries else 0.0
+    offsets = [(q.timestamp - first) / speed if timing == "original" else 0.0 for q in queries]
+    results: List[Optional[ReplayResult]] = [None] * len(queries)
+
+    def record(i: int, served: Tuple[float, int, float], scheduled: float) -> None:
+        cost, expanded, elapsed = served
+        results[i] = ReplayResult(i, engines[i], queries[i].map_path, cost, expanded, elapsed, time.perf_counter() - scheduled)
+
+    if concurrency == 1:
+        grids = load_maps(specs, terrain_weights_path)
+        began = time.perf_counter()
+        for i, q in enumerate(queries):
+            scheduled = began + offsets[i]
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            record(i, _serve(grids, engines[i], q.map_path, q.start, q.goal), scheduled)
+        return [r for r in results if r is not None], time.perf_counter() - began
+
+    errors: List[BaseException] = []
+    with ProcessPoolExecutor(concurrency, initializer=_init_worker, initargs=(specs, terrain_weights_path)) as pool:
+        # Start every worker (and its map loading) before the clock starts.
+        list(pool.map(time.sleep, [0.01] * concurrency))
+        futures: List[Future] = []
+        began = time.perf_counter()
+        for i, q in enumerate(queries):
+            scheduled = began + offsets[i]
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            future = pool.submit(_serve_in_worker, engines[i], q.map_path, q.start, q.goal)
+
+            # Callbacks run on the pool's management thread as results arrive;
+            # leaving the `with` block waits for all of them.
+            def done(f: Future, i: int = i, scheduled: float = scheduled) -> None:
+                if f.exception() is not None:
+                    errors.append(f.exception())  # type: ignore[arg-type]
+                else:
+                    record(i, f.result(), scheduled)
+
+            future.add_done_callback(done)
+            futures.append(future)
+        for future in futures:
+            future.exception()
+        wall_time = time.perf_counter() - began
+    if errors:
+        raise errors[0]
+    return [r for r in results if r is not None], wall_time
+
+
+def latency_histogram(latencies: List[float], bins: int = 16) -> List[Tuple[float, float, int]]:
+    # Log-spaced buckets between the fastest and the slowest query, as
+    # (low, high, count); latencies span orders of magnitude across buckets.
+    if not latencies:
+        return []
+    values = np.asarray(latencies, dtype=float)
+    low, high = float(values.min()), float(values.max())
+    if low <= 0 or math.isclose(low, high):
+        edges = np.linspace(low, high if high > low else low + 1e-9, bins + 1)
+    else:
+        edges = np.geomspace(low, high, bins + 1)
+    counts, edges = np.histogram(values, bins=edges)
+    return [(float(edges[i]), float(edges[i + 1]), int(counts[i])) for i in range(bins)]
+
+
+def format_histogram(histogram: List[Tuple[float, float, int]], width: int = 40) -> str:
+    peak = max((count for _, _, count in histogram), default=0)
+    lines = []
+    for low, high, count in histogram:
+        bar = "#" * (round(width * count / peak) if peak else 0)
+        lines.append(f"{low * 1e3:10.3f} - {high * 1e3:10.3f} ms | {bar} {count}")
+    return "\n".join(lines)
+
+
+def summarize_replay(results: List[ReplayResult], wall_time: float, bins: int = 16) -> Dict[str, object]:
+    latencies = [r.latency for r in results]
+    services = [r.service_time for r in results]
+    summary: Dict[str, object] = {
+        "queries": len(results),
+        "wall_time": wall_time,
+        "throughput": len(results) / wall_time if wall_time > 0 else math.inf,
+        "histogram": [{"low": low, "high": high, "count": count} for low, high, count in latency_histogram(latencies, bins)],
+        "engines": sorted({r.engine for r in results}),
+    }
+    for name, values in (("latency", latencies), ("service", services)):
+        arr = np.asarray(values, dtype=float) if values else np.zeros(1)
+        summary[name] = {
+            "mean": float(arr.mean()),
+            "p50": float(np.percentile(arr, 50)),
+            "p90": float(np.percentile(arr, 90)),
+            "p99": float(np.percentile(arr, 99)),
+            "p999": float(np.percentile(arr, 99.9)),
+            "max": float(arr.max()),
+        }
+    return summary
@@ -6,3 +6,4 @@ python plot_graphics.py -i ../../artifacts/JPS/csvs/jps_vs_astar_movingai_scens_
 python plot_graphics.py -i ../../artifacts/JPS/csvs/jps_vs_astar_movingai_scens__smallest.csv -l n -l scen_dir
 python plot_graphics.py -i ../../artifacts/JPS/csvs/jps_vs_astar_movingai_scens__random.csv -l n -l scen_dir
 python plot_graphics.py -i ../../artifacts/JPS/csvs/jpsw_vs_astarw_on_movingai.csv -l n -l scen_dir
+python plot_graphics.py -i ../../artifacts/JPS/csvs/suboptimal_tradeoff_movingai.csv -l epsilon -l scen_dir
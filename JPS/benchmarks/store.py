@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy.stats import mannwhitneyu
+
+from benchmarks.harness import QueryMeasurement, git_revision, machine_info
+from benchmarks.helpers import REPO_PATH
+
+DEFAULT_DB = REPO_PATH / "artifacts" / "JPS" / "benchmarks.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created REAL NOT NULL,
+    revision TEXT,
+    machine TEXT NOT NULL,
+    machine_info TEXT NOT NULL,
+    settings TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    engine TEXT NOT NULL,
+    source TEXT NOT NULL,
+    map TEXT NOT NULL,
+    bucket INTEGER,
+    time REAL NOT NULL,
+    expanded INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_key ON samples (engine, source, map, bucket);
+CREATE INDEX IF NOT EXISTS runs_revision ON runs (revision, machine);
+"""
+
+# Machine details that change measured speed; the host name is left out so
+# that identical CI runners share a fingerprint.
+FINGERPRINT_FIELDS = ["system", "machine", "processor", "cpu_count", "python", "implementation"]
+
+SampleKey = Tuple[str, str, str, Optional[int]]
+
+
+def machine_fingerprint(info: Optional[Dict[str, object]] = None) -> str:
+    info = info or machine_info()
+    payload = json.dumps({name: info.get(name) for name in FINGERPRINT_FIELDS}, sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class Comparison:
+    engine: str
+    source: str
+    map_name: str
+    bucket: Optional[int]
+    baseline_median: float
+    candidate_median: float
+    baseline_samples: int
+    candidate_samples: int
+    p_value: float
+    regression: bool
+    improvement: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.candidate_median / self.baseline_median if self.baseline_median > 0 else math.inf
+
+
+class BenchmarkStore:
+    # One row per run (revision + machine fingerprint) and one row per timed
+    # sample, so later comparisons can use the raw distributions.
+
+    def __init__(self, path: "str | Path" = DEFAULT_DB) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "BenchmarkStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def record_run(
+        self,
+        measurements: Iterable[QueryMeasurement],
+        settings: Optional[Dict[str, object]] = None,
+        revision: Optional[str] = None,
+        info: Optional[Dict[str, object]] = None,
+        created: Optional[float] = None,
+    ) -> int:
+        info = info or machine_info()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created, revision, machine, machine_info, settings) VALUES (?, ?, ?, ?, ?)",
+                (
+                    time.time() if created is None else created,
+                    revision if revision is not None else git_revision(),
+                    machine_fingerprint(info),
+                    json.dumps(info, sort_keys=True),
+                    json.dumps(settings or {}, sort_keys=True),
+                ),
+            )
+            run_id = int(cursor.lastrowid)
+            self.conn.executemany(
+                "INSERT INTO samples (run_id, engine, source, map, bucket, time, expanded) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, m.engine, m.source, m.map_name, m.bucket, t, m.expanded)
+                    for m in measurements
+                    for t in m.times
+                ],
+            )
+        return run_id
+
+    def resolve_revision(self, prefix: str) -> str:
+        rows = self.conn.execute(
+            "SELECT DISTINCT revision FROM runs WHERE revision LIKE ? || '%'", (prefix,)
+        ).fetchall()
+        if not rows:
+            raise ValueError(f"No stored runs for revision '{prefix}'")
+        if len(rows) > 1:
+            raise ValueError(f"Revision prefix '{prefix}' is ambiguous")
+        return rows[0][0]
+
+    def latest_revision(self, machine: Optional[str] = None) -> str:
+        query = "SELECT revision FROM runs WHERE revision IS NOT NULL"
+        params: Tuple = ()
+        if machine is not None:
+            query += " AND machine = ?"
+            params = (machine,)
+        row = self.conn.execute(query + " ORDER BY created DESC, id DESC LIMIT 1", params).fetchone()
+        if row is None:
+            raise ValueError("The benchmark store has no runs")
+        return row[0]
+
+    def samples(self, revision: str, machine: Optional[str] = None) -> Dict[SampleKey, List[float]]:
+        # All runs of a revision on a machine are pooled.
+        query = (
+            "SELECT s.engine, s.source, s.map, s.bucket, s.time FROM samples s JOIN runs r ON r.id = s.run_id"
+            " WHERE r.revision = ?"
+        )
+        params: Tuple = (revision,)
+        if machine is not None:
+            query += " AND r.machine = ?"
+            params += (machine,)
+        grouped: Dict[SampleKey, List[float]] = {}
+        for engine, source, map_name, bucket, sample in self.conn.execute(query, params):
+            grouped.setdefault((engine, source, map_name, bucket), []).append(sample)
+        return grouped
+
+    def trend(self, engine: Optional[str] = None, source: Optional[str] = None, machine: Optional[str] = None) -> List[Dict[str, object]]:
+        # Median time and expansions of every run, per engine and source.
+        query = (
+            "SELECT r.id, r.created, r.revision, r.machine, s.engine, s.source, s.time, s.expanded"
+            " FROM samples s JOIN runs r ON r.id = s.run_id WHERE 1 = 1"
+        )
+        params: Tuple = ()
+        for column, value in (("s.engine", engine), ("s.source", source), ("r.machine", machine)):
+            if value is not None:
+                query += f" AND {column} = ?"
+                params += (value,)
+        grouped: Dict[Tuple, List[Tuple[float, int]]] = {}
+        for run_id, created, revision, run_machine, run_engine, run_source, sample, expanded in self.conn.execute(query, params):
+            grouped.setdefault((run_id, created, revision, run_machine, run_engine, run_source), []).append((sample, expanded))
+        rows = []
+        for (run_id, created, revision, run_machine, run_engine, run_source), values in sorted(grouped.items()):
+            times = np.array([t for t, _ in values])
+            rows.append({
+                "run_id": run_id,
+                "created": created,
+                "revision": revision,
+                "machine": run_machine,
+                "engine": run_engine,
+                "source": run_source,
+                "median_time": float(np.median(times)),
+                "p95_time": float(np.percentile(times, 95)),
+                "mean_expanded": float(np.mean([e for _, e in values])),
+                "samples": len(values),
+            })
+        return rows
+
+
+def compare_revisions(
+    store: BenchmarkStore,
+    baseline: str,
+    candidate: str,
+    machine: Optional[str] = None,
+    alpha: float = 0.01,
+    min_effect: float = 0.05,
+) -> List[Comparison]:
+    # One-sided Mann-Whitney U tests per (engine, source, map, bucket): a
+    # regression needs a significant shift towards slower times and a median
+    # slowdown of at least `min_effect`; improvements are the mirror image.
+    if not 0.0 < alpha < 1.0:
+        raise ValueError("alpha must be in (0, 1)")
+    if min_effect < 0.0:
+        raise ValueError("min_effect must be non-negative")
+    base = store.samples(baseline, machine)
+    cand = store.samples(candidate, machine)
+    results: List[Comparison] = []
+    for key in sorted(set(base) & set(cand), key=lambda k: (k[0], k[1], k[2], -1 if k[3] is None else k[3])):
+        a, b = base[key], cand[key]
+        median_a, median_b = float(np.median(a)), float(np.median(b))
+        p_slower = float(mannwhitneyu(b, a, alternative="greater").pvalue)
+        p_faster = float(mannwhitneyu(b, a, alternative="less").pvalue)
+        regression = p_slower < alpha and median_b > median_a * (1.0 + min_effect)
+        improvement = p_faster < alpha and median_b < median_a * (1.0 - min_effect)
+        results.append(Comparison(
+            engine=key[0],
+            source=key[1],
+            map_name=key[2],
+            bucket=key[3],
+            baseline_median=median_a,
+            candidate_median=median_b,
+            baseline_samples=len(a),
+            candidate_samples=len(b),
+            p_value=p_slower if median_b >= median_a else p_faster,
+            regression=regression,
+            improvement=improvement,
+        ))
+    return results
@@ -10,4 +10,22 @@ __all__ = [
     "weighted_grid",
     "path_utils",
     "cli",
+    "ch",
+    "dstar_lite",
+    "jps_plus",
+    "engines",
+    "shared_grid",
+    "batch",
+    "flow_field",
+    "multi_goal",
+    "reachability",
+    "suboptimal",
+    "lss_lrta",
+    "fringe",
+    "epea",
+    "hda",
+    "tiled_map",
+    "stats",
+    "trace",
+    "profiling",
 ]
@@ -6,57 +6,165 @@ import time
 from typing import Dict, List, Optional, Set, Tuple
 
 from .heuristics import weighted_octile_distance
-from .path_utils import reconstruct_path
+from .stats import SearchStats
+from .stepwise import StepwiseSearch
+from .trace import SearchTrace
 from .weighted_grid import WeightedGridMap
 
 
+class AStarWSearch(StepwiseSearch):
+    def __init__(
+        self,
+        grid: WeightedGridMap,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        stats: Optional[SearchStats] = None,
+        trace: Optional[SearchTrace] = None,
+    ) -> None:
+        start_time = time.perf_counter()
+        super().__init__(start, goal, stats, trace)
+        self.grid = grid
+        self.open_heap: List[Tuple[float, int, int, int]] = []
+        self.g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
+        self.closed: Set[Tuple[int, int]] = set()
+        self.counter = 0
+
+        heapq.heappush(self.open_heap, (weighted_octile_distance(start, goal, grid), self.counter, start[0], start[1]))
+        self.elapsed_time += time.perf_counter() - start_time
+        if self.stats is not None:
+            self._record_setup()
+            self._search = self._search_counted  # type: ignore[method-assign]
+
+    def _search(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal = self.grid, self.goal
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        counter, expanded = self.counter, self.expanded
+        best_node, best_h = self.best_node, self.best_h
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, x, y = heapq.heappop(open_heap)
+            node = (x, y)
+            if node in closed:
+                continue
+
+            g_current = g_scores.get(node)
+            if g_current is None:
+                continue
+
+            h = weighted_octile_distance(node, goal, grid)
+            if f > g_current + h + 1e-9:
+                continue
+
+            closed.add(node)
+            expanded += 1
+
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            for nx, ny in grid.neighbors8(x, y):
+                neighbor = (nx, ny)
+                if neighbor in closed:
+                    continue
+                tentative_g = g_current + grid.transition_cost(x, y, nx, ny)
+                if tentative_g + 1e-9 < g_scores.get(neighbor, math.inf):
+                    g_scores[neighbor] = tentative_g
+                    parent_map[neighbor] = node
+                    counter += 1
+                    heapq.heappush(
+                        open_heap,
+                        (tentative_g + weighted_octile_distance(neighbor, goal, grid), counter, nx, ny),
+                    )
+
+        self.counter, self.expanded = counter, expanded
+        self.best_node, self.best_h = best_node, best_h
+
+    def _search_counted(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal = self.grid, self.goal
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        counter, expanded = self.counter, self.expanded
+        best_node, best_h = self.best_node, self.best_h
+        stats = self.stats
+        trace = self.trace
+        pops = stale_pops = generated = pushes = 0
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, x, y = heapq.heappop(open_heap)
+            pops += 1
+            node = (x, y)
+            if node in closed:
+                stale_pops += 1
+                continue
+
+            g_current = g_scores.get(node)
+            if g_current is None:
+                stale_pops += 1
+                continue
+
+            h = weighted_octile_distance(node, goal, grid)
+            if f > g_current + h + 1e-9:
+                stale_pops += 1
+                continue
+
+            closed.add(node)
+            expanded += 1
+            if trace is not None:
+                trace.expand(x, y, g_current, h)
+
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            for nx, ny in grid.neighbors8(x, y):
+                neighbor = (nx, ny)
+                if neighbor in closed:
+                    continue
+                generated += 1
+                tentative_g = g_current + grid.transition_cost(x, y, nx, ny)
+                if tentative_g + 1e-9 < g_scores.get(neighbor, math.inf):
+                    g_scores[neighbor] = tentative_g
+                    parent_map[neighbor] = node
+                    counter += 1
+                    pushes += 1
+                    heapq.heappush(
+                        open_heap,
+                        (tentative_g + weighted_octile_distance(neighbor, goal, grid), counter, nx, ny),
+                    )
+
+        stats.expanded += expanded - self.expanded
+        stats.pops += pops
+        stats.stale_pops += stale_pops
+        stats.generated += generated
+        stats.pushes += pushes
+        self.counter, self.expanded = counter, expanded
+        self.best_node, self.best_h = best_node, best_h
+
+
 def astarw_search(
-    grid: WeightedGridMap, start: Tuple[int, int], goal: Tuple[int, int]
+    grid: WeightedGridMap,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    stats: Optional[SearchStats] = None,
+    trace: Optional[SearchTrace] = None,
 ) -> Tuple[List[Tuple[int, int]], float, int, float]:
-    start_time = time.perf_counter()
-    open_heap: List[Tuple[float, int, int, int]] = []
-    g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
-    parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
-    closed: Set[Tuple[int, int]] = set()
-    counter = 0
-    expanded = 0
-
-    heapq.heappush(open_heap, (weighted_octile_distance(start, goal, grid), counter, start[0], start[1]))
-
-    while open_heap:
-        f, _, x, y = heapq.heappop(open_heap)
-        node = (x, y)
-        if node in closed:
-            continue
-
-        g_current = g_scores.get(node)
-        if g_current is None:
-            continue
-
-        if f > g_current + weighted_octile_distance(node, goal, grid) + 1e-9:
-            continue
-
-        closed.add(node)
-        expanded += 1
-
-        if node == goal:
-            path = reconstruct_path(parent_map, goal)
-            elapsed_time = time.perf_counter() - start_time
-            return path, g_current, expanded, elapsed_time
-
-        for nx, ny in grid.neighbors8(x, y):
-            neighbor = (nx, ny)
-            if neighbor in closed:
-                continue
-            tentative_g = g_current + grid.transition_cost(x, y, nx, ny)
-            if tentative_g + 1e-9 < g_scores.get(neighbor, math.inf):
-                g_scores[neighbor] = tentative_g
-                parent_map[neighbor] = node
-                counter += 1
-                heapq.heappush(
-                    open_heap,
-                    (tentative_g + weighted_octile_distance(neighbor, goal, grid), counter, nx, ny),
-                )
-
-    elapsed_time = time.perf_counter() - start_time
-    return [], math.inf, expanded, elapsed_time
+    search = AStarWSearch(grid, start, goal, stats, trace)
+    search.run()
+    return search.result()
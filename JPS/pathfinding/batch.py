@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .engines import get_engine
+from .grid import GridMap
+from .shared_grid import GridLike, SharedGrid, SharedGridHandle, acquire_grid, release_grid
+from .weighted_grid import WeightedGridMap
+
+MapKey = Tuple[str, bool, Optional[str]]
+
+
+@dataclass
+class BatchQuery:
+    map_path: str
+    start: Tuple[int, int]
+    goal: Tuple[int, int]
+    algorithm: str = "jps"
+    terrain_weights_path: Optional[str] = None
+
+
+@dataclass
+class BatchResult:
+    index: int
+    path: List[Tuple[int, int]] = field(default_factory=list)
+    cost: float = math.inf
+    expanded: int = 0
+    elapsed_time: float = 0.0
+    error: Optional[str] = None
+
+
+Task = Tuple[int, Tuple[int, int], Tuple[int, int], str]
+
+
+def _map_key(query: BatchQuery) -> MapKey:
+    _, weighted = get_engine(query.algorithm)
+    return query.map_path, weighted, query.terrain_weights_path if weighted else None
+
+
+def _load_map(key: MapKey) -> GridLike:
+    map_path, weighted, terrain_weights_path = key
+    if weighted:
+        return WeightedGridMap.from_movingai_map(map_path, terrain_weights_path=terrain_weights_path)
+    return GridMap.from_movingai_map(map_path)
+
+
+def _solve_tasks(grid: GridLike, tasks: Sequence[Task]) -> List[BatchResult]:
+    results: List[BatchResult] = []
+    for index, start, goal, algorithm in tasks:
+        if not grid.is_walkable(*start) or not grid.is_walkable(*goal):
+            results.append(BatchResult(index=index, error="Start or goal is blocked."))
+            continue
+        search, _ = get_engine(algorithm)
+        path, cost, expanded, elapsed_time = search(grid, start, goal)
+        results.append(BatchResult(index=index, path=path, cost=cost, expanded=expanded, elapsed_time=elapsed_time))
+    return results
+
+
+# Maps this worker keeps attached, so consecutive chunks of the same map do
+# not re-attach the segments.
+_RECENT: "OrderedDict[SharedGridHandle, None]" = OrderedDict()
+_RECENT_LIMIT = 4
+
+
+def _worker_solve(handle: SharedGridHandle, tasks: Sequence[Task]) -> List[BatchResult]:
+    if handle in _RECENT:
+        _RECENT.move_to_end(handle)
+    else:
+        acquire_grid(handle)
+        _RECENT[handle] = None
+        while len(_RECENT) > _RECENT_LIMIT:
+            old_handle, _ = _RECENT.popitem(last=False)
+            release_grid(old_handle)
+    attached = acquire_grid(handle)
+    try:
+        return _solve_tasks(attached.grid, tasks)
+    finally:
+        release_grid(handle)
+
+
+def _group_queries(queries: Sequence[BatchQuery]) -> "OrderedDict[MapKey, List[Task]]":
+    groups: "OrderedDict[MapKey, List[Task]]" = OrderedDict()
+    for index, query in enumerate(queries):
+        groups.setdefault(_map_key(query), []).append((index, query.start, query.goal, query.algorithm))
+    return groups
+
+
+def iter_batch(
+    queries: Iterable[BatchQuery],
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    max_maps_in_flight: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    # Yields results as soon as their chunk finishes (not in submission order).
+    queries = list(queries)
+    groups = _group_queries(queries)
+
+    if workers == 0:
+        for key, tasks in groups.items():
+            grid = _load_map(key)
+            for result in _solve_tasks(grid, tasks):
+                yield result
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_maps_in_flight = max_maps_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Dict[Future, MapKey] = {}
+        remaining: Dict[MapKey, int] = {}
+        published: Dict[MapKey, SharedGrid] = {}
+
+        def drain(return_when: str) -> Iterator[BatchResult]:
+            done, _ = wait(set(pending), return_when=return_when)
+            for future in done:
+                key = pending.pop(future)
+                remaining[key] -= 1
+                if remaining[key] == 0:
+                    published.pop(key).close()
+                for result in future.result():
+                    yield result
+
+        try:
+            for key, tasks in groups.items():
+                while len(published) >= max_maps_in_flight:
+                    yield from drain(FIRST_COMPLETED)
+                shared = SharedGrid(_load_map(key))
+                published[key] = shared
+                chunks = [tasks[i : i + chunk_size] for i in range(0, len(tasks), chunk_size)]
+                remaining[key] = len(chunks)
+                for chunk in chunks:
+                    pending[pool.submit(_worker_solve, shared.handle, chunk)] = key
+            while pending:
+                yield from drain(FIRST_COMPLETED)
+        finally:
+            for future in pending:
+                future.cancel()
+            for shared in published.values():
+                shared.close()
+
+
+def solve_batch(
+    queries: Iterable[BatchQuery],
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+    max_maps_in_flight: Optional[int] = None,
+) -> List[BatchResult]:
+    queries = list(queries)
+    ordered: List[Optional[BatchResult]] = [None] * len(queries)
+    for result in iter_batch(queries, workers=workers, chunk_size=chunk_size, max_maps_in_flight=max_maps_in_flight):
+        ordered[result.index] = result
+    return ordered  # type: ignore[return-value]
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .weighted_grid import WeightedGridMap
+
+NO_MIDDLE = -1
+
+
+@dataclass
+class ContractionHierarchy:
+    width: int
+    height: int
+    rank: array  # rank[node], -1 for blocked cells
+    first_out: array  # CSR offsets into heads/costs/middles, len = width * height + 1
+    heads: array  # upward edge targets (higher rank)
+    costs: array
+    middles: array  # contracted node of a shortcut or NO_MIDDLE for grid edges
+    shortcuts: int = 0
+
+    def node_id(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def node_xy(self, node: int) -> Tuple[int, int]:
+        return node % self.width, node // self.width
+
+    def nbytes(self) -> int:
+        return sum(
+            arr.itemsize * len(arr)
+            for arr in (self.rank, self.first_out, self.heads, self.costs, self.middles)
+        )
+
+    def upward_edges(self, node: int) -> range:
+        return range(self.first_out[node], self.first_out[node + 1])
+
+    def _edge_middle(self, a: int, b: int) -> int:
+        low, high = (a, b) if self.rank[a] < self.rank[b] else (b, a)
+        for e in self.upward_edges(low):
+            if self.heads[e] == high:
+                return self.middles[e]
+        raise ValueError(f"No hierarchy edge between {a} and {b}")
+
+    def unpack_edge(self, a: int, b: int) -> List[int]:
+        # Returns the grid nodes strictly after `a` up to and including `b`.
+        out: List[int] = []
+        stack: List[Tuple[int, int]] = [(a, b)]
+        while stack:
+            u, v = stack.pop()
+            middle = self._edge_middle(u, v)
+            if middle == NO_MIDDLE:
+                out.append(v)
+            else:
+                stack.append((middle, v))
+                stack.append((u, middle))
+        return out
+
+
+def _grid_adjacency(grid: WeightedGridMap) -> List[Dict[int, Tuple[float, int]]]:
+    width = grid.width
+    adjacency: List[Dict[int, Tuple[float, int]]] = [dict() for _ in range(width * grid.height)]
+    for y in range(grid.height):
+        for x in range(width):
+            if not grid.walkable[y][x]:
+                continue
+            edges = adjacency[y * width + x]
+            for nx, ny in grid.neighbors8(x, y):
+                edges[ny * width + nx] = (grid.transition_cost(x, y, nx, ny), NO_MIDDLE)
+    return adjacency
+
+
+def _witness_distances(
+    adjacency: List[Dict[int, Tuple[float, int]]],
+    source: int,
+    skip: int,
+    max_cost: float,
+    settle_limit: int,
+) -> Dict[int, float]:
+    dist: Dict[int, float] = {source: 0.0}
+    heap: List[Tuple[float, int]] = [(0.0, source)]
+    settled = 0
+    while heap and settled < settle_limit:
+        d, u = heapq.heappop(heap)
+        if d > dist.get(u, math.inf):
+            continue
+        if d > max_cost:
+            break
+        settled += 1
+        for v, (cost, _) in adjacency[u].items():
+            if v == skip:
+                continue
+            nd = d + cost
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+
+def _required_shortcuts(
+    adjacency: List[Dict[int, Tuple[float, int]]],
+    node: int,
+    settle_limit: int,
+) -> List[Tuple[int, int, float]]:
+    neighbors = list(adjacency[node].items())
+    shortcuts: List[Tuple[int, int, float]] = []
+    for i, (u, (cost_u, _)) in enumerate(neighbors):
+        targets = neighbors[i + 1 :]
+        if not targets:
+            continue
+        max_cost = cost_u + max(cost for _, (cost, _) in targets)
+        dist = _witness_distances(adjacency, u, node, max_cost, settle_limit)
+        for w, (cost_w, _) in targets:
+            via = cost_u + cost_w
+            if dist.get(w, math.inf) > via + 1e-9:
+                shortcuts.append((u, w, via))
+    return shortcuts
+
+
+def _priority(
+    adjacency: List[Dict[int, Tuple[float, int]]],
+    node: int,
+    deleted_neighbors: List[int],
+    settle_limit: int,
+) -> int:
+    shortcuts = _required_shortcuts(adjacency, node, settle_limit)
+    return 2 * len(shortcuts) - len(adjacency[node]) + deleted_neighbors[node]
+
+
+def build_contraction_hierarchy(grid: WeightedGridMap, settle_limit: int = 64) -> ContractionHierarchy:
+    n = grid.width * grid.height
+    adjacency = _grid_adjacency(grid)
+    deleted_neighbors = [0] * n
+    rank = array("i", [-1] * n)
+    upward: List[List[Tuple[int, float, int]]] = [[] for _ in range(n)]
+
+    queue: List[Tuple[int, int]] = []
+    for y in range(grid.height):
+        for x in range(grid.width):
+            if grid.walkable[y][x]:
+                node = y * grid.width + x
+                queue.append((_priority(adjacency, node, deleted_neighbors, settle_limit), node))
+    heapq.heapify(queue)
+
+    order = 0
+    shortcut_count = 0
+    while queue:
+        _, node = heapq.heappop(queue)
+        if rank[node] != -1:
+            continue
+        # Lazy update: re-check the priority against the next candidate.
+        prio = _priority(adjacency, node, deleted_neighbors, settle_limit)
+        if queue and prio > queue[0][0]:
+            heapq.heappush(queue, (prio, node))
+            continue
+
+        for u, w, via in _required_shortcuts(adjacency, node, settle_limit):
+            existing = adjacency[u].get(w)
+            if existing is None or via + 1e-9 < existing[0]:
+                adjacency[u][w] = (via, node)
+                adjacency[w][u] = (via, node)
+                shortcut_count += 1
+
+        rank[node] = order
+        order += 1
+        for v, (cost, middle) in adjacency[node].items():
+            upward[node].append((v, cost, middle))
+            del adjacency[v][node]
+            deleted_neighbors[v] += 1
+        adjacency[node] = {}
+
+    first_out = array("i", [0] * (n + 1))
+    heads = array("i")
+    costs = array("d")
+    middles = array("i")
+    for node in range(n):
+        for head, cost, middle in upward[node]:
+            heads.append(head)
+            costs.append(cost)
+            middles.append(middle)
+        first_out[node + 1] = len(heads)
+
+    return ContractionHierarchy(
+        width=grid.width,
+        height=grid.height,
+        rank=rank,
+        first_out=first_out,
+        heads=heads,
+        costs=costs,
+        middles=middles,
+        shortcuts=shortcut_count,
+    )
+
+
+def ch_search(
+    ch: ContractionHierarchy, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    start_time = time.perf_counter()
+    s = ch.node_id(*start)
+    t = ch.node_id(*goal)
+    if ch.rank[s] == -1 or ch.rank[t] == -1:
+        return [], math.inf, 0, time.perf_counter() - start_time
+    if s == t:
+        return [start], 0.0, 1, time.perf_counter() - start_time
+
+    first_out, heads, costs = ch.first_out, ch.heads, ch.costs
+    dists: Tuple[Dict[int, float], Dict[int, float]] = ({s: 0.0}, {t: 0.0})
+    parents: Tuple[Dict[int, Optional[int]], Dict[int, Optional[int]]] = ({s: None}, {t: None})
+    heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = ([(0.0, s)], [(0.0, t)])
+    best = math.inf
+    meeting: Optional[int] = None
+    expanded = 0
+
+    while True:
+        top_forward = heaps[0][0][0] if heaps[0] else math.inf
+        top_backward = heaps[1][0][0] if heaps[1] else math.inf
+        if min(top_forward, top_backward) >= best:
+            break
+        side = 0 if top_forward <= top_backward else 1
+
+        d, u = heapq.heappop(heaps[side])
+        dist = dists[side]
+        if d > dist.get(u, math.inf):
+            continue
+        expanded += 1
+
+        other = dists[1 - side].get(u)
+        if other is not None and d + other < best:
+            best = d + other
+            meeting = u
+
+        parent = parents[side]
+        for e in range(first_out[u], first_out[u + 1]):
+            v = heads[e]
+            nd = d + costs[e]
+            if nd < dist.get(v, math.inf):
+                dist[v] = nd
+                parent[v] = u
+                heapq.heappush(heaps[side], (nd, v))
+
+    if meeting is None:
+        return [], math.inf, expanded, time.perf_counter() - start_time
+
+    up_chain: List[int] = []
+    node: Optional[int] = meeting
+    while node is not None:
+        up_chain.append(node)
+        node = parents[0][node]
+    up_chain.reverse()
+    node = parents[1][meeting]
+    down_chain: List[int] = [meeting]
+    while node is not None:
+        down_chain.append(node)
+        node = parents[1][node]
+
+    cells: List[int] = [s]
+    chain = up_chain + down_chain[1:]
+    for a, b in zip(chain, chain[1:]):
+        cells.extend(ch.unpack_edge(a, b))
+
+    path = [ch.node_xy(c) for c in cells]
+    elapsed_time = time.perf_counter() - start_time
+    return path, best, expanded, elapsed_time
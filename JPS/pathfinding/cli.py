@@ -11,8 +11,21 @@ from .grid import GridMap, ScenarioProblem, load_scenarios
 from .jps import jump_point_search
 from .jpsw import jump_point_search_weighted
 from .path_utils import expand_path
+from .profiling import RepeatedRun, format_top, profile_search, repeat_search
+from .stats import STAT_FIELDS
+from .suboptimal import BOUNDED_MODES, get_bounded_engine
+from .trace import SearchTrace
 from .weighted_grid import WeightedGridMap
 
+COUNTER_FIELDS = [name for name in STAT_FIELDS if not name.endswith("_time")]
+
+CLI_ENGINES = {
+    "jps": (jump_point_search, "JPS"),
+    "astar": (astar_search, "ASTAR"),
+    "jpsw": (jump_point_search_weighted, "JPSW"),
+    "astarw": (astarw_search, "ASTARW"),
+}
+
 
 def _render_path(grid: GridMap, path: List[Tuple[int, int]], start: Tuple[int, int], goal: Tuple[int, int]) -> str:
     chars = [row.copy() for row in (grid.chars or [])]
@@ -65,6 +78,12 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument("--visualize", action="store_true", help="Save a PNG visualization of the map and path.",)
     parser.add_argument( "--figure-path", dest="figure_path", help="Path to PNG file for visualization. If omitted but --visualize is set, a file will be saved in ./assets.",)
     parser.add_argument("--terrain-weights", dest="terrain_weights_path", help="Optional JSON mapping of terrain symbols to costs for weighted algorithms.")
+    parser.add_argument("--epsilon", type=float, default=0.0, help="Accept paths up to (1 + epsilon) times the optimal cost.")
+    parser.add_argument("--suboptimal-mode", choices=BOUNDED_MODES, default="wastar", help="Bounded-suboptimal variant used when --epsilon > 0 (focal is A*/A*W only).")
+    parser.add_argument("--trace", dest="trace_path", help="Save the expansion trace (.npz); render it with `python -m pathfinding.trace`.")
+    parser.add_argument("--repeat", type=int, default=1, help="Run the search N times; report aggregated timing, expansion and phase counters.")
+    parser.add_argument("--profile", dest="profile_prefix", help="Profile the repeated runs: writes PREFIX.pstats (cProfile) and PREFIX.folded (sampled stacks for flamegraph tools).")
+    parser.add_argument("--profile-interval", type=float, default=0.001, help="Sampling interval of --profile in seconds.")
     # parser.add_argument("--max-recursion", type=int, default=10_000, help="Recursion limit for jump search")
 
     args = parser.parse_args(argv)
@@ -77,6 +96,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     goal: Tuple[int, int]
     grid: GridMap | WeightedGridMap
     optimal_length: Optional[float] = None
+    map_path: str
     use_weighted = args.algorithm in {"jpsw", "astarw"}
 
     if args.scenario_path:
@@ -95,6 +115,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         start = (prob.start_x, prob.start_y)
         goal = (prob.goal_x, prob.goal_y)
         optimal_length = prob.optimal_length
+        map_path = prob.map_path
     else:
         if args.map_path is None:
             print("Please provide --map or --scenario.", file=sys.stderr)
@@ -109,40 +130,95 @@ def main(argv: Optional[List[str]] = None) -> int:
             grid = GridMap.from_movingai_map(args.map_path)
         start = (int(args.start_x), int(args.start_y))
         goal = (int(args.goal_x), int(args.goal_y))
+        map_path = args.map_path
 
     if not grid.is_walkable(*start) or not grid.is_walkable(*goal):
         print("Start or goal is blocked.", file=sys.stderr)
         return 1
 
-    if args.algorithm == "jps":
-        path, cost, expanded, elapsed_time = jump_point_search(grid, start, goal)
-        algo_name = "JPS"
-    elif args.algorithm == "astar":
-        path, cost, expanded, elapsed_time = astar_search(grid, start, goal)
-        algo_name = "ASTAR"
-    elif args.algorithm == "jpsw":
-        path, cost, expanded, elapsed_time = jump_point_search_weighted(grid, start, goal)  # type: ignore[arg-type]
-        algo_name = "JPSW"
+    if args.epsilon < 0:
+        print("--epsilon must be non-negative.", file=sys.stderr)
+        return 1
+
+    if args.trace_path and args.epsilon > 0:
+        print("--trace is not supported for bounded-suboptimal searches.", file=sys.stderr)
+        return 1
+
+    if args.repeat < 1 or args.profile_interval <= 0:
+        print("--repeat and --profile-interval must be positive.", file=sys.stderr)
+        return 1
+
+    repeated = args.repeat > 1 or args.profile_prefix is not None
+    if repeated and args.epsilon > 0:
+        print("--repeat and --profile are not supported for bounded-suboptimal searches.", file=sys.stderr)
+        return 1
+
+    trace = SearchTrace() if args.trace_path else None
+    bound: Optional[float] = None
+    run: Optional[RepeatedRun] = None
+    if args.epsilon > 0:
+        try:
+            search = get_bounded_engine(args.algorithm, args.suboptimal_mode)
+        except ValueError as exc:
+            print(str(exc), file=sys.stderr)
+            return 1
+        path, cost, expanded, elapsed_time, bound = search(grid, start, goal, args.epsilon)
+        algo_name = f"{args.algorithm.upper()}-{args.suboptimal_mode.upper()}"
     else:
-        path, cost, expanded, elapsed_time = astarw_search(grid, start, goal)  # type: ignore[arg-type]
-        algo_name = "ASTARW"
+        search_fn, algo_name = CLI_ENGINES[args.algorithm]
+        if trace is not None or not repeated:
+            path, cost, expanded, elapsed_time = search_fn(grid, start, goal, trace=trace)  # type: ignore[arg-type]
+        if repeated:
+            run = repeat_search(search_fn, grid, start, goal, args.repeat)
+            path, cost, expanded, elapsed_time = run.result
 
     print(f"Algorithm: {algo_name}")
     print(f"Path cost: {cost:.6f}")
     print(f"Expanded nodes: {expanded}")
-    print(f"Time elapsed: {elapsed_time:.6f} seconds")
+    if run is None:
+        print(f"Time elapsed: {elapsed_time:.6f} seconds")
+    else:
+        print(f"Time elapsed: {run.mean_time:.6f} seconds (mean of {len(run.times)} runs; "
+              f"median {run.median_time:.6f}, min {min(run.times):.6f}, stdev {run.stdev_time:.6f})")
+        print("Counters: " + ", ".join(f"{name}={run.stats[name]:g}" for name in COUNTER_FIELDS))
+        print("Phases: " + ", ".join(f"{name} {run.stats[name + '_time']:.6f}s" for name in ("setup", "search", "reconstruct")))
+    if bound is not None:
+        print(f"Suboptimality bound: {bound:.6f}")
     if optimal_length is not None:
         diff = abs(cost - optimal_length)
         status = "match" if math.isclose(cost, optimal_length, rel_tol=1e-6, abs_tol=1e-6) else "differs"
         print(f"Scenario optimal: {optimal_length:.6f} ({status}, error {diff:.6f})")
 
+    if trace is not None:
+        trace.save(
+            args.trace_path,
+            engine=args.algorithm,
+            map_path=map_path,
+            weighted=use_weighted,
+            width=grid.width,
+            height=grid.height,
+            start=list(start),
+            goal=list(goal),
+            cost=cost if math.isfinite(cost) else None,
+            expanded=expanded,
+        )
+        print(f"Saved trace ({trace.expansions} expansions) to: {args.trace_path}")
+
+    if args.profile_prefix is not None:
+        pstats_path, folded_path, profile = profile_search(
+            search_fn, grid, start, goal, args.repeat, args.profile_prefix, args.profile_interval
+        )
+        print(format_top(profile, limit=10), end="")
+        print(f"Saved cProfile stats to: {pstats_path}")
+        print(f"Saved collapsed stacks to: {folded_path}")
+
     if args.show_path and path:
         print(_render_path(grid, expand_path(path), start, goal))
     elif args.show_path:
         print("No path found to display.")
 
     path_for_plot: List[Tuple[int, int]] = expand_path(path) if path else []
-    jump_points: Optional[List[Tuple[int, int]]] = path if (path and algo_name in {"JPS", "JPSW"}) else None
+    jump_points: Optional[List[Tuple[int, int]]] = path if (path and algo_name.split("-")[0] in {"JPS", "JPSW"}) else None
 
     if args.visualize:
         from .visualize import render_grid_path
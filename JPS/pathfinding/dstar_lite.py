@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .grid import GridMap
+from .heuristics import octile_distance, successors
+from .jps import DIRECTIONS_8
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+Key = Tuple[float, float]
+
+KEY_DIGITS = 9
+
+
+class DStarLite:
+    # Searches backwards from the goal so that the start (the agent) can move
+    # and the map can change without discarding the g/rhs values.
+
+    def __init__(self, grid: GridLike, start: Tuple[int, int], goal: Tuple[int, int]) -> None:
+        self.grid = grid
+        self.goal = goal
+        self.start = start
+        self._weighted = isinstance(grid, WeightedGridMap)
+        self.edits = grid.subscribe_edits()
+        self.reset()
+
+    def reset(self) -> None:
+        self.last = self.start
+        self.km = 0.0
+        self.g: Dict[Tuple[int, int], float] = {}
+        self.rhs: Dict[Tuple[int, int], float] = {self.goal: 0.0}
+        self.open_heap: List[Tuple[float, float, int, Tuple[int, int]]] = []
+        self.open_keys: Dict[Tuple[int, int], Key] = {}
+        self.counter = 0
+        self.expanded = 0
+        self._h_scale = self.grid.min_cell_cost() if self._weighted else 1.0
+        self._push(self.goal, self._key(self.goal))
+
+    def _h(self, node: Tuple[int, int]) -> float:
+        return octile_distance(self.start, node) * self._h_scale
+
+    def _key(self, node: Tuple[int, int]) -> Key:
+        best = min(self.g.get(node, math.inf), self.rhs.get(node, math.inf))
+        # Keys are sums of float edge costs, so equal keys can differ in the last
+        # bits; rounding keeps the heap order and the stopping test consistent.
+        return round(best + self._h(node) + self.km, KEY_DIGITS), best
+
+    def _push(self, node: Tuple[int, int], key: Key) -> None:
+        self.open_keys[node] = key
+        self.counter += 1
+        heapq.heappush(self.open_heap, (key[0], key[1], self.counter, node))
+
+    def _successors(self, node: Tuple[int, int]) -> Iterable[Tuple[Tuple[int, int], float]]:
+        x, y = node
+        if not self.grid.is_walkable(x, y):
+            return
+        for nx, ny, cost in successors(self.grid, x, y):
+            yield (nx, ny), cost
+
+    def _around(self, node: Tuple[int, int]) -> Iterable[Tuple[int, int]]:
+        x, y = node
+        for dx, dy in DIRECTIONS_8:
+            if self.grid.in_bounds(x + dx, y + dy):
+                yield (x + dx, y + dy)
+
+    def _update_vertex(self, node: Tuple[int, int]) -> None:
+        if node != self.goal:
+            best = math.inf
+            for succ, cost in self._successors(node):
+                cand = cost + self.g.get(succ, math.inf)
+                if cand < best:
+                    best = cand
+            self.rhs[node] = best
+        self.open_keys.pop(node, None)
+        if self.g.get(node, math.inf) != self.rhs.get(node, math.inf):
+            self._push(node, self._key(node))
+
+    def _top_key(self) -> Key:
+        heap = self.open_heap
+        while heap:
+            k1, k2, _, node = heap[0]
+            if self.open_keys.get(node) == (k1, k2):
+                return k1, k2
+            heapq.heappop(heap)
+        return math.inf, math.inf
+
+    def compute_shortest_path(self) -> int:
+        expanded = 0
+        start = self.start
+        while True:
+            top = self._top_key()
+            if not (top < self._key(start) or self.rhs.get(start, math.inf) != self.g.get(start, math.inf)):
+                break
+            if top[0] == math.inf:
+                break
+            _, _, _, node = heapq.heappop(self.open_heap)
+            del self.open_keys[node]
+            new_key = self._key(node)
+            if top < new_key:
+                self._push(node, new_key)
+                continue
+
+            expanded += 1
+            g_old = self.g.get(node, math.inf)
+            rhs = self.rhs.get(node, math.inf)
+            if g_old > rhs:
+                self.g[node] = rhs
+                for pred, _ in self._successors(node):
+                    self._update_vertex(pred)
+            else:
+                self.g[node] = math.inf
+                self._update_vertex(node)
+                for pred in self._around(node):
+                    self._update_vertex(pred)
+        self.expanded += expanded
+        return expanded
+
+    def move_to(self, start: Tuple[int, int]) -> None:
+        self.km += octile_distance(self.last, start) * self._h_scale
+        self.last = start
+        self.start = start
+
+    def update_cells(self, cells: Optional[Iterable[Tuple[int, int]]] = None) -> None:
+        changed: Set[Tuple[int, int]] = set(self.edits.take() if cells is None else cells)
+        if not changed:
+            return
+        if self._weighted and self.grid.min_cell_cost() < self._h_scale:
+            # The heuristic scale is no longer admissible; start over.
+            self.reset()
+            return
+        touched: Set[Tuple[int, int]] = set()
+        for cell in changed:
+            touched.add(cell)
+            touched.update(self._around(cell))
+        for node in touched:
+            self._update_vertex(node)
+
+    def extract_path(self) -> List[Tuple[int, int]]:
+        if self.g.get(self.start, math.inf) == math.inf:
+            return []
+        path = [self.start]
+        node = self.start
+        limit = self.grid.width * self.grid.height
+        while node != self.goal and len(path) <= limit:
+            best_node, best_cost = None, math.inf
+            for succ, cost in self._successors(node):
+                cand = cost + self.g.get(succ, math.inf)
+                if cand < best_cost:
+                    best_node, best_cost = succ, cand
+            if best_node is None:
+                return []
+            node = best_node
+            path.append(node)
+        return path if node == self.goal else []
+
+    def plan(self) -> Tuple[List[Tuple[int, int]], float, int, float]:
+        start_time = time.perf_counter()
+        expanded = self.compute_shortest_path()
+        path = self.extract_path()
+        cost = self.g.get(self.start, math.inf) if path else math.inf
+        elapsed_time = time.perf_counter() - start_time
+        return path, cost, expanded, elapsed_time
+
+    def replan(
+        self, cells: Optional[Iterable[Tuple[int, int]]] = None
+    ) -> Tuple[List[Tuple[int, int]], float, int, float]:
+        start_time = time.perf_counter()
+        self.update_cells(cells)
+        path, cost, expanded, _ = self.plan()
+        return path, cost, expanded, time.perf_counter() - start_time
+
+
+def dstar_lite_search(
+    grid: GridLike, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    start_time = time.perf_counter()
+    path, cost, expanded, _ = DStarLite(grid, start, goal).plan()
+    return path, cost, expanded, time.perf_counter() - start_time
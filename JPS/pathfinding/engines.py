@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Set, Tuple
+
+from .astar import astar_search
+from .astarw import astarw_search
+from .epea import epea_search, epea_search_weighted
+from .fringe import fringe_search, fringe_search_weighted
+from .jps import jump_point_search
+from .jpsw import jump_point_search_weighted
+
+SearchResult = Tuple[List[Tuple[int, int]], float, int, float]
+SearchFunction = Callable[..., SearchResult]
+
+SEARCH_ENGINES: Dict[str, SearchFunction] = {
+    "astar": astar_search,
+    "jps": jump_point_search,
+    "astarw": astarw_search,
+    "jpsw": jump_point_search_weighted,
+    "fringe": fringe_search,
+    "fringew": fringe_search_weighted,
+    "epea": epea_search,
+    "epeaw": epea_search_weighted,
+}
+
+WEIGHTED_ENGINES: Set[str] = {"astarw", "jpsw", "fringew", "epeaw"}
+# Engines whose search function accepts `stats=SearchStats()`.
+INSTRUMENTED_ENGINES: Set[str] = {"astar", "jps", "astarw", "jpsw"}
+
+
+def get_engine(name: str) -> Tuple[SearchFunction, bool]:
+    try:
+        return SEARCH_ENGINES[name], name in WEIGHTED_ENGINES
+    except KeyError as exc:
+        raise ValueError(f"Unknown search algorithm '{name}'") from exc
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .grid import GridMap
+from .heuristics import octile_distance, step_cost
+from .stepwise import StepwiseSearch
+from .trace import SearchTrace
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+OsfKey = Tuple[int, int, int]
+
+DIRECTIONS: List[Tuple[int, int]] = [
+    (dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx != 0 or dy != 0
+]
+
+
+def _sign(v: int) -> int:
+    return (v > 0) - (v < 0)
+
+
+def osf_key(x: int, y: int, goal: Tuple[int, int]) -> OsfKey:
+    # The change of the octile heuristic along a unit move depends only on the
+    # quadrant of the goal and on which axis dominates. Unit moves shift
+    # |dx| - |dy| by at most 2, so differences beyond +-2 behave alike.
+    ox, oy = goal[0] - x, goal[1] - y
+    return _sign(ox), _sign(oy), max(-2, min(2, abs(ox) - abs(oy)))
+
+
+def _build_osf_table() -> Dict[OsfKey, List[Tuple[float, int, int]]]:
+    # Operator selection function: for every class, the moves sorted by
+    # delta-f = step cost + h(child) - h(parent) on a unit-cost grid.
+    table: Dict[OsfKey, List[Tuple[float, int, int]]] = {}
+    for ox in range(-4, 5):
+        for oy in range(-4, 5):
+            key = osf_key(0, 0, (ox, oy))
+            if key in table:
+                continue
+            h = octile_distance((0, 0), (ox, oy))
+            table[key] = sorted(
+                (step_cost(dx, dy) + octile_distance((dx, dy), (ox, oy)) - h, dx, dy) for dx, dy in DIRECTIONS
+            )
+    return table
+
+
+OSF_TABLE = _build_osf_table()
+
+
+class _PartialExpansionSearch(StepwiseSearch):
+    # Enhanced partial-expansion A*. Open entries carry the delta-f window
+    # already generated; a pop generates only the children whose delta-f falls
+    # into the next window and puts the parent back keyed by the smallest
+    # delta-f it has not generated yet. On unit-cost grids the table is exact;
+    # on weighted grids it holds lower bounds (min cell cost per step), so the
+    # candidates are costed exactly before being generated or deferred.
+
+    def __init__(
+        self,
+        grid: GridLike,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        scale: float,
+        trace: Optional[SearchTrace] = None,
+    ) -> None:
+        start_time = time.perf_counter()
+        super().__init__(start, goal, trace=trace)
+        self.grid = grid
+        self.scale = scale
+        # Entries are (f, counter, g, generated_up_to, x, y).
+        self.open_heap: List[Tuple[float, int, float, float, int, int]] = []
+        self.g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
+        self.closed: Set[Tuple[int, int]] = set()
+        self.counter = 0
+        self.pushes = 1
+        self.peak_open = 1
+
+        heapq.heappush(self.open_heap, (octile_distance(start, goal) * scale, self.counter, 0.0, -1.0, start[0], start[1]))
+        self.elapsed_time += time.perf_counter() - start_time
+
+    def _search(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal, scale = self.grid, self.goal, self.scale
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        counter, expanded, pushes, peak_open = self.counter, self.expanded, self.pushes, self.peak_open
+        best_node, best_h = self.best_node, self.best_h
+        trace = self.trace
+        exact = isinstance(grid, GridMap)
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, g_current, low, x, y = heapq.heappop(open_heap)
+            node = (x, y)
+            if node in closed or g_current > g_scores[node] + 1e-9:
+                continue
+
+            h = octile_distance(node, goal) * scale
+            expanded += 1
+            if trace is not None:
+                trace.expand(x, y, g_current, h)
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            delta = f - g_current - h
+            next_delta = math.inf
+            for unit_delta, dx, dy in OSF_TABLE[osf_key(x, y, goal)]:
+                bound = unit_delta * scale
+                if bound >= next_delta - 1e-9:
+                    break  # the table is sorted, no later move can lower next_delta
+                if not grid.valid_step(x, y, dx, dy):
+                    continue
+                nx, ny = x + dx, y + dy
+                neighbor = (nx, ny)
+                if neighbor in closed:
+                    continue
+                if exact:
+                    move_cost = step_cost(dx, dy)
+                    child_delta = bound
+                else:
+                    move_cost = grid.transition_cost(x, y, nx, ny)  # type: ignore[union-attr]
+                    child_delta = move_cost + octile_distance(neighbor, goal) * scale - h
+                if child_delta <= low + 1e-9:
+                    continue  # generated by an earlier partial expansion
+                tentative_g = g_current + move_cost
+                if tentative_g + 1e-9 >= g_scores.get(neighbor, math.inf):
+                    continue  # would not be generated, so it must not keep the parent open
+                if child_delta > delta + 1e-9:
+                    next_delta = min(next_delta, child_delta)
+                    continue
+                g_scores[neighbor] = tentative_g
+                parent_map[neighbor] = node
+                counter += 1
+                pushes += 1
+                heapq.heappush(
+                    open_heap,
+                    (tentative_g + octile_distance(neighbor, goal) * scale, counter, tentative_g, -1.0, nx, ny),
+                )
+
+            if math.isinf(next_delta):
+                closed.add(node)
+            else:
+                counter += 1
+                pushes += 1
+                heapq.heappush(open_heap, (g_current + h + next_delta, counter, g_current, delta, x, y))
+            if len(open_heap) > peak_open:
+                peak_open = len(open_heap)
+
+        self.counter, self.expanded, self.pushes, self.peak_open = counter, expanded, pushes, peak_open
+        self.best_node, self.best_h = best_node, best_h
+
+
+class EPEASearch(_PartialExpansionSearch):
+    def __init__(
+        self, grid: GridMap, start: Tuple[int, int], goal: Tuple[int, int], trace: Optional[SearchTrace] = None
+    ) -> None:
+        super().__init__(grid, start, goal, 1.0, trace)
+
+
+class EPEAWSearch(_PartialExpansionSearch):
+    def __init__(
+        self, grid: WeightedGridMap, start: Tuple[int, int], goal: Tuple[int, int], trace: Optional[SearchTrace] = None
+    ) -> None:
+        super().__init__(grid, start, goal, grid.min_cell_cost(), trace)
+
+
+def epea_search(
+    grid: GridMap, start: Tuple[int, int], goal: Tuple[int, int], trace: Optional[SearchTrace] = None
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    search = EPEASearch(grid, start, goal, trace)
+    search.run()
+    return search.result()
+
+
+def epea_search_weighted(
+    grid: WeightedGridMap, start: Tuple[int, int], goal: Tuple[int, int], trace: Optional[SearchTrace] = None
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    search = EPEAWSearch(grid, start, goal, trace)
+    search.run()
+    return search.result()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from .grid import GridMap
+from .heuristics import DIAGONAL_DISTANCE
+from .jps import DIRECTIONS_8, _has_forced_neighbor_straight, prune_neighbors
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+
+# next_move[y, x] stores the index in DIRECTIONS_8 of the step towards the goal.
+NO_MOVE = -1
+_OPPOSITE: List[int] = [DIRECTIONS_8.index((-dx, -dy)) for dx, dy in DIRECTIONS_8]
+
+
+@dataclass
+class FlowField:
+    goal: Tuple[int, int]
+    distance: np.ndarray  # float64, distance[y, x]; inf where the goal is unreachable
+    next_move: np.ndarray  # int8, next_move[y, x]; NO_MOVE at the goal and unreachable cells
+    expanded: int = 0
+    elapsed_time: float = 0.0
+
+    def cost_from(self, start: Tuple[int, int]) -> float:
+        return float(self.distance[start[1], start[0]])
+
+    def path_from(self, start: Tuple[int, int]) -> List[Tuple[int, int]]:
+        x, y = start
+        if not math.isfinite(self.distance[y, x]):
+            return []
+        path = [(x, y)]
+        while (x, y) != self.goal:
+            move = int(self.next_move[y, x])
+            if move == NO_MOVE:
+                return []
+            dx, dy = DIRECTIONS_8[move]
+            x += dx
+            y += dy
+            path.append((x, y))
+        return path
+
+
+def _canonical_dijkstra(grid: GridMap, goal: Tuple[int, int]) -> Tuple[List[float], List[int], int]:
+    # Dijkstra over jump points only: every cell is labelled while walking the
+    # canonical (JPS) successors of a jump point, and only forced cells are queued.
+    width = grid.width
+    dist = [math.inf] * (width * grid.height)
+    moves = [NO_MOVE] * (width * grid.height)
+    open_heap: List[Tuple[float, int, int, int, int]] = []
+    counter = 0
+    expanded = 0
+
+    def walk_straight(x: int, y: int, d: int, g: float) -> None:
+        nonlocal counter
+        dx, dy = DIRECTIONS_8[d]
+        while grid.valid_step(x, y, dx, dy):
+            x += dx
+            y += dy
+            g += 1.0
+            idx = y * width + x
+            if g + 1e-9 >= dist[idx]:
+                return
+            dist[idx] = g
+            moves[idx] = _OPPOSITE[d]
+            if _has_forced_neighbor_straight(grid, x, y, dx, dy):
+                counter += 1
+                heapq.heappush(open_heap, (g, counter, x, y, d))
+                return
+
+    def walk_diagonal(x: int, y: int, d: int, g: float) -> None:
+        dx, dy = DIRECTIONS_8[d]
+        horizontal, vertical = DIRECTIONS_8.index((dx, 0)), DIRECTIONS_8.index((0, dy))
+        while grid.valid_step(x, y, dx, dy):
+            x += dx
+            y += dy
+            g += DIAGONAL_DISTANCE
+            idx = y * width + x
+            if g + 1e-9 >= dist[idx]:
+                return
+            dist[idx] = g
+            moves[idx] = _OPPOSITE[d]
+            walk_straight(x, y, horizontal, g)
+            walk_straight(x, y, vertical, g)
+
+    gx, gy = goal
+    dist[gy * width + gx] = 0.0
+    heapq.heappush(open_heap, (0.0, counter, gx, gy, NO_MOVE))
+    while open_heap:
+        g, _, x, y, d = heapq.heappop(open_heap)
+        if g > dist[y * width + x] + 1e-9:
+            continue
+        expanded += 1
+        parent = None if d == NO_MOVE else (x - DIRECTIONS_8[d][0], y - DIRECTIONS_8[d][1])
+        for dx, dy in prune_neighbors(grid, (x, y), parent):
+            nd = DIRECTIONS_8.index((dx, dy))
+            if dx != 0 and dy != 0:
+                walk_diagonal(x, y, nd, g)
+            else:
+                walk_straight(x, y, nd, g)
+    return dist, moves, expanded
+
+
+def _weighted_dijkstra(grid: WeightedGridMap, goal: Tuple[int, int]) -> Tuple[List[float], List[int], int]:
+    # Transition costs are symmetric, so distances from the goal equal distances to it.
+    width = grid.width
+    dist = [math.inf] * (width * grid.height)
+    moves = [NO_MOVE] * (width * grid.height)
+    open_heap: List[Tuple[float, int, int]] = []
+    expanded = 0
+
+    gx, gy = goal
+    dist[gy * width + gx] = 0.0
+    heapq.heappush(open_heap, (0.0, gx, gy))
+    while open_heap:
+        g, x, y = heapq.heappop(open_heap)
+        if g > dist[y * width + x]:
+            continue
+        expanded += 1
+        for d, (dx, dy) in enumerate(DIRECTIONS_8):
+            if not grid.valid_step(x, y, dx, dy):
+                continue
+            nx, ny = x + dx, y + dy
+            tentative_g = g + grid.transition_cost(x, y, nx, ny)
+            idx = ny * width + nx
+            if tentative_g < dist[idx]:
+                dist[idx] = tentative_g
+                moves[idx] = _OPPOSITE[d]
+                heapq.heappush(open_heap, (tentative_g, nx, ny))
+    return dist, moves, expanded
+
+
+def compute_flow_field(grid: GridLike, goal: Tuple[int, int]) -> FlowField:
+    if not grid.is_walkable(*goal):
+        raise ValueError(f"Goal {goal} is not walkable")
+    start_time = time.perf_counter()
+    if isinstance(grid, WeightedGridMap):
+        dist, moves, expanded = _weighted_dijkstra(grid, goal)
+    else:
+        dist, moves, expanded = _canonical_dijkstra(grid, goal)
+    shape = (grid.height, grid.width)
+    distance = np.array(dist, dtype=np.float64).reshape(shape)
+    next_move = np.array(moves, dtype=np.int8).reshape(shape)
+    elapsed_time = time.perf_counter() - start_time
+    return FlowField(goal=goal, distance=distance, next_move=next_move, expanded=expanded, elapsed_time=elapsed_time)
+
+
+class FlowFieldCache:
+    # Keeps the most recently used goals; call invalidate() after editing the map.
+
+    def __init__(self, grid: GridLike, capacity: int = 16) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.grid = grid
+        self.capacity = capacity
+        self.fields: "OrderedDict[Tuple[int, int], FlowField]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, goal: Tuple[int, int]) -> FlowField:
+        field = self.fields.get(goal)
+        if field is not None:
+            self.hits += 1
+            self.fields.move_to_end(goal)
+            return field
+        self.misses += 1
+        field = compute_flow_field(self.grid, goal)
+        self.fields[goal] = field
+        while len(self.fields) > self.capacity:
+            self.fields.popitem(last=False)
+        return field
+
+    def path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Tuple[List[Tuple[int, int]], float]:
+        field = self.get(goal)
+        path = field.path_from(start)
+        return path, field.cost_from(start) if path else math.inf
+
+    def invalidate(self) -> None:
+        self.fields.clear()
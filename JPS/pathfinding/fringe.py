@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import math
+import time
+from array import array
+from typing import Callable, List, Optional, Tuple, Union
+
+from .grid import GridMap
+from .heuristics import octile_distance, step_cost
+from .trace import SearchTrace
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+
+NIL = -1
+
+
+def _fringe(
+    grid: GridLike,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    h_scale: float,
+    cost: Callable[[int, int, int, int], float],
+    trace: Optional[SearchTrace] = None,
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    # Fringe Search: one doubly-linked list threaded through flat index arrays
+    # replaces A*'s heap. Nodes over the f threshold stay for the next pass
+    # ("later"), children are linked right after their parent so that they are
+    # visited in the current pass ("now").
+    start_time = time.perf_counter()
+    width = grid.width
+    size = width * grid.height
+    head = size  # sentinel slot
+    next_idx = array("i", [NIL]) * (size + 1)
+    prev_idx = array("i", [NIL]) * (size + 1)
+    in_fringe = bytearray(size)
+    g_scores = array("d", [math.inf]) * size
+    parent = array("i", [NIL]) * size
+    h_cache = array("d", [-1.0]) * size
+    gx, gy = goal
+    expanded = 0
+
+    def h(idx: int) -> float:
+        value = h_cache[idx]
+        if value < 0.0:
+            value = octile_distance((idx % width, idx // width), goal) * h_scale
+            h_cache[idx] = value
+        return value
+
+    start_idx = start[1] * width + start[0]
+    goal_idx = gy * width + gx
+    g_scores[start_idx] = 0.0
+    next_idx[head] = start_idx
+    prev_idx[start_idx] = head
+    in_fringe[start_idx] = 1
+    f_limit = h(start_idx)
+
+    found = False
+    while next_idx[head] != NIL and not found:
+        f_min = math.inf
+        node = next_idx[head]
+        while node != NIL:
+            g = g_scores[node]
+            f = g + h(node)
+            if f > f_limit + 1e-9:
+                if f < f_min:
+                    f_min = f
+                node = next_idx[node]
+                continue
+            if node == goal_idx:
+                found = True
+                break
+
+            expanded += 1
+            x, y = node % width, node // width
+            if trace is not None:
+                trace.expand(x, y, g, h(node))
+            after = node
+            for nx, ny in grid.neighbors8(x, y):
+                child = ny * width + nx
+                tentative_g = g + cost(x, y, nx, ny)
+                if tentative_g + 1e-9 >= g_scores[child]:
+                    continue
+                g_scores[child] = tentative_g
+                parent[child] = node
+                if in_fringe[child]:
+                    p, n = prev_idx[child], next_idx[child]
+                    next_idx[p] = n
+                    if n != NIL:
+                        prev_idx[n] = p
+                    if child == after:
+                        after = p
+                in_fringe[child] = 1
+                n = next_idx[after]
+                next_idx[after] = child
+                prev_idx[child] = after
+                next_idx[child] = n
+                if n != NIL:
+                    prev_idx[n] = child
+                after = child
+
+            following = next_idx[node]
+            p = prev_idx[node]
+            next_idx[p] = following
+            if following != NIL:
+                prev_idx[following] = p
+            in_fringe[node] = 0
+            node = following
+        f_limit = f_min
+
+    elapsed_time = time.perf_counter() - start_time
+    if not found:
+        return [], math.inf, expanded, elapsed_time
+    path: List[Tuple[int, int]] = []
+    idx = goal_idx
+    while idx != NIL:
+        path.append((idx % width, idx // width))
+        idx = parent[idx]
+    path.reverse()
+    return path, g_scores[goal_idx], expanded, elapsed_time
+
+
+def fringe_search(
+    grid: GridMap, start: Tuple[int, int], goal: Tuple[int, int], trace: Optional[SearchTrace] = None
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    return _fringe(grid, start, goal, 1.0, lambda x, y, nx, ny: step_cost(nx - x, ny - y), trace)
+
+
+def fringe_search_weighted(
+    grid: WeightedGridMap, start: Tuple[int, int], goal: Tuple[int, int], trace: Optional[SearchTrace] = None
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    return _fringe(grid, start, goal, grid.min_cell_cost(), grid.transition_cost, trace)
@@ -1,8 +1,26 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class EditSubscription:
+    # The cells edited since one consumer (a jump table, a D* Lite planner)
+    # last took them. Every consumer subscribes on its own, so one catching up
+    # does not hide the edits from the others. Grids hold subscriptions weakly.
+
+    def __init__(self) -> None:
+        self.cells: Set[Tuple[int, int]] = set()
+
+    def take(self) -> Set[Tuple[int, int]]:
+        cells, self.cells = self.cells, set()
+        return cells
+
+
+def _new_subscriptions() -> "weakref.WeakSet[EditSubscription]":
+    return weakref.WeakSet()
 
 
 @dataclass
@@ -11,6 +29,10 @@ class GridMap:
     height: int
     walkable: List[List[bool]] # walkable[y][x]
     chars: Optional[List[List[str]]] = None # chars[y][x]
+    dirty: Set[Tuple[int, int]] = field(default_factory=set, init=False, repr=False, compare=False)
+    _subscriptions: "weakref.WeakSet[EditSubscription]" = field(
+        default_factory=_new_subscriptions, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self) -> None:
         if len(self.walkable) != self.height:
@@ -101,6 +123,62 @@ class GridMap:
                 if self.valid_step(x, y, dx, dy):
                     yield (x + dx, y + dy)
 
+    def set_walkable(self, x: int, y: int, walkable: bool) -> bool:
+        if not self.in_bounds(x, y):
+            raise ValueError(f"Cell ({x}, {y}) is out of bounds")
+        if self.walkable[y][x] == walkable:
+            return False
+        self.walkable[y][x] = walkable
+        if self.chars is not None:
+            self.chars[y][x] = "." if walkable else "#"
+        self._mark_dirty(x, y)
+        return True
+
+    def apply_edits(self, edits: Iterable[Tuple[int, int, bool]]) -> Set[Tuple[int, int]]:
+        changed: Set[Tuple[int, int]] = set()
+        for x, y, walkable in edits:
+            if self.set_walkable(x, y, walkable):
+                changed.add((x, y))
+        return changed
+
+    def _mark_dirty(self, x: int, y: int) -> None:
+        self.dirty.add((x, y))
+        for subscription in self._subscriptions:
+            subscription.cells.add((x, y))
+
+    def subscribe_edits(self) -> EditSubscription:
+        subscription = EditSubscription()
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def take_dirty(self) -> Set[Tuple[int, int]]:
+        # Clears the grid-wide set for every caller; structures kept in sync
+        # with the grid use their own subscribe_edits() instead.
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Subscriptions belong to consumers in this process.
+        return {k: v for k, v in self.__dict__.items() if k != "_subscriptions"}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._subscriptions = _new_subscriptions()
+
+    def dirty_region(self) -> Optional[Tuple[int, int, int, int]]:
+        # Inclusive (x0, y0, x1, y1) box of edited cells grown by one cell, since
+        # an edit changes every transition that touches or cuts past the cell.
+        if not self.dirty:
+            return None
+        xs = [x for x, _ in self.dirty]
+        ys = [y for _, y in self.dirty]
+        return (
+            max(0, min(xs) - 1),
+            max(0, min(ys) - 1),
+            min(self.width - 1, max(xs) + 1),
+            min(self.height - 1, max(ys) + 1),
+        )
+
 
 @dataclass
 class ScenarioProblem:
@@ -112,6 +190,9 @@ class ScenarioProblem:
     goal_x: int
     goal_y: int
     optimal_length: float
+    # MovingAI groups problems into buckets of optimal length // 4; None for
+    # files without the bucket column.
+    bucket: Optional[int] = None
 
 
 def load_scenarios(path: str) -> List[ScenarioProblem]:
@@ -136,8 +217,10 @@ def load_scenarios(path: str) -> List[ScenarioProblem]:
             if len(parts) < 8:
                 continue
             try:
+                bucket: Optional[int] = None
                 if len(parts) >= 9:
-                    _, map_rel, w, h, sx, sy, gx, gy, optimal = parts[:9]
+                    bucket_col, map_rel, w, h, sx, sy, gx, gy, optimal = parts[:9]
+                    bucket = int(bucket_col) if bucket_col.isdigit() else None
                 else:
                     map_rel, w, h, sx, sy, gx, gy, optimal = parts
                 problems.append(
@@ -150,6 +233,7 @@ def load_scenarios(path: str) -> List[ScenarioProblem]:
                         goal_x=int(gx),
                         goal_y=int(gy),
                         optimal_length=float(optimal),
+                        bucket=bucket,
                     )
                 )
             except ValueError:
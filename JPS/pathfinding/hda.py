@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import heapq
+import math
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from typing import Dict, List, Optional, Tuple
+
+from .heuristics import grid_heuristic, successors
+from .shared_grid import GridLike, SharedGrid, SharedGridHandle, acquire_grid, release_grid
+
+# Node batch entries are (x, y, g, parent_x, parent_y); the start has parent -1.
+NodeMessage = Tuple[int, int, float, int, int]
+
+# Slots of the shared counter array.
+SENT, RECEIVED = 0, 1
+
+# How often the caller checks that the workers are still alive, and how long
+# it waits for them to exit once told to stop.
+POLL_INTERVAL = 0.1
+JOIN_TIMEOUT = 5.0
+
+
+def owner_of(x: int, y: int, workers: int) -> int:
+    # Multiplicative hash so that neighbouring cells land on different workers
+    # and every worker gets a share of the frontier.
+    return ((x * 73856093) ^ (y * 19349663)) % workers
+
+
+def _hda_worker(
+    rank: int,
+    workers: int,
+    handle: SharedGridHandle,
+    goal: Tuple[int, int],
+    inboxes: List,
+    results,
+    lock,
+    counters,
+    idle,
+    incumbent,
+    finished,
+    batch_size: int,
+) -> None:
+    attached = acquire_grid(handle)
+    grid = attached.grid
+    inbox = inboxes[rank]
+    open_heap: List[Tuple[float, int, int, int]] = []
+    g_scores: Dict[Tuple[int, int], float] = {}
+    parents: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    outboxes: List[List[NodeMessage]] = [[] for _ in range(workers)]
+    counter = 0
+    expanded = 0
+    # Set by "stop", which can arrive mid-search when the caller gives up.
+    stopped = False
+
+    def relax(x: int, y: int, g: float, px: int, py: int) -> None:
+        nonlocal counter
+        node = (x, y)
+        if g + 1e-9 >= g_scores.get(node, math.inf):
+            return
+        g_scores[node] = g
+        parents[node] = (px, py)
+        if node == goal:
+            with lock:
+                if g < incumbent.value:
+                    incumbent.value = g
+            return
+        f = g + grid_heuristic(node, goal, grid)
+        if f < incumbent.value - 1e-9:
+            counter += 1
+            heapq.heappush(open_heap, (f, counter, x, y))
+
+    def flush(target: int) -> None:
+        batch = outboxes[target]
+        if not batch:
+            return
+        # The send is counted before the batch leaves, so termination cannot be
+        # declared while it is in flight.
+        with lock:
+            counters[SENT] += 1
+        inboxes[target].put(("nodes", batch))
+        outboxes[target] = []
+
+    def receive(message) -> bool:
+        nonlocal stopped
+        kind = message[0]
+        if kind == "nodes":
+            with lock:
+                counters[RECEIVED] += 1
+                idle[rank] = 0
+            for entry in message[1]:
+                relax(*entry)
+            return True
+        if kind == "parent":
+            _, x, y = message
+            results.put(("parent", (x, y), parents.get((x, y))))
+        elif kind == "stop":
+            stopped = True
+        return False
+
+    try:
+        # Search phase: expand from the local open list and exchange batches
+        # until all workers are idle with no batch in flight.
+        while not finished.value and not stopped:
+            while True:
+                try:
+                    receive(inbox.get_nowait())
+                except queue.Empty:
+                    break
+
+            for _ in range(batch_size):
+                if not open_heap:
+                    break
+                f, _, x, y = heapq.heappop(open_heap)
+                node = (x, y)
+                g_current = g_scores[node]
+                if f > g_current + grid_heuristic(node, goal, grid) + 1e-9:
+                    continue
+                if f >= incumbent.value - 1e-9:
+                    open_heap.clear()  # nothing left here can beat the incumbent
+                    break
+                expanded += 1
+                for nx, ny, cost in successors(grid, x, y):
+                    tentative_g = g_current + cost
+                    target = owner_of(nx, ny, workers)
+                    if target == rank:
+                        relax(nx, ny, tentative_g, x, y)
+                    else:
+                        outboxes[target].append((nx, ny, tentative_g, x, y))
+                        if len(outboxes[target]) >= batch_size:
+                            flush(target)
+
+            if open_heap:
+                continue
+            for target in range(workers):
+                flush(target)
+            with lock:
+                idle[rank] = 1
+                if counters[SENT] == counters[RECEIVED] and all(idle[:]):
+                    finished.value = 1
+            try:
+                receive(inbox.get(timeout=0.002))
+            except queue.Empty:
+                pass
+
+        if not stopped:
+            results.put(("stats", rank, expanded))
+        # Serve phase: answer parent lookups for path reconstruction.
+        while not stopped:
+            receive(inbox.get())
+    except Exception:
+        results.put(("error", rank, traceback.format_exc()))
+        raise
+    finally:
+        # Batches still buffered for a worker that died would block this
+        # process's exit; once stopping they are of no use to anyone.
+        for target in inboxes:
+            target.cancel_join_thread()
+        release_grid(handle)
+
+
+def _next_result(results, processes: List) -> Tuple:
+    # A worker that crashed or raised never answers, so the wait is polled and
+    # fails as soon as one has exited; workers only exit when told to stop.
+    while True:
+        try:
+            message = results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            for rank, process in enumerate(processes):
+                if not process.is_alive():
+                    raise RuntimeError(f"HDA* worker {rank} exited with code {process.exitcode}")
+            continue
+        if message[0] == "error":
+            raise RuntimeError(f"HDA* worker {message[1]} failed:\n{message[2]}")
+        return message
+
+
+def hda_search(
+    grid: GridLike,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    workers: Optional[int] = None,
+    batch_size: int = 64,
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    # Hash-distributed A*: each cell is owned by one worker process, which keeps
+    # its g-value and parent. Generated nodes are sent to their owners in
+    # batches; the goal's owner maintains the incumbent cost and the search
+    # stops once every worker is idle and every sent batch has been received,
+    # at which point no open node can improve the incumbent.
+    if batch_size < 1:
+        raise ValueError("batch_size must be positive")
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    ctx = mp.get_context()
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    results = ctx.Queue()
+    lock = ctx.Lock()
+    counters = ctx.Array("q", 2, lock=False)
+    idle = ctx.Array("b", workers, lock=False)
+    incumbent = ctx.Value("d", math.inf, lock=False)
+    finished = ctx.Value("b", 0, lock=False)
+
+    with SharedGrid(grid) as shared:
+        processes = [
+            ctx.Process(
+                target=_hda_worker,
+                args=(rank, workers, shared.handle, goal, inboxes, results, lock, counters, idle, incumbent, finished, batch_size),
+                daemon=True,
+            )
+            for rank in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            with lock:
+                counters[SENT] += 1
+            inboxes[owner_of(start[0], start[1], workers)].put(("nodes", [(start[0], start[1], 0.0, -1, -1)]))
+
+            expanded = 0
+            for _ in range(workers):
+                _, _, worker_expanded = _next_result(results, processes)
+                expanded += worker_expanded
+            cost = incumbent.value
+
+            path: List[Tuple[int, int]] = []
+            if not math.isinf(cost):
+                node = goal
+                path.append(node)
+                while node != start:
+                    inboxes[owner_of(node[0], node[1], workers)].put(("parent", node[0], node[1]))
+                    _, _, node = _next_result(results, processes)
+                    path.append(node)
+                path.reverse()
+        finally:
+            for inbox in inboxes:
+                inbox.put(("stop",))
+            for process in processes:
+                process.join(JOIN_TIMEOUT)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+    elapsed_time = time.perf_counter() - start_time
+    return path, cost, expanded, elapsed_time
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import math
-from typing import Tuple
+from typing import Iterator, Tuple, Union
 
+from .grid import GridMap
 from .weighted_grid import WeightedGridMap
 
 DIAGONAL_DISTANCE: float = math.sqrt(2.0)
@@ -23,3 +24,21 @@ def octile_distance(a: Tuple[int, int], b: Tuple[int, int]) -> float:
 def weighted_octile_distance(a: Tuple[int, int], b: Tuple[int, int], grid: WeightedGridMap) -> float:
     base = octile_distance(a, b)
     return base * grid.min_cell_cost()
+
+
+def grid_heuristic(a: Tuple[int, int], b: Tuple[int, int], grid: Union[GridMap, WeightedGridMap]) -> float:
+    # The heuristic A* (octile) or A*W (scaled octile) uses on this grid.
+    if isinstance(grid, WeightedGridMap):
+        return weighted_octile_distance(a, b, grid)
+    return octile_distance(a, b)
+
+
+def successors(grid: Union[GridMap, WeightedGridMap], x: int, y: int) -> Iterator[Tuple[int, int, float]]:
+    # (nx, ny, cost) for every move out of (x, y), with the step costs of A*
+    # and the transition costs of A*W.
+    if isinstance(grid, WeightedGridMap):
+        for nx, ny in grid.neighbors8(x, y):
+            yield nx, ny, grid.transition_cost(x, y, nx, ny)
+    else:
+        for nx, ny in grid.neighbors8(x, y):
+            yield nx, ny, step_cost(nx - x, ny - y)
@@ -3,11 +3,13 @@ from __future__ import annotations
 import heapq
 import math
 import time
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from .grid import GridMap
 from .heuristics import DIAGONAL_DISTANCE, octile_distance
-from .path_utils import reconstruct_path
+from .stats import SearchStats
+from .stepwise import StepwiseSearch
+from .trace import SearchTrace
 
 DIRECTIONS_8: List[Tuple[int, int]] = [
     (1, 0),
@@ -114,6 +116,57 @@ def jump(
             if jump(grid, x, y, 0, dy, goal) is not None:
                 return (x, y)
 
+def _counted_jump(
+    grid: GridMap, x: int, y: int, dx: int, dy: int, goal: Tuple[int, int], stats: SearchStats
+) -> Optional[Tuple[int, int]]:
+    # jump() with call and scanned-cell counters. Kept apart from jump() so the
+    # uninstrumented scan carries no counting at all.
+    stats.jump_calls += 1
+    if dx == 0 and dy == 0:
+        return None
+
+    while True:
+        if not grid.valid_step(x, y, dx, dy):
+            return None
+
+        x += dx
+        y += dy
+        stats.jump_steps += 1
+
+        if (x, y) == goal:
+            return (x, y)
+
+        if dx == 0 or dy == 0:
+            if _has_forced_neighbor_straight(grid, x, y, dx, dy):
+                return (x, y)
+        else:
+            if _counted_jump(grid, x, y, dx, 0, goal, stats) is not None:
+                return (x, y)
+            if _counted_jump(grid, x, y, 0, dy, goal, stats) is not None:
+                return (x, y)
+
+def counting_jump(stats: SearchStats) -> Callable[..., Optional[Tuple[int, int]]]:
+    # The counting scan bound to a stats object, for instrumented searches.
+    def counted(
+        grid: GridMap, x: int, y: int, dx: int, dy: int, goal: Tuple[int, int]
+    ) -> Optional[Tuple[int, int]]:
+        return _counted_jump(grid, x, y, dx, dy, goal, stats)
+
+    return counted
+
+
+def counting_prune(
+    stats: SearchStats, prune: Callable[..., List[Tuple[int, int]]]
+) -> Callable[..., List[Tuple[int, int]]]:
+    # Wraps a pruning rule (plain or weighted) to count the dropped moves.
+    def counted(grid: GridMap, current: Tuple[int, int], parent: Optional[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        directions = prune(grid, current, parent)
+        stats.pruned_directions += len(DIRECTIONS_8) - len(directions)
+        return directions
+
+    return counted
+
+
 def identify_successors(
     grid: GridMap,
     current: Tuple[int, int],
@@ -122,14 +175,16 @@ def identify_successors(
     g_scores: Dict[Tuple[int, int], float],
     parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
     dir_parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+    jump_fn: Callable[..., Optional[Tuple[int, int]]] = jump,
+    prune_fn: Callable[..., List[Tuple[int, int]]] = prune_neighbors,
 ) -> List[Tuple[int, int]]:
 
     x, y = current
     successors: List[Tuple[int, int]] = []
-    directions = prune_neighbors(grid, current, prune_parent)
+    directions = prune_fn(grid, current, prune_parent)
 
     for dx, dy in directions:
-        jp = jump(grid, x, y, dx, dy, goal)
+        jp = jump_fn(grid, x, y, dx, dy, goal)
         if jp is None:
             continue
 
@@ -149,62 +204,181 @@ def identify_successors(
 
     return successors
 
-def jump_point_search(
-    grid: GridMap, start: Tuple[int, int], goal: Tuple[int, int]
-) -> Tuple[List[Tuple[int, int]], float, int, float]:
-    start_time = time.perf_counter()
-    open_heap: List[Tuple[float, int, int, int]] = []
-    g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
-
-    parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+class JumpPointSearch(StepwiseSearch):
+    def __init__(
+        self,
+        grid: GridMap,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        stats: Optional[SearchStats] = None,
+        trace: Optional[SearchTrace] = None,
+    ) -> None:
+        start_time = time.perf_counter()
+        super().__init__(start, goal, stats, trace)
+        self.grid = grid
+        self.open_heap: List[Tuple[float, int, int, int]] = []
+        self.g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
+
+        self.dir_parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+
+        self.closed: Set[Tuple[int, int]] = set()
+        self.counter = 0
+
+        heapq.heappush(self.open_heap, (octile_distance(start, goal), self.counter, start[0], start[1]))
+        self.elapsed_time += time.perf_counter() - start_time
+        if self.stats is not None:
+            self._record_setup()
+            self._jump_fn = counting_jump(self.stats)
+            self._prune_fn = counting_prune(self.stats, prune_neighbors)
+            self._search = self._search_counted  # type: ignore[method-assign]
+
+    def _search(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal = self.grid, self.goal
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        dir_parent = self.dir_parent
+        counter, expanded = self.counter, self.expanded
+        best_node, best_h = self.best_node, self.best_h
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, x, y = heapq.heappop(open_heap)
+            node = (x, y)
+            if node in closed:
+                continue
 
-    dir_parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+            g_current = g_scores.get(node)
+            if g_current is None:
+                continue
 
-    closed: Set[Tuple[int, int]] = set()
-    counter = 0
-    expanded = 0
+            h = octile_distance(node, goal)
+            if f > g_current + h + 1e-9:
+                continue
 
-    heapq.heappush(open_heap, (octile_distance(start, goal), counter, start[0], start[1]))
+            closed.add(node)
+            expanded += 1
+
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            prune_parent = dir_parent.get(node)
+            successors = identify_successors(
+                grid,
+                node,
+                prune_parent,
+                goal,
+                g_scores,
+                parent_map,
+                dir_parent,
+            )
+
+            for succ in successors:
+                if succ in closed:
+                    continue
+                g_val = g_scores[succ]
+                h_val = octile_distance(succ, goal)
+                counter += 1
+                heapq.heappush(open_heap, (g_val + h_val, counter, succ[0], succ[1]))
+
+        self.counter, self.expanded = counter, expanded
+        self.best_node, self.best_h = best_node, best_h
+
+    def _search_counted(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal = self.grid, self.goal
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        dir_parent = self.dir_parent
+        counter, expanded = self.counter, self.expanded
+        best_node, best_h = self.best_node, self.best_h
+        stats, jump_fn, prune_fn = self.stats, self._jump_fn, self._prune_fn
+        trace = self.trace
+        pops = stale_pops = generated = pushes = 0
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, x, y = heapq.heappop(open_heap)
+            pops += 1
+            node = (x, y)
+            if node in closed:
+                stale_pops += 1
+                continue
 
-    while open_heap:
-        f, _, x, y = heapq.heappop(open_heap)
-        node = (x, y)
-        if node in closed:
-            continue
+            g_current = g_scores.get(node)
+            if g_current is None:
+                stale_pops += 1
+                continue
 
-        g_current = g_scores.get(node)
-        if g_current is None:
-            continue
+            h = octile_distance(node, goal)
+            if f > g_current + h + 1e-9:
+                stale_pops += 1
+                continue
 
-        if f > g_current + octile_distance(node, goal) + 1e-9:
-            continue
+            closed.add(node)
+            expanded += 1
+            if trace is not None:
+                trace.expand(x, y, g_current, h)
+
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            prune_parent = dir_parent.get(node)
+            successors = identify_successors(
+                grid,
+                node,
+                prune_parent,
+                goal,
+                g_scores,
+                parent_map,
+                dir_parent,
+                jump_fn,
+                prune_fn,
+            )
+            generated += len(successors)
+            if trace is not None:
+                for sx, sy in successors:
+                    trace.jump(x, y, sx, sy)
+
+            for succ in successors:
+                if succ in closed:
+                    continue
+                g_val = g_scores[succ]
+                h_val = octile_distance(succ, goal)
+                counter += 1
+                pushes += 1
+                heapq.heappush(open_heap, (g_val + h_val, counter, succ[0], succ[1]))
+
+        stats.expanded += expanded - self.expanded
+        stats.pops += pops
+        stats.stale_pops += stale_pops
+        stats.generated += generated
+        stats.pushes += pushes
+        self.counter, self.expanded = counter, expanded
+        self.best_node, self.best_h = best_node, best_h
 
-        closed.add(node)
-        expanded += 1
-
-        if node == goal:
-            path = reconstruct_path(parent_map, goal)
-            elapsed_time = time.perf_counter() - start_time
-            return path, g_current, expanded, elapsed_time
-
-        prune_parent = dir_parent.get(node)
-        successors = identify_successors(
-            grid,
-            node,
-            prune_parent,
-            goal,
-            g_scores,
-            parent_map,
-            dir_parent,
-        )
-
-        for succ in successors:
-            if succ in closed:
-                continue
-            g_val = g_scores[succ]
-            h_val = octile_distance(succ, goal)
-            counter += 1
-            heapq.heappush(open_heap, (g_val + h_val, counter, succ[0], succ[1]))
 
-    elapsed_time = time.perf_counter() - start_time
-    return [], math.inf, expanded, elapsed_time
+def jump_point_search(
+    grid: GridMap,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    stats: Optional[SearchStats] = None,
+    trace: Optional[SearchTrace] = None,
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    search = JumpPointSearch(grid, start, goal, stats, trace)
+    search.run()
+    return search.result()
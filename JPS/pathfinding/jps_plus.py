@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from .grid import GridMap
+from .heuristics import DIAGONAL_DISTANCE, octile_distance
+from .jps import DIRECTIONS_8, _has_forced_neighbor_straight, prune_neighbors
+from .path_utils import reconstruct_path
+
+STRAIGHT_DIRECTIONS: List[Tuple[int, int]] = [d for d in DIRECTIONS_8 if d[0] == 0 or d[1] == 0]
+DIAGONAL_DIRECTIONS: List[Tuple[int, int]] = [d for d in DIRECTIONS_8 if d[0] != 0 and d[1] != 0]
+
+
+class JumpTable:
+    # JPS+ style distances per cell and direction: a positive value is the number
+    # of steps to the next jump point, zero or negative is minus the number of
+    # steps that can be taken before hitting a wall.
+
+    def __init__(self, grid: GridMap) -> None:
+        self.grid = grid
+        size = grid.width * grid.height
+        self.tables: Dict[Tuple[int, int], array] = {d: array("i", bytes(4 * size)) for d in DIRECTIONS_8}
+        self.last_update_cells = 0
+        self.edits = grid.subscribe_edits()
+        self.rebuild()
+
+    @classmethod
+    def from_tables(cls, grid: GridMap, tables: Dict[str, Sequence[int]]) -> "JumpTable":
+        # Wraps precomputed distances (e.g. attached shared memory) without a rebuild.
+        table = cls.__new__(cls)
+        table.grid = grid
+        table.tables = {(dx, dy): tables[f"jump_{dx}_{dy}"] for dx, dy in DIRECTIONS_8}  # type: ignore[misc]
+        table.last_update_cells = 0
+        table.edits = grid.subscribe_edits()
+        return table
+
+    def export_tables(self) -> Dict[str, array]:
+        return {f"jump_{dx}_{dy}": table for (dx, dy), table in self.tables.items()}
+
+    def distance(self, x: int, y: int, dx: int, dy: int) -> int:
+        return self.tables[(dx, dy)][y * self.grid.width + x]
+
+    def _compute(self, x: int, y: int, dx: int, dy: int) -> int:
+        grid = self.grid
+        if not grid.is_walkable(x, y) or not grid.valid_step(x, y, dx, dy):
+            return 0
+        nx, ny = x + dx, y + dy
+        n_idx = ny * grid.width + nx
+        if dx == 0 or dy == 0:
+            if _has_forced_neighbor_straight(grid, nx, ny, dx, dy):
+                return 1
+        else:
+            if self.tables[(dx, 0)][n_idx] > 0 or self.tables[(0, dy)][n_idx] > 0:
+                return 1
+        ahead = self.tables[(dx, dy)][n_idx]
+        return ahead + 1 if ahead > 0 else ahead - 1
+
+    def _sweep(self, dx: int, dy: int, x: int, y: int, pending: Set[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+        # Recompute (x, y) and then walk against the direction; stop once a
+        # value is unchanged and the remaining upstream cells are not pending.
+        table = self.tables[(dx, dy)]
+        sign_flips: Set[Tuple[int, int]] = set()
+        grid = self.grid
+        while grid.in_bounds(x, y):
+            pending.discard((x, y))
+            idx = y * grid.width + x
+            old = table[idx]
+            new = self._compute(x, y, dx, dy)
+            self.last_update_cells += 1
+            if new == old:
+                break
+            table[idx] = new
+            if (old > 0) != (new > 0):
+                sign_flips.add((x, y))
+            x -= dx
+            y -= dy
+        return sign_flips
+
+    def _update_direction(
+        self, dx: int, dy: int, seeds: Iterable[Tuple[int, int]]
+    ) -> Set[Tuple[int, int]]:
+        pending = {(x, y) for x, y in seeds if self.grid.in_bounds(x, y)}
+        # Downstream cells first, so each line is walked at most once per seed.
+        order = sorted(pending, key=lambda c: c[0] * dx + c[1] * dy, reverse=True)
+        sign_flips: Set[Tuple[int, int]] = set()
+        for x, y in order:
+            if (x, y) in pending:
+                sign_flips |= self._sweep(dx, dy, x, y, pending)
+        return sign_flips
+
+    def rebuild(self) -> None:
+        grid = self.grid
+        self.edits.take()
+        for table in self.tables.values():
+            for i in range(len(table)):
+                table[i] = 0
+        all_cells = [(x, y) for y in range(grid.height) for x in range(grid.width)]
+        for dx, dy in STRAIGHT_DIRECTIONS + DIAGONAL_DIRECTIONS:
+            order = sorted(all_cells, key=lambda c: c[0] * dx + c[1] * dy, reverse=True)
+            table = self.tables[(dx, dy)]
+            for x, y in order:
+                table[y * grid.width + x] = self._compute(x, y, dx, dy)
+
+    def update(self, cells: Optional[Iterable[Tuple[int, int]]] = None) -> int:
+        changed = set(self.edits.take() if cells is None else cells)
+        self.last_update_cells = 0
+        if not changed:
+            return 0
+
+        # A straight entry reads cells up to two steps ahead and one to the side.
+        near2 = {(x + ox, y + oy) for x, y in changed for ox in range(-2, 3) for oy in range(-2, 3)}
+        flips: Dict[Tuple[int, int], Set[Tuple[int, int]]] = {}
+        for dx, dy in STRAIGHT_DIRECTIONS:
+            flips[(dx, dy)] = self._update_direction(dx, dy, near2)
+
+        near1 = {(x + ox, y + oy) for x, y in changed for ox in range(-1, 2) for oy in range(-1, 2)}
+        for dx, dy in DIAGONAL_DIRECTIONS:
+            seeds = set(near1)
+            for fx, fy in flips[(dx, 0)] | flips[(0, dy)]:
+                seeds.add((fx - dx, fy - dy))
+            self._update_direction(dx, dy, seeds)
+        return self.last_update_cells
+
+    def jump(self, x: int, y: int, dx: int, dy: int, goal: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        dist = self.tables[(dx, dy)][y * self.grid.width + x]
+        reach = abs(dist)
+        gx, gy = goal[0] - x, goal[1] - y
+        if dx == 0 or dy == 0:
+            if dx != 0 and gy == 0 and gx * dx > 0 and abs(gx) <= reach:
+                return goal
+            if dy != 0 and gx == 0 and gy * dy > 0 and abs(gy) <= reach:
+                return goal
+        elif gx * dx > 0 and gy * dy > 0:
+            k = min(abs(gx), abs(gy))
+            if k <= reach:
+                return (x + k * dx, y + k * dy)
+        if dist > 0:
+            return (x + dist * dx, y + dist * dy)
+        return None
+
+
+def jump_point_search_plus(
+    table: JumpTable, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    start_time = time.perf_counter()
+    grid = table.grid
+    open_heap: List[Tuple[float, int, int, int]] = []
+    g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
+    parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+    dir_parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+    closed: Set[Tuple[int, int]] = set()
+    counter = 0
+    expanded = 0
+
+    heapq.heappush(open_heap, (octile_distance(start, goal), counter, start[0], start[1]))
+
+    while open_heap:
+        f, _, x, y = heapq.heappop(open_heap)
+        node = (x, y)
+        if node in closed:
+            continue
+
+        g_current = g_scores.get(node)
+        if g_current is None:
+            continue
+
+        if f > g_current + octile_distance(node, goal) + 1e-9:
+            continue
+
+        closed.add(node)
+        expanded += 1
+
+        if node == goal:
+            path = reconstruct_path(parent_map, goal)
+            elapsed_time = time.perf_counter() - start_time
+            return path, g_current, expanded, elapsed_time
+
+        for dx, dy in prune_neighbors(grid, node, dir_parent.get(node)):
+            jp = table.jump(x, y, dx, dy, goal)
+            if jp is None or jp in closed:
+                continue
+            jx, jy = jp
+            steps = max(abs(jx - x), abs(jy - y))
+            tentative_g = g_current + float(steps) * (DIAGONAL_DISTANCE if dx != 0 and dy != 0 else 1.0)
+            if tentative_g + 1e-9 < g_scores.get(jp, math.inf):
+                g_scores[jp] = tentative_g
+                parent_map[jp] = node
+                dir_parent[jp] = (jx - dx, jy - dy)
+                counter += 1
+                heapq.heappush(open_heap, (tentative_g + octile_distance(jp, goal), counter, jx, jy))
+
+    elapsed_time = time.perf_counter() - start_time
+    return [], math.inf, expanded, elapsed_time
@@ -3,11 +3,13 @@ from __future__ import annotations
 import time
 import heapq
 import math
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from .heuristics import DIAGONAL_DISTANCE, weighted_octile_distance
-from .jps import DIRECTIONS_8
-from .path_utils import reconstruct_path
+from .jps import DIRECTIONS_8, counting_prune
+from .stats import SearchStats
+from .stepwise import StepwiseSearch
+from .trace import SearchTrace
 from .weighted_grid import WeightedGridMap
 
 TIE_EPS = 1e-9
@@ -91,7 +93,8 @@ def _two_step_cost(
 def prune_neighbors_weighted(
     grid: WeightedGridMap, 
     current: Tuple[int, int], 
-    parent: Optional[Tuple[int, int]]
+    parent: Optional[Tuple[int, int]],
+    local_search: Callable[..., Tuple[float, float]] = local_dijkstra,
 ) -> List[Tuple[int, int]]:
     x, y = current
     if parent is None:
@@ -104,7 +107,7 @@ def prune_neighbors_weighted(
             continue
         neighbor = (x + dx, y + dy)
         direct_cost = _two_step_cost(grid, parent, current, neighbor)
-        best_cost = local_dijkstra(grid, parent, neighbor, patch_nodes)
+        best_cost = local_search(grid, parent, neighbor, patch_nodes)
         if _lexicographically_better(best_cost, direct_cost):
             continue
         pruned.append((dx, dy))
@@ -164,6 +167,56 @@ def _cost_along_ray(
     return total
 
 
+def _counted_jump(
+    grid: WeightedGridMap, x: int, y: int, dx: int, dy: int, goal: Tuple[int, int], stats: SearchStats
+) -> Optional[Tuple[int, int]]:
+    # jump() with call and scanned-cell counters, kept apart from the plain scan.
+    stats.jump_calls += 1
+    if dx == 0 and dy == 0:
+        return None
+
+    cx, cy = x, y
+    while True:
+        if not grid.valid_step(cx, cy, dx, dy):
+            return None
+
+        cx += dx
+        cy += dy
+        stats.jump_steps += 1
+
+        if (cx, cy) == goal:
+            return (cx, cy)
+
+        if _has_multi_terrain_neighbourhood(grid, cx, cy):
+            return (cx, cy)
+
+        if dx != 0 and dy != 0:
+            if _counted_jump(grid, cx, cy, dx, 0, goal, stats) is not None:
+                return (cx, cy)
+            if _counted_jump(grid, cx, cy, 0, dy, goal, stats) is not None:
+                return (cx, cy)
+
+
+def counting_jump(stats: SearchStats) -> Callable[..., Optional[Tuple[int, int]]]:
+    # The counting scan bound to a stats object, for instrumented searches.
+    def counted(
+        grid: WeightedGridMap, x: int, y: int, dx: int, dy: int, goal: Tuple[int, int]
+    ) -> Optional[Tuple[int, int]]:
+        return _counted_jump(grid, x, y, dx, dy, goal, stats)
+
+    return counted
+
+
+def counting_local_search(stats: SearchStats) -> Callable[..., Tuple[float, float]]:
+    def counted(
+        grid: WeightedGridMap, start: Tuple[int, int], goal: Tuple[int, int], allowed_nodes: Set[Tuple[int, int]]
+    ) -> Tuple[float, float]:
+        stats.local_dijkstra_runs += 1
+        return local_dijkstra(grid, start, goal, allowed_nodes)
+
+    return counted
+
+
 def identify_successors(
     grid: WeightedGridMap,
     current: Tuple[int, int],
@@ -172,13 +225,15 @@ def identify_successors(
     g_scores: Dict[Tuple[int, int], float],
     parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
     prev_cell: Dict[Tuple[int, int], Optional[Tuple[int, int]]],
+    jump_fn: Callable[..., Optional[Tuple[int, int]]] = jump,
+    prune_fn: Callable[..., List[Tuple[int, int]]] = prune_neighbors_weighted,
 ) -> List[Tuple[int, int]]:
     successors: List[Tuple[int, int]] = []
     x, y = current
-    directions = prune_neighbors_weighted(grid, current, prune_parent)
+    directions = prune_fn(grid, current, prune_parent)
 
     for dx, dy in directions:
-        jp = jump(grid, x, y, dx, dy, goal)
+        jp = jump_fn(grid, x, y, dx, dy, goal)
         if jp is None:
             continue
 
@@ -193,59 +248,182 @@ def identify_successors(
             successors.append((jx, jy))
 
     return successors
-def jump_point_search_weighted(
-    grid: WeightedGridMap, start: Tuple[int, int], goal: Tuple[int, int]
-) -> Tuple[List[Tuple[int, int]], float, int]:
-    start_time = time.perf_counter()
-    open_heap: List[Tuple[float, int, int, int]] = []
-    g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
-    parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
-    prev_cell: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
-    closed: Set[Tuple[int, int]] = set()
-    counter = 0
-    expanded = 0
-
-    heapq.heappush(open_heap, (weighted_octile_distance(start, goal, grid), counter, start[0], start[1]))
-
-    while open_heap:
-        f, _, x, y = heapq.heappop(open_heap)
-        node = (x, y)
-        if node in closed:
-            continue
+class JumpPointSearchWeighted(StepwiseSearch):
+    def __init__(
+        self,
+        grid: WeightedGridMap,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        stats: Optional[SearchStats] = None,
+        trace: Optional[SearchTrace] = None,
+    ) -> None:
+        start_time = time.perf_counter()
+        super().__init__(start, goal, stats, trace)
+        self.grid = grid
+        self.open_heap: List[Tuple[float, int, int, int]] = []
+        self.g_scores: Dict[Tuple[int, int], float] = {start: 0.0}
+        self.prev_cell: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+        self.closed: Set[Tuple[int, int]] = set()
+        self.counter = 0
+
+        heapq.heappush(self.open_heap, (weighted_octile_distance(start, goal, grid), self.counter, start[0], start[1]))
+        self.elapsed_time += time.perf_counter() - start_time
+        if self.stats is not None:
+            self._record_setup()
+            local_search = counting_local_search(self.stats)
+            self._jump_fn = counting_jump(self.stats)
+            self._prune_fn = counting_prune(
+                self.stats, lambda grid, current, parent: prune_neighbors_weighted(grid, current, parent, local_search)
+            )
+            self._search = self._search_counted  # type: ignore[method-assign]
+
+    def _search(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal = self.grid, self.goal
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        prev_cell = self.prev_cell
+        counter, expanded = self.counter, self.expanded
+        best_node, best_h = self.best_node, self.best_h
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, x, y = heapq.heappop(open_heap)
+            node = (x, y)
+            if node in closed:
+                continue
 
-        g_current = g_scores.get(node)
-        if g_current is None:
-            continue
+            g_current = g_scores.get(node)
+            if g_current is None:
+                continue
 
-        if f > g_current + weighted_octile_distance(node, goal, grid) + 1e-9:
-            continue
+            h = weighted_octile_distance(node, goal, grid)
+            if f > g_current + h + 1e-9:
+                continue
+
+            closed.add(node)
+            expanded += 1
+
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            prune_parent = prev_cell.get(node)
+            successors = identify_successors(
+                grid,
+                node,
+                prune_parent,
+                goal,
+                g_scores,
+                parent_map,
+                prev_cell,
+            )
+
+            for succ in successors:
+                if succ in closed:
+                    continue
+                g_val = g_scores[succ]
+                h_val = weighted_octile_distance(succ, goal, grid)
+                counter += 1
+                heapq.heappush(open_heap, (g_val + h_val, counter, succ[0], succ[1]))
+
+        self.counter, self.expanded = counter, expanded
+        self.best_node, self.best_h = best_node, best_h
+
+    def _search_counted(self, limit: float, deadline: Optional[float]) -> None:
+        grid, goal = self.grid, self.goal
+        open_heap, g_scores, parent_map, closed = self.open_heap, self.g_scores, self.parent_map, self.closed
+        prev_cell = self.prev_cell
+        counter, expanded = self.counter, self.expanded
+        best_node, best_h = self.best_node, self.best_h
+        stats, jump_fn, prune_fn = self.stats, self._jump_fn, self._prune_fn
+        trace = self.trace
+        pops = stale_pops = generated = pushes = 0
+
+        while True:
+            if not open_heap:
+                self._finish()
+                break
+            if expanded >= limit or (deadline is not None and time.perf_counter() >= deadline):
+                break
+
+            f, _, x, y = heapq.heappop(open_heap)
+            pops += 1
+            node = (x, y)
+            if node in closed:
+                stale_pops += 1
+                continue
 
-        closed.add(node)
-        expanded += 1
-
-        if node == goal:
-            path = reconstruct_path(parent_map, goal)
-            elapsed_time = time.perf_counter() - start_time
-            return path, g_current, expanded, elapsed_time
-
-        prune_parent = prev_cell.get(node)
-        successors = identify_successors(
-            grid,
-            node,
-            prune_parent,
-            goal,
-            g_scores,
-            parent_map,
-            prev_cell,
-        )
-
-        for succ in successors:
-            if succ in closed:
+            g_current = g_scores.get(node)
+            if g_current is None:
+                stale_pops += 1
                 continue
-            g_val = g_scores[succ]
-            h_val = weighted_octile_distance(succ, goal, grid)
-            counter += 1
-            heapq.heappush(open_heap, (g_val + h_val, counter, succ[0], succ[1]))
 
-    elapsed_time = time.perf_counter() - start_time
-    return [], math.inf, expanded, elapsed_time
+            h = weighted_octile_distance(node, goal, grid)
+            if f > g_current + h + 1e-9:
+                stale_pops += 1
+                continue
+
+            closed.add(node)
+            expanded += 1
+            if trace is not None:
+                trace.expand(x, y, g_current, h)
+
+            if h < best_h:
+                best_node, best_h = node, h
+
+            if node == goal:
+                self._finish(g_current)
+                break
+
+            prune_parent = prev_cell.get(node)
+            successors = identify_successors(
+                grid,
+                node,
+                prune_parent,
+                goal,
+                g_scores,
+                parent_map,
+                prev_cell,
+                jump_fn,
+                prune_fn,
+            )
+            generated += len(successors)
+            if trace is not None:
+                for sx, sy in successors:
+                    trace.jump(x, y, sx, sy)
+
+            for succ in successors:
+                if succ in closed:
+                    continue
+                g_val = g_scores[succ]
+                h_val = weighted_octile_distance(succ, goal, grid)
+                counter += 1
+                pushes += 1
+                heapq.heappush(open_heap, (g_val + h_val, counter, succ[0], succ[1]))
+
+        stats.expanded += expanded - self.expanded
+        stats.pops += pops
+        stats.stale_pops += stale_pops
+        stats.generated += generated
+        stats.pushes += pushes
+        self.counter, self.expanded = counter, expanded
+        self.best_node, self.best_h = best_node, best_h
+
+
+def jump_point_search_weighted(
+    grid: WeightedGridMap,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    stats: Optional[SearchStats] = None,
+    trace: Optional[SearchTrace] = None,
+) -> Tuple[List[Tuple[int, int]], float, int]:
+    search = JumpPointSearchWeighted(grid, start, goal, stats, trace)
+    search.run()
+    return search.result()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from array import array
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from .grid import GridMap
+from .heuristics import DIAGONAL_DISTANCE, octile_distance, step_cost
+from .path_utils import reconstruct_path
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+Cell = Tuple[int, int]
+
+UNLEARNED = -1.0
+
+# Default move budget of lss_lrta_search, per cell of the map. Solvable random
+# maps take well under one move per cell; proving a goal unreachable by
+# raising h past LearnedHeuristic.cost_limit can take hundreds.
+MOVES_PER_CELL = 4
+
+
+class LearnedHeuristic:
+    # Learned h-values for one goal on one map, one double per cell. Cells that
+    # were never updated fall back to the (scaled) octile distance. Share one
+    # instance between agents and trials so that learning accumulates.
+
+    def __init__(self, grid: GridLike, goal: Cell) -> None:
+        self.grid = grid
+        self.goal = goal
+        self.scale = grid.min_cell_cost() if isinstance(grid, WeightedGridMap) else 1.0
+        self.values = array("d", [UNLEARNED]) * (grid.width * grid.height)
+        # No simple path costs more than visiting every cell with the dearest
+        # step; an h-value above this means the goal is unreachable.
+        max_weight = 1.0
+        if isinstance(grid, WeightedGridMap):
+            max_weight = max(
+                (w for row_w, row_ok in zip(grid.weights, grid.walkable) for w, ok in zip(row_w, row_ok) if ok),
+                default=1.0,
+            )
+        self.cost_limit = grid.width * grid.height * DIAGONAL_DISTANCE * max_weight
+
+    def __call__(self, cell: Cell) -> float:
+        value = self.values[cell[1] * self.grid.width + cell[0]]
+        if value == UNLEARNED:
+            return octile_distance(cell, self.goal) * self.scale
+        return value
+
+    def update(self, cell: Cell, value: float) -> None:
+        self.values[cell[1] * self.grid.width + cell[0]] = value
+
+    def learned_count(self) -> int:
+        return sum(1 for value in self.values if value != UNLEARNED)
+
+
+class LssLrtaAgent:
+    # LSS-LRTA*: each move runs an A* lookahead limited to `lookahead`
+    # expansions, raises the h-values of the expanded cells with a Dijkstra
+    # sweep from the frontier, then walks to the most promising frontier cell.
+    # Work per move is bounded by the lookahead, not by the map size.
+
+    def __init__(
+        self,
+        grid: GridLike,
+        start: Cell,
+        goal: Cell,
+        heuristic: Optional[LearnedHeuristic] = None,
+        lookahead: int = 32,
+    ) -> None:
+        if lookahead < 1:
+            raise ValueError("lookahead must be positive")
+        if heuristic is not None and (heuristic.grid is not grid or heuristic.goal != goal):
+            raise ValueError("The learned heuristic belongs to a different map or goal")
+        self.grid = grid
+        self.goal = goal
+        self.position = start
+        self.heuristic = heuristic or LearnedHeuristic(grid, goal)
+        self.lookahead = lookahead
+        self.trajectory: List[Cell] = [start]
+        self.cost = 0.0
+        self.expanded = 0
+        self.failed = False
+        self.move_times: List[float] = []
+        self._weighted = isinstance(grid, WeightedGridMap)
+
+    @property
+    def done(self) -> bool:
+        return self.failed or self.position == self.goal
+
+    def _cost(self, x: int, y: int, nx: int, ny: int) -> float:
+        if self._weighted:
+            return self.grid.transition_cost(x, y, nx, ny)  # type: ignore[union-attr]
+        return step_cost(nx - x, ny - y)
+
+    def _lookahead(self) -> Tuple[Optional[Cell], Dict[Cell, Optional[Cell]], Set[Cell], Dict[Cell, float]]:
+        h, goal = self.heuristic, self.goal
+        start = self.position
+        # Entries are (f, -g, x, y): ties on f prefer deeper cells.
+        open_heap: List[Tuple[float, float, int, int]] = [(h(start), -0.0, start[0], start[1])]
+        g_scores: Dict[Cell, float] = {start: 0.0}
+        parent_map: Dict[Cell, Optional[Cell]] = {start: None}
+        closed: Set[Cell] = set()
+        expansions = 0
+
+        while open_heap:
+            _, neg_g, x, y = open_heap[0]
+            node = (x, y)
+            g = -neg_g
+            if node in closed or g > g_scores[node]:
+                heapq.heappop(open_heap)
+                continue
+            if node == goal or expansions >= self.lookahead:
+                break
+            heapq.heappop(open_heap)
+            closed.add(node)
+            expansions += 1
+            for nx, ny in self.grid.neighbors8(x, y):
+                neighbor = (nx, ny)
+                if neighbor in closed:
+                    continue
+                tentative_g = g + self._cost(x, y, nx, ny)
+                if tentative_g + 1e-9 < g_scores.get(neighbor, math.inf):
+                    g_scores[neighbor] = tentative_g
+                    parent_map[neighbor] = node
+                    heapq.heappush(open_heap, (tentative_g + h(neighbor), -tentative_g, nx, ny))
+
+        self.expanded += expansions
+        frontier: Dict[Cell, float] = {}
+        for _, neg_g, x, y in open_heap:
+            node = (x, y)
+            if node not in closed and -neg_g <= g_scores[node]:
+                frontier[node] = h(node)
+        target = None
+        if open_heap:
+            _, _, x, y = open_heap[0]
+            target = (x, y)
+        return target, parent_map, closed, frontier
+
+    def _learn(self, closed: Set[Cell], frontier: Dict[Cell, float]) -> None:
+        h = self.heuristic
+        for node in closed:
+            h.update(node, math.inf)
+        heap = [(value, node[0], node[1]) for node, value in frontier.items()]
+        heapq.heapify(heap)
+        pending = set(closed)
+        while heap and pending:
+            value, x, y = heapq.heappop(heap)
+            if value > h((x, y)):
+                continue
+            pending.discard((x, y))
+            # Transition costs are symmetric, so predecessors are neighbours.
+            for nx, ny in self.grid.neighbors8(x, y):
+                if (nx, ny) not in closed:
+                    continue
+                candidate = value + self._cost(nx, ny, x, y)
+                if candidate < h((nx, ny)):
+                    h.update((nx, ny), candidate)
+                    heapq.heappush(heap, (candidate, nx, ny))
+
+    def move(self) -> List[Cell]:
+        if self.done:
+            return []
+        start_time = time.perf_counter()
+        target, parent_map, closed, frontier = self._lookahead()
+        if target is None or self.heuristic(self.position) > self.heuristic.cost_limit:
+            # Either the lookahead exhausted the reachable region or learning
+            # pushed h past any simple path cost: the goal is unreachable.
+            self.failed = True
+            self.move_times.append(time.perf_counter() - start_time)
+            return []
+        self._learn(closed, frontier)
+
+        segment = reconstruct_path(parent_map, target)[1:]
+        x, y = self.position
+        for nx, ny in segment:
+            self.cost += self._cost(x, y, nx, ny)
+            x, y = nx, ny
+        self.position = (x, y)
+        self.trajectory.extend(segment)
+        self.move_times.append(time.perf_counter() - start_time)
+        return segment
+
+    def run(self, max_moves: Optional[int] = None) -> bool:
+        moves = 0
+        while not self.done and (max_moves is None or moves < max_moves):
+            self.move()
+            moves += 1
+        return self.done
+
+
+def lss_lrta_search(
+    grid: GridLike,
+    start: Cell,
+    goal: Cell,
+    heuristic: Optional[LearnedHeuristic] = None,
+    lookahead: int = 32,
+    max_moves: Optional[int] = None,
+) -> Tuple[List[Cell], float, int, float]:
+    # Returns the travelled trajectory (cells may repeat) and its cost. The
+    # agent gives up after `max_moves` moves (MOVES_PER_CELL per map cell by
+    # default) and the search reports no path, as for an unreachable goal.
+    if max_moves is None:
+        max_moves = MOVES_PER_CELL * grid.width * grid.height
+    if max_moves < 1:
+        raise ValueError("max_moves must be positive")
+    start_time = time.perf_counter()
+    agent = LssLrtaAgent(grid, start, goal, heuristic=heuristic, lookahead=lookahead)
+    reached = agent.run(max_moves)
+    elapsed_time = time.perf_counter() - start_time
+    if agent.failed or not reached:
+        return [], math.inf, agent.expanded, elapsed_time
+    return agent.trajectory, agent.cost, agent.expanded, elapsed_time
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .grid import GridMap
+from .heuristics import DIAGONAL_DISTANCE, octile_distance, step_cost
+from .jps import _has_forced_neighbor_straight, prune_neighbors
+from .jpsw import _cost_along_ray, _has_multi_terrain_neighbourhood, prune_neighbors_weighted
+from .path_utils import reconstruct_path
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+Cell = Tuple[int, int]
+# (successor, move cost, cell before the successor on the ray)
+Successors = Iterator[Tuple[Cell, float, Cell]]
+SuccessorFunction = Callable[[GridLike, Cell, Optional[Cell], FrozenSet[Cell]], Successors]
+
+
+def _jump(grid: GridMap, x: int, y: int, dx: int, dy: int, goals: FrozenSet[Cell]) -> Optional[Cell]:
+    while True:
+        if not grid.valid_step(x, y, dx, dy):
+            return None
+
+        x += dx
+        y += dy
+
+        if (x, y) in goals:
+            return (x, y)
+
+        if dx == 0 or dy == 0:
+            if _has_forced_neighbor_straight(grid, x, y, dx, dy):
+                return (x, y)
+        else:
+            if _jump(grid, x, y, dx, 0, goals) is not None:
+                return (x, y)
+            if _jump(grid, x, y, 0, dy, goals) is not None:
+                return (x, y)
+
+
+def _jump_weighted(
+    grid: WeightedGridMap, x: int, y: int, dx: int, dy: int, goals: FrozenSet[Cell]
+) -> Optional[Cell]:
+    while True:
+        if not grid.valid_step(x, y, dx, dy):
+            return None
+
+        x += dx
+        y += dy
+
+        if (x, y) in goals:
+            return (x, y)
+
+        if _has_multi_terrain_neighbourhood(grid, x, y):
+            return (x, y)
+
+        if dx != 0 and dy != 0:
+            if _jump_weighted(grid, x, y, dx, 0, goals) is not None:
+                return (x, y)
+            if _jump_weighted(grid, x, y, 0, dy, goals) is not None:
+                return (x, y)
+
+
+def _astar_successors(grid: GridMap, node: Cell, prev: Optional[Cell], goals: FrozenSet[Cell]) -> Successors:
+    x, y = node
+    for nx, ny in grid.neighbors8(x, y):
+        yield (nx, ny), step_cost(nx - x, ny - y), node
+
+
+def _astarw_successors(
+    grid: WeightedGridMap, node: Cell, prev: Optional[Cell], goals: FrozenSet[Cell]
+) -> Successors:
+    x, y = node
+    for nx, ny in grid.neighbors8(x, y):
+        yield (nx, ny), grid.transition_cost(x, y, nx, ny), node
+
+
+def _jps_successors(grid: GridMap, node: Cell, prev: Optional[Cell], goals: FrozenSet[Cell]) -> Successors:
+    x, y = node
+    for dx, dy in prune_neighbors(grid, node, prev):
+        jp = _jump(grid, x, y, dx, dy, goals)
+        if jp is None:
+            continue
+        jx, jy = jp
+        steps = max(abs(jx - x), abs(jy - y))
+        yield jp, float(steps) * (DIAGONAL_DISTANCE if dx != 0 and dy != 0 else 1.0), (jx - dx, jy - dy)
+
+
+def _jpsw_successors(
+    grid: WeightedGridMap, node: Cell, prev: Optional[Cell], goals: FrozenSet[Cell]
+) -> Successors:
+    x, y = node
+    for dx, dy in prune_neighbors_weighted(grid, node, prev):
+        jp = _jump_weighted(grid, x, y, dx, dy, goals)
+        if jp is None:
+            continue
+        jx, jy = jp
+        yield jp, _cost_along_ray(grid, node, jp, dx, dy), (jx - dx, jy - dy)
+
+
+MULTI_GOAL_ENGINES: Dict[str, Tuple[SuccessorFunction, bool]] = {
+    "astar": (_astar_successors, False),
+    "jps": (_jps_successors, False),
+    "astarw": (_astarw_successors, True),
+    "jpsw": (_jpsw_successors, True),
+}
+
+
+def _multi_goal_search(
+    grid: GridLike,
+    start: Cell,
+    goals: Iterable[Cell],
+    algorithm: str,
+    stop_at_first: bool,
+) -> Tuple[Dict[Cell, List[Cell]], Dict[Cell, float], int]:
+    try:
+        successors, weighted = MULTI_GOAL_ENGINES[algorithm]
+    except KeyError as exc:
+        raise ValueError(f"Unknown search algorithm '{algorithm}'") from exc
+    if weighted != isinstance(grid, WeightedGridMap):
+        raise ValueError(f"Algorithm '{algorithm}' does not match the map type")
+
+    goal_set = frozenset(goals)
+    if not goal_set:
+        raise ValueError("At least one goal is required")
+    h_scale = grid.min_cell_cost() if weighted else 1.0  # type: ignore[union-attr]
+    remaining: Set[Cell] = {goal for goal in goal_set if grid.is_walkable(*goal)}
+
+    h_cache: Dict[Cell, Tuple[float, Cell]] = {}
+
+    def h(node: Cell) -> float:
+        # Minimum over the goals not settled yet. It only grows as goals settle,
+        # so stale heap entries are re-keyed when popped; a cached value stays
+        # valid while its closest goal is unsettled.
+        cached = h_cache.get(node)
+        if cached is not None and cached[1] in remaining:
+            return cached[0]
+        closest = min(remaining, key=lambda goal: octile_distance(node, goal))
+        value = octile_distance(node, closest) * h_scale
+        h_cache[node] = (value, closest)
+        return value
+
+    open_heap: List[Tuple[float, int, int, int]] = []
+    g_scores: Dict[Cell, float] = {start: 0.0}
+    parent_map: Dict[Cell, Optional[Cell]] = {start: None}
+    prev_cell: Dict[Cell, Optional[Cell]] = {start: None}
+    closed: Set[Cell] = set()
+    paths: Dict[Cell, List[Cell]] = {}
+    costs: Dict[Cell, float] = {}
+    counter = 0
+    expanded = 0
+
+    if grid.is_walkable(*start) and remaining:
+        heapq.heappush(open_heap, (h(start), counter, start[0], start[1]))
+
+    while open_heap and remaining:
+        f, _, x, y = heapq.heappop(open_heap)
+        node = (x, y)
+        if node in closed:
+            continue
+
+        g_current = g_scores[node]
+        f_current = g_current + h(node)
+        if f > f_current + 1e-9:
+            continue
+        if f + 1e-9 < f_current:
+            counter += 1
+            heapq.heappush(open_heap, (f_current, counter, x, y))
+            continue
+
+        closed.add(node)
+        expanded += 1
+
+        if node in remaining:
+            remaining.discard(node)
+            paths[node] = reconstruct_path(parent_map, node)
+            costs[node] = g_current
+            if stop_at_first:
+                break
+            if not remaining:
+                break
+
+        for succ, move_cost, before in successors(grid, node, prev_cell.get(node), goal_set):
+            if succ in closed:
+                continue
+            tentative_g = g_current + move_cost
+            if tentative_g + 1e-9 < g_scores.get(succ, math.inf):
+                g_scores[succ] = tentative_g
+                parent_map[succ] = node
+                prev_cell[succ] = before
+                counter += 1
+                heapq.heappush(open_heap, (tentative_g + h(succ), counter, succ[0], succ[1]))
+
+    return paths, costs, expanded
+
+
+def nearest_goal_search(
+    grid: GridLike, start: Cell, goals: Iterable[Cell], algorithm: str = "jps"
+) -> Tuple[List[Cell], float, int, float]:
+    start_time = time.perf_counter()
+    paths, costs, expanded = _multi_goal_search(grid, start, goals, algorithm, stop_at_first=True)
+    elapsed_time = time.perf_counter() - start_time
+    for goal, path in paths.items():
+        return path, costs[goal], expanded, elapsed_time
+    return [], math.inf, expanded, elapsed_time
+
+
+def all_goals_search(
+    grid: GridLike, start: Cell, goals: Iterable[Cell], algorithm: str = "jps"
+) -> Tuple[Dict[Cell, List[Cell]], Dict[Cell, float], int, float]:
+    start_time = time.perf_counter()
+    goals = list(goals)
+    paths, costs, expanded = _multi_goal_search(grid, start, goals, algorithm, stop_at_first=False)
+    for goal in goals:
+        paths.setdefault(goal, [])
+        costs.setdefault(goal, math.inf)
+    elapsed_time = time.perf_counter() - start_time
+    return paths, costs, expanded, elapsed_time
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import os
+import pstats
+import statistics
+import sys
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .engines import SearchFunction, SearchResult
+from .stats import SearchStats, mean_stats
+
+
+@dataclass
+class RepeatedRun:
+    result: SearchResult
+    times: List[float]
+    stats: Dict[str, float]
+
+    @property
+    def mean_time(self) -> float:
+        return statistics.fmean(self.times)
+
+    @property
+    def median_time(self) -> float:
+        return statistics.median(self.times)
+
+    @property
+    def stdev_time(self) -> float:
+        return statistics.stdev(self.times) if len(self.times) > 1 else 0.0
+
+
+def repeat_search(search: SearchFunction, grid, start: Tuple[int, int], goal: Tuple[int, int], repeat: int) -> RepeatedRun:
+    # Times come from plain runs; counters and phase times from as many
+    # instrumented runs, since counting adds its own overhead to the loop.
+    if repeat < 1:
+        raise ValueError("repeat must be positive")
+    times = []
+    for _ in range(repeat):
+        result = search(grid, start, goal)
+        times.append(result[3])
+    runs = []
+    for _ in range(repeat):
+        stats = SearchStats()
+        search(grid, start, goal, stats=stats)
+        runs.append(stats)
+    return RepeatedRun(result, times, mean_stats(runs))
+
+
+class SamplingProfiler:
+    # Samples the stack of the thread that entered it from a helper thread
+    # every `interval` seconds. Frames above the `with` block are cut, so the
+    # stacks start at the profiled code.
+
+    def __init__(self, interval: float = 0.001) -> None:
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "SamplingProfiler":
+        self._target = threading.get_ident()
+        self._base_depth = _depth(sys._getframe(1))
+        # The sampler only runs when the searching thread yields the GIL.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes = codes[::-1][self._base_depth:]
+            # Samples taken while the profiler itself is shutting down.
+            if codes and codes[0] is not SamplingProfiler.__exit__.__code__:
+                self.samples[";".join(_frame_name(code) for code in codes)] += 1
+
+    def write_folded(self, path: str) -> None:
+        # One "frame;frame;... count" line per distinct stack, the input of
+        # flamegraph.pl, inferno and speedscope.
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _depth(frame) -> int:
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+def profile_search(
+    search: SearchFunction,
+    grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    repeat: int,
+    output_prefix: str,
+    interval: float = 0.001,
+) -> Tuple[str, str, pstats.Stats]:
+    # `repeat` runs under cProfile, aggregated into <prefix>.pstats, then as
+    # many under the sampler into <prefix>.folded; the two are kept apart so
+    # neither profiler shows up in the other's output.
+    if repeat < 1:
+        raise ValueError("repeat must be positive")
+    directory = os.path.dirname(output_prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    profile = cProfile.Profile()
+    for _ in range(repeat):
+        profile.enable()
+        search(grid, start, goal)
+        profile.disable()
+    pstats_path = output_prefix + ".pstats"
+    profile.dump_stats(pstats_path)
+    sampler = SamplingProfiler(interval)
+    with sampler:
+        for _ in range(repeat):
+            search(grid, start, goal)
+    folded_path = output_prefix + ".folded"
+    sampler.write_folded(folded_path)
+    return pstats_path, folded_path, pstats.Stats(profile)
+
+
+def format_top(stats: pstats.Stats, limit: int = 15, sort: str = "tottime") -> str:
+    stream = io.StringIO()
+    stats.stream = stream  # type: ignore[attr-defined]
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stream.getvalue()
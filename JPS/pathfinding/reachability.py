@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from array import array
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .grid import GridMap
+from .heuristics import step_cost
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+
+NO_PARENT = -1
+
+
+class BoundedDijkstra:
+    # Movement-range queries: every cell whose cost from the start is within the
+    # budget. The cost/parent/mask buffers are allocated once per map and only the
+    # cells touched by the previous query are reset, so a query costs time
+    # proportional to the range, not to the map.
+
+    def __init__(self, grid: GridLike) -> None:
+        self.grid = grid
+        size = grid.width * grid.height
+        self._cost = array("d", [math.inf]) * size
+        self._parent = array("i", [NO_PARENT]) * size
+        self._touched: List[int] = []
+        self._mask = np.zeros(size, dtype=bool)
+        shape = (grid.height, grid.width)
+        # Zero-copy views of the buffers; they are overwritten by the next query.
+        self.cost = np.frombuffer(self._cost, dtype=np.float64).reshape(shape)
+        self.parent = np.frombuffer(self._parent, dtype=np.int32).reshape(shape)
+        self.mask = self._mask.reshape(shape)
+        self.start: Optional[Tuple[int, int]] = None
+        self.track_parents = False
+
+    def _reset(self) -> None:
+        cost, parent = self._cost, self._parent
+        for idx in self._touched:
+            cost[idx] = math.inf
+            parent[idx] = NO_PARENT
+        self._mask[self._touched] = False
+        self._touched = []
+
+    def search(
+        self, start: Tuple[int, int], budget: float, track_parents: bool = False
+    ) -> Tuple[np.ndarray, np.ndarray, int, float]:
+        start_time = time.perf_counter()
+        grid = self.grid
+        if not grid.is_walkable(*start):
+            raise ValueError(f"Start {start} is not walkable")
+        if budget < 0:
+            raise ValueError("budget must be non-negative")
+        self._reset()
+        self.start = start
+        self.track_parents = track_parents
+
+        weighted = isinstance(grid, WeightedGridMap)
+        width = grid.width
+        cost, parent, touched = self._cost, self._parent, self._touched
+        start_idx = start[1] * width + start[0]
+        cost[start_idx] = 0.0
+        touched.append(start_idx)
+        open_heap: List[Tuple[float, int, int]] = [(0.0, start[0], start[1])]
+        expanded = 0
+
+        while open_heap:
+            g, x, y = heapq.heappop(open_heap)
+            if g > cost[y * width + x]:
+                continue
+            expanded += 1
+            for nx, ny in grid.neighbors8(x, y):
+                if weighted:
+                    tentative_g = g + grid.transition_cost(x, y, nx, ny)  # type: ignore[union-attr]
+                else:
+                    tentative_g = g + step_cost(nx - x, ny - y)
+                if tentative_g > budget:
+                    continue
+                idx = ny * width + nx
+                old = cost[idx]
+                if tentative_g < old:
+                    if old == math.inf:
+                        touched.append(idx)
+                    cost[idx] = tentative_g
+                    if track_parents:
+                        parent[idx] = y * width + x
+                    heapq.heappush(open_heap, (tentative_g, nx, ny))
+
+        # Only the settled cells are marked; scanning the whole cost buffer
+        # would make every query cost as much as the map.
+        self._mask[touched] = True
+        elapsed_time = time.perf_counter() - start_time
+        return self.mask, self.cost, expanded, elapsed_time
+
+    def path_to(self, cell: Tuple[int, int]) -> List[Tuple[int, int]]:
+        if not self.track_parents:
+            raise ValueError("The last query did not track parents")
+        width = self.grid.width
+        x, y = cell
+        if not self.grid.in_bounds(x, y) or self._cost[y * width + x] == math.inf:
+            return []
+        path = [(x, y)]
+        idx = self._parent[y * width + x]
+        while idx != NO_PARENT:
+            path.append((idx % width, idx // width))
+            idx = self._parent[idx]
+        path.reverse()
+        return path
+
+
+def reachable_within(
+    grid: GridLike, start: Tuple[int, int], budget: float
+) -> Tuple[np.ndarray, np.ndarray, int, float]:
+    mask, cost, expanded, elapsed_time = BoundedDijkstra(grid).search(start, budget)
+    return mask.copy(), cost.copy(), expanded, elapsed_time
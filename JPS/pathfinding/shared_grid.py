@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import atexit
+import math
+import os
+import struct
+from array import array
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple, Union
+
+from .grid import GridMap
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+# (table name, segment name, array typecode, length)
+TableSpec = Tuple[str, str, str, int]
+
+
+@dataclass(frozen=True)
+class SharedGridHandle:
+    # Small picklable descriptor; workers attach to the segments by name.
+    kind: str  # "grid" or "weighted"
+    width: int
+    height: int
+    walkable_name: str
+    chars_name: str
+    weights_name: Optional[str] = None
+    min_cost: float = math.inf
+    tables: Tuple[TableSpec, ...] = ()
+
+
+def _new_segment(data: bytes) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(data)))
+    shm.buf[: len(data)] = data
+    return shm
+
+
+# Owners that have not been closed yet, unlinked at interpreter exit.
+_OWNED: Dict[int, "SharedGrid"] = {}
+
+
+class SharedGrid:
+    # Owner side: copies a map (and optional derived tables, e.g. JPS+ jump
+    # distances) into shared memory once and unlinks it on close.
+
+    def __init__(self, grid: GridLike, tables: Optional[Dict[str, array]] = None) -> None:
+        width, height = grid.width, grid.height
+        walkable = bytes(1 if cell else 0 for row in grid.walkable for cell in row)
+        chars_rows = grid.chars or [["." if cell else "#" for cell in row] for row in grid.walkable]
+        chars = "".join("".join(row) for row in chars_rows).encode("latin-1", errors="replace")
+        self.segments: List[shared_memory.SharedMemory] = [_new_segment(walkable), _new_segment(chars)]
+        self.pid = os.getpid()
+        _OWNED[id(self)] = self
+
+        weights_name: Optional[str] = None
+        min_cost = math.inf
+        if isinstance(grid, WeightedGridMap):
+            weights = array("d", (w for row in grid.weights for w in row))
+            self.segments.append(_new_segment(weights.tobytes()))
+            weights_name = self.segments[-1].name
+            min_cost = grid.min_cell_cost()
+
+        specs: List[TableSpec] = []
+        for name, table in (tables or {}).items():
+            self.segments.append(_new_segment(table.tobytes()))
+            specs.append((name, self.segments[-1].name, table.typecode, len(table)))
+
+        self.handle = SharedGridHandle(
+            kind="weighted" if isinstance(grid, WeightedGridMap) else "grid",
+            width=width,
+            height=height,
+            walkable_name=self.segments[0].name,
+            chars_name=self.segments[1].name,
+            weights_name=weights_name,
+            min_cost=min_cost,
+            tables=tuple(specs),
+        )
+
+    def close(self) -> None:
+        for shm in self.segments:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self.segments = []
+        _OWNED.pop(id(self), None)
+
+    def __enter__(self) -> "SharedGrid":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+@dataclass
+class AttachedGrid:
+    grid: GridLike
+    tables: Dict[str, memoryview]
+    segments: List[shared_memory.SharedMemory]
+    views: List[memoryview] = field(default_factory=list, repr=False)
+    refs: int = 0
+
+    def close(self) -> None:
+        # Every exported view has to be released before the mapping can close;
+        # the grid is unusable afterwards.
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        for shm in self.segments:
+            shm.close()
+        self.segments = []
+
+
+def _flat_view(shm: shared_memory.SharedMemory, fmt: str, length: int, views: List[memoryview]) -> memoryview:
+    raw = shm.buf[: length * struct.calcsize(fmt)]
+    readonly = raw.toreadonly()
+    flat = readonly.cast(fmt)
+    views.extend([raw, readonly, flat])
+    return flat
+
+
+def _row_views(flat: memoryview, width: int, height: int, views: List[memoryview]) -> List[memoryview]:
+    rows = [flat[y * width : (y + 1) * width] for y in range(height)]
+    views.extend(rows)
+    return rows
+
+
+def attach_grid(handle: SharedGridHandle) -> AttachedGrid:
+    # Builds a read-only map whose rows are views into the shared segments.
+    # Prefer acquire_grid/release_grid, which share one attachment per process.
+    width, height = handle.width, handle.height
+    size = width * height
+    views: List[memoryview] = []
+    walkable_shm = shared_memory.SharedMemory(name=handle.walkable_name)
+    chars_shm = shared_memory.SharedMemory(name=handle.chars_name)
+    segments = [walkable_shm, chars_shm]
+    walkable = _row_views(_flat_view(walkable_shm, "?", size, views), width, height, views)
+    chars = _row_views(_flat_view(chars_shm, "c", size, views), width, height, views)
+
+    if handle.kind == "weighted":
+        weights_shm = shared_memory.SharedMemory(name=handle.weights_name)
+        segments.append(weights_shm)
+        weights = _row_views(_flat_view(weights_shm, "d", size, views), width, height, views)
+        grid: GridLike = WeightedGridMap(
+            width=width, height=height, walkable=walkable, weights=weights, chars=chars  # type: ignore[arg-type]
+        )
+        grid._min_cost = handle.min_cost
+    else:
+        grid = GridMap(width=width, height=height, walkable=walkable, chars=chars)  # type: ignore[arg-type]
+
+    tables: Dict[str, memoryview] = {}
+    for name, segment_name, typecode, length in handle.tables:
+        shm = shared_memory.SharedMemory(name=segment_name)
+        segments.append(shm)
+        tables[name] = _flat_view(shm, typecode, length, views)
+    return AttachedGrid(grid=grid, tables=tables, segments=segments, views=views)
+
+
+_ATTACHED: Dict[SharedGridHandle, AttachedGrid] = {}
+
+
+def acquire_grid(handle: SharedGridHandle) -> AttachedGrid:
+    attached = _ATTACHED.get(handle)
+    if attached is None:
+        attached = attach_grid(handle)
+        _ATTACHED[handle] = attached
+    attached.refs += 1
+    return attached
+
+
+def release_grid(handle: SharedGridHandle) -> None:
+    attached = _ATTACHED.get(handle)
+    if attached is None:
+        raise ValueError("Shared grid is not attached in this process")
+    attached.refs -= 1
+    if attached.refs == 0:
+        del _ATTACHED[handle]
+        attached.close()
+
+
+def attached_count() -> int:
+    return len(_ATTACHED)
+
+
+@atexit.register
+def _close_all() -> None:
+    for attached in list(_ATTACHED.values()):
+        try:
+            attached.close()
+        except BufferError:
+            pass
+    _ATTACHED.clear()
+    for owner in list(_OWNED.values()):
+        # Forked children inherit the registry but must not unlink.
+        if owner.pid == os.getpid():
+            owner.close()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Iterable, List
+
+
+@dataclass
+class SearchStats:
+    # Filled in place by an engine constructed with `stats=`; engines built
+    # without it run their uninstrumented loops and never touch this class.
+    # `generated` counts successors produced by expansions (open neighbours
+    # for A*, improved jump points for JPS), `stale_pops` the heap entries
+    # skipped on pop, and `pruned_directions` the moves of the 8 that pruning
+    # dropped. Phase times are seconds; search_time excludes reconstruction.
+    expanded: int = 0
+    generated: int = 0
+    pushes: int = 0
+    pops: int = 0
+    stale_pops: int = 0
+    jump_calls: int = 0
+    jump_steps: int = 0
+    local_dijkstra_runs: int = 0
+    pruned_directions: int = 0
+    setup_time: float = 0.0
+    search_time: float = 0.0
+    reconstruct_time: float = 0.0
+
+    @property
+    def total_time(self) -> float:
+        return self.setup_time + self.search_time + self.reconstruct_time
+
+    def add(self, other: "SearchStats") -> "SearchStats":
+        for f in fields(self):
+            setattr(self, f.name, getattr(self, f.name) + getattr(other, f.name))
+        return self
+
+    def as_dict(self) -> Dict[str, float]:
+        return asdict(self)
+
+
+STAT_FIELDS: List[str] = [f.name for f in fields(SearchStats)]
+
+
+def mean_stats(stats: Iterable[SearchStats]) -> Dict[str, float]:
+    stats = list(stats)
+    if not stats:
+        raise ValueError("No stats to aggregate")
+    total = SearchStats()
+    for s in stats:
+        total.add(s)
+    return {name: value / len(stats) for name, value in total.as_dict().items()}
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+from .path_utils import reconstruct_path
+from .stats import SearchStats
+from .trace import SearchTrace
+
+
+class StepwiseSearch(ABC):
+    # Shared driver for the resumable engines: subclasses keep their open list
+    # and maps on the instance and implement _search(limit, deadline), which
+    # expands until the goal is settled, the open list runs out, `limit`
+    # expansions are reached or the deadline passes. Engines that support
+    # `stats` swap in an instrumented _search_counted when one is given; a
+    # `trace` needs that path too, so those engines bring their own stats if
+    # none were passed. Engines without it record traces in _search.
+
+    def __init__(
+        self,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        stats: Optional[SearchStats] = None,
+        trace: Optional[SearchTrace] = None,
+    ) -> None:
+        if trace is not None and stats is None and hasattr(self, "_search_counted"):
+            stats = SearchStats()
+        self.start = start
+        self.goal = goal
+        self.parent_map: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {start: None}
+        self.path: List[Tuple[int, int]] = []
+        self.cost = math.inf
+        self.expanded = 0
+        self.elapsed_time = 0.0
+        self.done = False
+        # Expanded node with the lowest heuristic, for partial paths.
+        self.best_node = start
+        self.best_h = math.inf
+        self.stats = stats
+        self.trace = trace
+
+    @abstractmethod
+    def _search(self, limit: float, deadline: Optional[float]) -> None:
+        ...
+
+    def _finish(self, cost: Optional[float] = None) -> None:
+        self.done = True
+        if cost is not None:
+            self.cost = cost
+            if self.stats is None:
+                self.path = reconstruct_path(self.parent_map, self.goal)
+            else:
+                start_time = time.perf_counter()
+                self.path = reconstruct_path(self.parent_map, self.goal)
+                self.stats.reconstruct_time += time.perf_counter() - start_time
+
+    def _timed_search(self, limit: float, deadline: Optional[float]) -> bool:
+        if not self.done:
+            stats = self.stats
+            reconstructed = stats.reconstruct_time if stats is not None else 0.0
+            start_time = time.perf_counter()
+            self._search(limit, deadline)
+            elapsed = time.perf_counter() - start_time
+            self.elapsed_time += elapsed
+            if stats is not None:
+                stats.search_time += elapsed - (stats.reconstruct_time - reconstructed)
+        return self.done
+
+    def _record_setup(self) -> None:
+        # Called by engine constructors once their open list is seeded.
+        if self.stats is not None:
+            self.stats.setup_time += self.elapsed_time
+            self.stats.pushes += 1
+
+    def step(self, max_expansions: int = 1) -> bool:
+        if max_expansions < 1:
+            raise ValueError("max_expansions must be positive")
+        return self._timed_search(self.expanded + max_expansions, None)
+
+    def run(self, time_budget: Optional[float] = None) -> bool:
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        return self._timed_search(math.inf, deadline)
+
+    def partial_path(self) -> List[Tuple[int, int]]:
+        if self.path:
+            return self.path
+        return reconstruct_path(self.parent_map, self.best_node)
+
+    def result(self) -> Tuple[List[Tuple[int, int]], float, int, float]:
+        return self.path, self.cost, self.expanded, self.elapsed_time
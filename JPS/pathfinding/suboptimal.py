@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import heapq
+import math
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .grid import GridMap
+from .heuristics import octile_distance, weighted_octile_distance
+from .multi_goal import SuccessorFunction, _astar_successors, _astarw_successors, _jps_successors, _jpsw_successors
+from .path_utils import reconstruct_path
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+Cell = Tuple[int, int]
+# (path, cost, expanded, elapsed_time, bound): cost <= bound * optimal cost.
+BoundedResult = Tuple[List[Cell], float, int, float, float]
+Heuristic = Callable[[Cell], float]
+
+BOUNDED_MODES: List[str] = ["wastar", "focal"]
+
+
+def _weight(epsilon: float) -> float:
+    if epsilon < 0 or math.isnan(epsilon):
+        raise ValueError("epsilon must be non-negative")
+    return 1.0 + epsilon
+
+
+def _inflated_best_first(
+    grid: GridLike, start: Cell, goal: Cell, h: Heuristic, successors: SuccessorFunction, weight: float
+) -> BoundedResult:
+    # Best-first on f = g + w * h without re-expansions; with a consistent h the
+    # returned cost is within a factor w of optimal.
+    start_time = time.perf_counter()
+    open_heap: List[Tuple[float, int, int, int]] = []
+    g_scores: Dict[Cell, float] = {start: 0.0}
+    parent_map: Dict[Cell, Optional[Cell]] = {start: None}
+    prev_cell: Dict[Cell, Optional[Cell]] = {start: None}
+    closed: Set[Cell] = set()
+    goals = frozenset([goal])
+    counter = 0
+    expanded = 0
+
+    heapq.heappush(open_heap, (weight * h(start), counter, start[0], start[1]))
+
+    while open_heap:
+        f, _, x, y = heapq.heappop(open_heap)
+        node = (x, y)
+        if node in closed:
+            continue
+
+        g_current = g_scores[node]
+        if f > g_current + weight * h(node) + 1e-9:
+            continue
+
+        closed.add(node)
+        expanded += 1
+
+        if node == goal:
+            path = reconstruct_path(parent_map, goal)
+            elapsed_time = time.perf_counter() - start_time
+            return path, g_current, expanded, elapsed_time, weight
+
+        for succ, move_cost, before in successors(grid, node, prev_cell.get(node), goals):
+            if succ in closed:
+                continue
+            tentative_g = g_current + move_cost
+            if tentative_g + 1e-9 < g_scores.get(succ, math.inf):
+                g_scores[succ] = tentative_g
+                parent_map[succ] = node
+                prev_cell[succ] = before
+                counter += 1
+                heapq.heappush(open_heap, (tentative_g + weight * h(succ), counter, succ[0], succ[1]))
+
+    elapsed_time = time.perf_counter() - start_time
+    return [], math.inf, expanded, elapsed_time, weight
+
+
+def _focal_search(
+    grid: GridLike, start: Cell, goal: Cell, h: Heuristic, successors: SuccessorFunction, weight: float
+) -> BoundedResult:
+    # A*-epsilon: expand the node with the fewest estimated steps to go among
+    # those with f <= w * f_min. Improved nodes are re-opened, so f_min stays a
+    # lower bound on the optimal cost and cost / f_min is a proven bound.
+    start_time = time.perf_counter()
+    g_scores: Dict[Cell, float] = {start: 0.0}
+    parent_map: Dict[Cell, Optional[Cell]] = {start: None}
+    closed: Set[Cell] = set()
+    goals = frozenset([goal])
+    open_heap: List[Tuple[float, int, int, int, float]] = []  # by f
+    waiting: List[Tuple[float, int, int, int, float]] = []  # by f, not admitted to focal yet
+    focal: List[Tuple[float, float, int, int, int, float]] = []  # by (steps to go, f)
+    counter = 0
+    expanded = 0
+
+    def valid(x: int, y: int, g: float) -> bool:
+        return (x, y) not in closed and g_scores.get((x, y)) == g
+
+    def push(node: Cell, g: float, f_min: float) -> None:
+        nonlocal counter
+        counter += 1
+        f = g + h(node)
+        heapq.heappush(open_heap, (f, counter, node[0], node[1], g))
+        if f <= weight * f_min + 1e-9:
+            heapq.heappush(focal, (octile_distance(node, goal), f, counter, node[0], node[1], g))
+        else:
+            heapq.heappush(waiting, (f, counter, node[0], node[1], g))
+
+    push(start, 0.0, h(start))
+
+    while True:
+        while open_heap and not valid(open_heap[0][2], open_heap[0][3], open_heap[0][4]):
+            heapq.heappop(open_heap)
+        if not open_heap:
+            break
+        f_min = open_heap[0][0]
+        while waiting and waiting[0][0] <= weight * f_min + 1e-9:
+            f, c, x, y, g = heapq.heappop(waiting)
+            if valid(x, y, g):
+                heapq.heappush(focal, (octile_distance((x, y), goal), f, c, x, y, g))
+
+        while focal and not valid(focal[0][3], focal[0][4], focal[0][5]):
+            heapq.heappop(focal)
+        if not focal:
+            break
+        _, _, _, x, y, g_current = heapq.heappop(focal)
+        node = (x, y)
+        closed.add(node)
+        expanded += 1
+
+        if node == goal:
+            path = reconstruct_path(parent_map, goal)
+            elapsed_time = time.perf_counter() - start_time
+            bound = g_current / f_min if f_min > 0 else 1.0
+            return path, g_current, expanded, elapsed_time, max(1.0, min(weight, bound))
+
+        for neighbor, move_cost, _ in successors(grid, node, None, goals):
+            tentative_g = g_current + move_cost
+            if tentative_g + 1e-9 < g_scores.get(neighbor, math.inf):
+                g_scores[neighbor] = tentative_g
+                parent_map[neighbor] = node
+                closed.discard(neighbor)
+                push(neighbor, tentative_g, f_min)
+
+    elapsed_time = time.perf_counter() - start_time
+    return [], math.inf, expanded, elapsed_time, weight
+
+
+def weighted_astar_search(grid: GridMap, start: Cell, goal: Cell, epsilon: float) -> BoundedResult:
+    h = lambda n: octile_distance(n, goal)
+    return _inflated_best_first(grid, start, goal, h, _astar_successors, _weight(epsilon))
+
+
+def weighted_astarw_search(grid: WeightedGridMap, start: Cell, goal: Cell, epsilon: float) -> BoundedResult:
+    h = lambda n: weighted_octile_distance(n, goal, grid)
+    return _inflated_best_first(grid, start, goal, h, _astarw_successors, _weight(epsilon))
+
+
+def focal_astar_search(grid: GridMap, start: Cell, goal: Cell, epsilon: float) -> BoundedResult:
+    h = lambda n: octile_distance(n, goal)
+    return _focal_search(grid, start, goal, h, _astar_successors, _weight(epsilon))
+
+
+def focal_astarw_search(grid: WeightedGridMap, start: Cell, goal: Cell, epsilon: float) -> BoundedResult:
+    h = lambda n: weighted_octile_distance(n, goal, grid)
+    return _focal_search(grid, start, goal, h, _astarw_successors, _weight(epsilon))
+
+
+def inflated_jump_point_search(grid: GridMap, start: Cell, goal: Cell, epsilon: float) -> BoundedResult:
+    h = lambda n: octile_distance(n, goal)
+    return _inflated_best_first(grid, start, goal, h, _jps_successors, _weight(epsilon))
+
+
+def inflated_jump_point_search_weighted(grid: WeightedGridMap, start: Cell, goal: Cell, epsilon: float) -> BoundedResult:
+    h = lambda n: weighted_octile_distance(n, goal, grid)
+    return _inflated_best_first(grid, start, goal, h, _jpsw_successors, _weight(epsilon))
+
+
+BOUNDED_ENGINES: Dict[Tuple[str, str], Callable[..., BoundedResult]] = {
+    ("astar", "wastar"): weighted_astar_search,
+    ("astar", "focal"): focal_astar_search,
+    ("astarw", "wastar"): weighted_astarw_search,
+    ("astarw", "focal"): focal_astarw_search,
+    ("jps", "wastar"): inflated_jump_point_search,
+    ("jpsw", "wastar"): inflated_jump_point_search_weighted,
+}
+
+
+def get_bounded_engine(algorithm: str, mode: str = "wastar") -> Callable[..., BoundedResult]:
+    try:
+        return BOUNDED_ENGINES[(algorithm, mode)]
+    except KeyError as exc:
+        raise ValueError(f"No bounded-suboptimal '{mode}' variant of '{algorithm}'") from exc
+
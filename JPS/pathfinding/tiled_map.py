@@ -0,0 +1,474 @@
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import mmap
+import os
+import time
+import zlib
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from .engines import get_engine
+from .grid import GridMap
+from .heuristics import octile_distance, step_cost
+from .weighted_grid import WeightedGridMap, _deterministic_weight, _is_obstacle, _load_weight_mapping
+
+META_FILE = "meta.json"
+DATA_FILE = "tiles.bin"
+FORMAT_VERSION = 1
+COMPRESSIONS = ["none", "zlib"]
+
+# Tile-level moves; bit i of a tile's edge mask is set when some valid step
+# leads from the tile into its neighbour in direction TILE_DIRECTIONS[i].
+TILE_DIRECTIONS: List[Tuple[int, int]] = [(1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1)]
+
+
+def _direction_bit(dx: int, dy: int) -> int:
+    return 1 << TILE_DIRECTIONS.index((dx, dy))
+
+
+def _link(edges: List[int], tiles_x: int, a: Tuple[int, int], b: Tuple[int, int]) -> None:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    edges[a[1] * tiles_x + a[0]] |= _direction_bit(dx, dy)
+    edges[b[1] * tiles_x + b[0]] |= _direction_bit(-dx, -dy)
+
+
+def _write_tiles(
+    out_dir: str,
+    width: int,
+    height: int,
+    kind: str,
+    rows: Iterator[List[float]],
+    tile_size: int,
+    compression: str,
+) -> None:
+    # `rows` yields one list of cell weights per map row (math.inf = blocked),
+    # so only one band of tile_size rows is held in memory at a time.
+    if tile_size < 2:
+        raise ValueError("tile_size must be at least 2")
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown tile compression '{compression}'")
+    os.makedirs(out_dir, exist_ok=True)
+    tiles_x = (width + tile_size - 1) // tile_size
+    tiles_y = (height + tile_size - 1) // tile_size
+    count = tiles_x * tiles_y
+    offsets = [0] * count
+    lengths = [0] * count
+    open_cells = [0] * count
+    costs = [0.0] * count
+    edges = [0] * count
+    min_cost = math.inf
+    previous_row: Optional[List[float]] = None
+    position = 0
+
+    with open(os.path.join(out_dir, DATA_FILE), "wb") as f:
+        for ty in range(tiles_y):
+            band = [next(rows) for _ in range(min(tile_size, height - ty * tile_size))]
+            for tx in range(tiles_x):
+                x0, x1 = tx * tile_size, min(width, (tx + 1) * tile_size)
+                cells = [value for row in band for value in row[x0:x1]]
+                if kind == "grid":
+                    payload = bytes(1 if value < math.inf else 0 for value in cells)
+                else:
+                    payload = array("d", cells).tobytes()
+                if compression == "zlib":
+                    payload = zlib.compress(payload)
+                index = ty * tiles_x + tx
+                offsets[index], lengths[index] = position, len(payload)
+                f.write(payload)
+                position += len(payload)
+                walkable = [value for value in cells if value < math.inf]
+                open_cells[index] = len(walkable)
+                if walkable:
+                    costs[index] = sum(walkable) / len(walkable)
+                    min_cost = min(min_cost, min(walkable))
+
+            # Crossings between horizontally adjacent tiles of this band.
+            for tx in range(tiles_x - 1):
+                x = (tx + 1) * tile_size - 1
+                if any(row[x] < math.inf and row[x + 1] < math.inf for row in band):
+                    _link(edges, tiles_x, (tx, ty), (tx + 1, ty))
+
+            # Crossings into the band above; diagonal steps may not cut corners.
+            if previous_row is not None:
+                upper, lower = previous_row, band[0]
+                for x in range(width):
+                    if upper[x] == math.inf:
+                        continue
+                    tx = x // tile_size
+                    if lower[x] < math.inf:
+                        _link(edges, tiles_x, (tx, ty - 1), (tx, ty))
+                    for dx in (-1, 1):
+                        nx = x + dx
+                        if not 0 <= nx < width or nx // tile_size == tx:
+                            continue
+                        if lower[nx] < math.inf and upper[nx] < math.inf and lower[x] < math.inf:
+                            _link(edges, tiles_x, (tx, ty - 1), (nx // tile_size, ty))
+            previous_row = band[-1]
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "kind": kind,
+        "width": width,
+        "height": height,
+        "tile_size": tile_size,
+        "compression": compression,
+        "min_cost": min_cost if min_cost < math.inf else 1.0,
+        "offsets": offsets,
+        "lengths": lengths,
+        "open_cells": open_cells,
+        "costs": costs,
+        "edges": edges,
+    }
+    with open(os.path.join(out_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def write_tiled_map(
+    grid: Union[GridMap, WeightedGridMap], out_dir: str, tile_size: int = 128, compression: str = "zlib"
+) -> None:
+    if isinstance(grid, WeightedGridMap):
+        rows: Iterator[List[float]] = (
+            [w if ok else math.inf for w, ok in zip(row_w, row_ok)] for row_w, row_ok in zip(grid.weights, grid.walkable)
+        )
+        kind = "weighted"
+    else:
+        rows = ([1.0 if ok else math.inf for ok in row] for row in grid.walkable)
+        kind = "grid"
+    _write_tiles(out_dir, grid.width, grid.height, kind, rows, tile_size, compression)
+
+
+def convert_movingai_map(
+    map_path: str,
+    out_dir: str,
+    tile_size: int = 128,
+    compression: str = "zlib",
+    weighted: bool = False,
+    terrain_weights_path: Optional[str] = None,
+) -> None:
+    # Streams a MovingAI .map into the tiled format without building a grid;
+    # cells are classified exactly as GridMap / WeightedGridMap would.
+    weight_mapping = _load_weight_mapping(map_path, terrain_weights_path) if weighted else {}
+    with open(map_path, "r", encoding="utf-8") as f:
+        lines = (line.rstrip("\n") for line in f if line.strip())
+        header = [next(lines, "") for _ in range(4)]
+        if header[0].strip().lower() != "type octile":
+            raise ValueError("Invalid map file: missing 'type octile' header")
+        try:
+            height = int(header[1].split()[1])
+            width = int(header[2].split()[1])
+        except (IndexError, ValueError) as exc:
+            raise ValueError("Invalid width/height declaration") from exc
+        if header[3].strip().lower() != "map":
+            raise ValueError("Missing 'map' line before grid data")
+
+        def parse_rows() -> Iterator[List[float]]:
+            for _ in range(height):
+                row = next(lines, None)
+                if row is None:
+                    raise ValueError("Not enough rows for declared height")
+                if len(row) < width:
+                    raise ValueError("Row shorter than declared width")
+                if weighted:
+                    yield [
+                        math.inf if _is_obstacle(ch) else float(weight_mapping.get(ch, _deterministic_weight(ch)))
+                        for ch in row[:width]
+                    ]
+                else:
+                    yield [1.0 if ch in {".", "G", "S", "W"} else math.inf for ch in row[:width]]
+
+        _write_tiles(out_dir, width, height, "weighted" if weighted else "grid", parse_rows(), tile_size, compression)
+
+
+class _RowProxy:
+    # Lets code written against walkable[y][x] / weights[y][x] read tiles.
+
+    def __init__(self, tiled: "TiledMap", y: int, weights: bool) -> None:
+        self.tiled, self.y, self.weights = tiled, y, weights
+
+    def __getitem__(self, x: int) -> Union[bool, float]:
+        value = self.tiled._value(x, self.y)
+        return value if self.weights else value < math.inf
+
+    def __len__(self) -> int:
+        return self.tiled.width
+
+
+class _RowsProxy:
+    def __init__(self, tiled: "TiledMap", weights: bool) -> None:
+        self.tiled, self.weights = tiled, weights
+
+    def __getitem__(self, y: int) -> _RowProxy:
+        return _RowProxy(self.tiled, y, self.weights)
+
+    def __len__(self) -> int:
+        return self.tiled.height
+
+
+class TiledMap:
+    # Read side of the tiled format. Implements the GridMap / WeightedGridMap
+    # interface used by the engines, so A*, JPS, A*W and JPSW run on it
+    # unchanged; a "grid" map reports weight 1 for every free cell. Tiles are
+    # decoded on first touch (or mapped, when stored uncompressed) and kept
+    # in an LRU of `cache_tiles` tiles.
+
+    def __init__(self, path: str, cache_tiles: int = 64) -> None:
+        if cache_tiles < 1:
+            raise ValueError("cache_tiles must be positive")
+        with open(os.path.join(path, META_FILE), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported tiled map version {meta.get('version')}")
+        self.path = path
+        self.kind: str = meta["kind"]
+        self.width: int = meta["width"]
+        self.height: int = meta["height"]
+        self.tile_size: int = meta["tile_size"]
+        self.compression: str = meta["compression"]
+        self.tiles_x = (self.width + self.tile_size - 1) // self.tile_size
+        self.tiles_y = (self.height + self.tile_size - 1) // self.tile_size
+        self.offsets: List[int] = meta["offsets"]
+        self.lengths: List[int] = meta["lengths"]
+        self.open_cells: List[int] = meta["open_cells"]
+        self.costs: List[float] = meta["costs"]
+        self.edges: List[int] = meta["edges"]
+        self._min_cost: float = meta["min_cost"]
+        self.cache_tiles = cache_tiles
+
+        self._file = open(os.path.join(path, DATA_FILE), "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        if self.compression == "none" and os.path.getsize(self._file.name) > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._cache: "OrderedDict[int, memoryview]" = OrderedDict()
+        self._last_index = -1
+        self._last_tile: Optional[memoryview] = None
+        # Tile flags of the current corridor; None means the whole map.
+        self.corridor: Optional[bytearray] = None
+        self.tile_loads = 0
+        self.tile_hits = 0
+        self.evictions = 0
+
+        self.walkable = _RowsProxy(self, weights=False)
+        self.weights = _RowsProxy(self, weights=True)
+
+    def close(self) -> None:
+        self._last_tile = None
+        self._last_index = -1
+        for tile in self._cache.values():
+            tile.release()
+        self._cache.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "TiledMap":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load(self, index: int) -> memoryview:
+        offset, length = self.offsets[index], self.lengths[index]
+        if self._mmap is not None:
+            raw = memoryview(self._mmap)[offset : offset + length]
+        else:
+            self._file.seek(offset)
+            data = self._file.read(length)
+            if self.compression == "zlib":
+                data = zlib.decompress(data)
+            raw = memoryview(data)
+        return raw.cast("B" if self.kind == "grid" else "d")
+
+    def _tile(self, index: int) -> memoryview:
+        tile = self._cache.get(index)
+        if tile is None:
+            tile = self._load(index)
+            self.tile_loads += 1
+            self._cache[index] = tile
+            if len(self._cache) > self.cache_tiles:
+                _, evicted = self._cache.popitem(last=False)
+                evicted.release()
+                self.evictions += 1
+        else:
+            self._cache.move_to_end(index)
+            self.tile_hits += 1
+        return tile
+
+    def _value(self, x: int, y: int) -> float:
+        size = self.tile_size
+        tx, ty = x // size, y // size
+        index = ty * self.tiles_x + tx
+        if index != self._last_index:
+            if self.corridor is not None and not self.corridor[index]:
+                return math.inf
+            self._last_tile = self._tile(index)
+            self._last_index = index
+        tile_width = min(size, self.width - tx * size)
+        value = self._last_tile[(y - ty * size) * tile_width + (x - tx * size)]  # type: ignore[index]
+        if self.kind == "grid":
+            return 1.0 if value else math.inf
+        return value
+
+    def set_corridor(self, tiles: Optional[Iterable[int]]) -> None:
+        if tiles is None:
+            self.corridor = None
+        else:
+            self.corridor = bytearray(self.tiles_x * self.tiles_y)
+            for index in tiles:
+                self.corridor[index] = 1
+        self._last_index = -1
+        self._last_tile = None
+
+    def cached_tiles(self) -> int:
+        return len(self._cache)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_walkable(self, x: int, y: int) -> bool:
+        return self.in_bounds(x, y) and self._value(x, y) < math.inf
+
+    def valid_step(self, x: int, y: int, dx: int, dy: int) -> bool:
+        nx, ny = x + dx, y + dy
+        if not self.is_walkable(nx, ny):
+            return False
+        if dx != 0 and dy != 0:
+            if not (self.is_walkable(x + dx, y) and self.is_walkable(x, y + dy)):
+                return False
+        return True
+
+    def neighbors8(self, x: int, y: int) -> Iterable[Tuple[int, int]]:
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx == 0 and dy == 0:
+                    continue
+                if self.valid_step(x, y, dx, dy):
+                    yield (x + dx, y + dy)
+
+    def min_cell_cost(self) -> float:
+        return self._min_cost
+
+    def transition_cost(self, x: int, y: int, nx: int, ny: int) -> float:
+        if not self.valid_step(x, y, nx - x, ny - y):
+            raise ValueError("Invalid transition requested")
+        wx, wy = self._value(x, y), self._value(nx, ny)
+        if x == nx or y == ny:
+            return (wx + wy) / 2.0
+        wu, wv = self._value(nx, y), self._value(x, ny)
+        return math.sqrt(2.0) * (wx + wu + wv + wy) / 4.0
+
+
+@dataclass
+class CorridorPlan:
+    path: List[Tuple[int, int]] = field(default_factory=list)
+    cost: float = math.inf
+    expanded: int = 0
+    elapsed_time: float = 0.0
+    tile_path: List[int] = field(default_factory=list)
+    corridor_tiles: int = 0
+    attempts: int = 0
+    tile_loads: int = 0
+
+
+def tile_route(tiled: TiledMap, start: Tuple[int, int], goal: Tuple[int, int]) -> List[int]:
+    # A* over tiles: moves follow the recorded border crossings and cost the
+    # tile span weighted by the mean cell cost of both tiles. Returns tile
+    # indices from start to goal, or [] when no crossing sequence connects them.
+    size, tiles_x = tiled.tile_size, tiled.tiles_x
+    source = (start[0] // size, start[1] // size)
+    target = (goal[0] // size, goal[1] // size)
+    scale = size * tiled.min_cell_cost()
+    open_heap: List[Tuple[float, int, int]] = [(octile_distance(source, target) * scale, 0, source[1] * tiles_x + source[0])]
+    g_scores: Dict[int, float] = {open_heap[0][2]: 0.0}
+    parents: Dict[int, int] = {}
+    closed: Set[int] = set()
+    target_index = target[1] * tiles_x + target[0]
+    counter = 0
+    while open_heap:
+        _, _, index = heapq.heappop(open_heap)
+        if index in closed:
+            continue
+        if index == target_index:
+            route = [index]
+            while route[-1] in parents:
+                route.append(parents[route[-1]])
+            route.reverse()
+            return route
+        closed.add(index)
+        tx, ty = index % tiles_x, index // tiles_x
+        for bit, (dx, dy) in enumerate(TILE_DIRECTIONS):
+            if not tiled.edges[index] >> bit & 1:
+                continue
+            neighbor = (ty + dy) * tiles_x + tx + dx
+            tentative_g = g_scores[index] + step_cost(dx, dy) * size * (tiled.costs[index] + tiled.costs[neighbor]) / 2.0
+            if tentative_g < g_scores.get(neighbor, math.inf):
+                g_scores[neighbor] = tentative_g
+                parents[neighbor] = index
+                counter += 1
+                f = tentative_g + octile_distance((tx + dx, ty + dy), target) * scale
+                heapq.heappush(open_heap, (f, counter, neighbor))
+    return []
+
+
+def _dilate(tiled: TiledMap, route: List[int], margin: int) -> Set[int]:
+    tiles: Set[int] = set()
+    for index in route:
+        tx, ty = index % tiled.tiles_x, index // tiled.tiles_x
+        for y in range(max(0, ty - margin), min(tiled.tiles_y, ty + margin + 1)):
+            for x in range(max(0, tx - margin), min(tiled.tiles_x, tx + margin + 1)):
+                if tiled.open_cells[y * tiled.tiles_x + x]:
+                    tiles.add(y * tiled.tiles_x + x)
+    return tiles
+
+
+def plan_corridor(
+    tiled: TiledMap,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    algorithm: str = "astar",
+    margin: int = 1,
+) -> CorridorPlan:
+    # Routes over tiles first, then runs the cell-level engine with the map
+    # restricted to the tile route widened by `margin` tiles. Tile crossings
+    # do not guarantee connectivity inside a tile, so a failed search retries
+    # with a doubled margin until the corridor spans the whole map; the cost
+    # is optimal within the final corridor.
+    if margin < 0:
+        raise ValueError("margin must be non-negative")
+    search, _ = get_engine(algorithm)
+    start_time = time.perf_counter()
+    loads_before = tiled.tile_loads
+    plan = CorridorPlan()
+    if not tiled.is_walkable(*start) or not tiled.is_walkable(*goal):
+        raise ValueError("Start or goal is blocked")
+    plan.tile_path = tile_route(tiled, start, goal)
+    total_tiles = sum(1 for cells in tiled.open_cells if cells)
+    try:
+        while plan.tile_path:
+            corridor = _dilate(tiled, plan.tile_path, margin)
+            plan.corridor_tiles = len(corridor)
+            plan.attempts += 1
+            tiled.set_corridor(None if len(corridor) == total_tiles else corridor)
+            path, cost, expanded, _ = search(tiled, start, goal)
+            plan.expanded += expanded
+            if path or len(corridor) == total_tiles:
+                plan.path, plan.cost = path, cost
+                break
+            margin = max(1, 2 * margin)
+    finally:
+        tiled.set_corridor(None)
+    plan.tile_loads = tiled.tile_loads - loads_before
+    plan.elapsed_time = time.perf_counter() - start_time
+    return plan
+
+
+def corridor_search(
+    tiled: TiledMap, start: Tuple[int, int], goal: Tuple[int, int], algorithm: str = "astar"
+) -> Tuple[List[Tuple[int, int]], float, int, float]:
+    plan = plan_corridor(tiled, start, goal, algorithm=algorithm)
+    return plan.path, plan.cost, plan.expanded, plan.elapsed_time
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .grid import GridMap
+from .weighted_grid import WeightedGridMap
+
+GridLike = Union[GridMap, WeightedGridMap]
+
+EXPANSION_DTYPE = np.dtype([("x", "<i4"), ("y", "<i4"), ("g", "<f8"), ("h", "<f8")])
+JUMP_DTYPE = np.dtype([("step", "<i4"), ("ox", "<i4"), ("oy", "<i4"), ("tx", "<i4"), ("ty", "<i4")])
+
+
+class SearchTrace:
+    # Recorder handed to an engine as `trace=`. Records go straight into typed
+    # arrays (24 bytes per expansion, 20 per jump) instead of Python tuples, so
+    # a million expansions stay in the tens of megabytes.
+
+    def __init__(self) -> None:
+        self._cells = array("i")
+        self._values = array("d")
+        self._jumps = array("i")
+        self.expansions = 0
+
+    def expand(self, x: int, y: int, g: float, h: float) -> None:
+        self._cells.append(x)
+        self._cells.append(y)
+        self._values.append(g)
+        self._values.append(h)
+        self.expansions += 1
+
+    def jump(self, ox: int, oy: int, tx: int, ty: int) -> None:
+        # Attributed to the latest expansion.
+        self._jumps.extend((self.expansions - 1, ox, oy, tx, ty))
+
+    def to_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        cells = np.frombuffer(self._cells, dtype=np.int32).reshape(-1, 2)
+        values = np.frombuffer(self._values, dtype=np.float64).reshape(-1, 2)
+        expansions = np.empty(len(cells), dtype=EXPANSION_DTYPE)
+        expansions["x"], expansions["y"] = cells[:, 0], cells[:, 1]
+        expansions["g"], expansions["h"] = values[:, 0], values[:, 1]
+        raw = np.frombuffer(self._jumps, dtype=np.int32).reshape(-1, 5)
+        jumps = np.empty(len(raw), dtype=JUMP_DTYPE)
+        for i, name in enumerate(JUMP_DTYPE.names):
+            jumps[name] = raw[:, i]
+        return expansions, jumps
+
+    def save(self, path: str, **meta: object) -> None:
+        expansions, jumps = self.to_arrays()
+        np.savez_compressed(path, expansions=expansions, jumps=jumps, meta=np.array(json.dumps(meta)))
+
+
+@dataclass
+class TraceData:
+    expansions: np.ndarray
+    jumps: np.ndarray
+    meta: Dict[str, object]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        if "width" in self.meta and "height" in self.meta:
+            return int(self.meta["height"]), int(self.meta["width"])  # type: ignore[arg-type]
+        xs, ys = self.expansions["x"], self.expansions["y"]
+        return (int(ys.max()) + 1, int(xs.max()) + 1) if len(xs) else (0, 0)
+
+    def heatmap(self, shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        # Expansions per cell; re-expansions (fringe iterations, stale A*
+        # entries) add up.
+        heat = np.zeros(shape or self.shape, dtype=np.int32)
+        np.add.at(heat, (self.expansions["y"], self.expansions["x"]), 1)
+        return heat
+
+    def first_expansion(self, shape: Optional[Tuple[int, int]] = None) -> np.ndarray:
+        # Index of the first expansion of every cell, -1 where never expanded.
+        order = np.full(shape or self.shape, -1, dtype=np.int64)
+        steps = np.arange(len(self.expansions))[::-1]
+        order[self.expansions["y"][::-1], self.expansions["x"][::-1]] = steps
+        return order
+
+
+def load_trace(path: str) -> TraceData:
+    with np.load(path, allow_pickle=False) as data:
+        return TraceData(data["expansions"], data["jumps"], json.loads(str(data["meta"])))
+
+
+@dataclass
+class TraceDiff:
+    only_a: int
+    only_b: int
+    both: int
+    expansions_a: int
+    expansions_b: int
+    delta: np.ndarray
+
+    @property
+    def overlap(self) -> float:
+        union = self.only_a + self.only_b + self.both
+        return self.both / union if union else 1.0
+
+
+def diff_traces(a: TraceData, b: TraceData) -> TraceDiff:
+    # Cell-level comparison; `delta` is b's heatmap minus a's.
+    shape = tuple(max(sa, sb) for sa, sb in zip(a.shape, b.shape))
+    heat_a, heat_b = a.heatmap(shape), b.heatmap(shape)  # type: ignore[arg-type]
+    in_a, in_b = heat_a > 0, heat_b > 0
+    return TraceDiff(
+        only_a=int((in_a & ~in_b).sum()),
+        only_b=int((in_b & ~in_a).sum()),
+        both=int((in_a & in_b).sum()),
+        expansions_a=len(a.expansions),
+        expansions_b=len(b.expansions),
+        delta=heat_b - heat_a,
+    )
+
+
+def trace_search(
+    engine: str, grid: GridLike, start: Tuple[int, int], goal: Tuple[int, int]
+) -> Tuple[Tuple[List[Tuple[int, int]], float, int, float], SearchTrace]:
+    from .engines import get_engine
+
+    search, _ = get_engine(engine)
+    trace = SearchTrace()
+    result = search(grid, start, goal, trace=trace)
+    return result, trace
+
+
+def _load_background(path: Optional[str], weighted: bool) -> GridLike:
+    if path is None:
+        raise ValueError("The trace does not name its map; pass --map")
+    if weighted:
+        return WeightedGridMap.from_movingai_map(path)
+    return GridMap.from_movingai_map(path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render and compare expansion traces written by `cli --trace`.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    heat = sub.add_parser("heatmap", help="Render the expansion heatmap of a trace.")
+    heat.add_argument("trace", help="Trace .npz file")
+    diff = sub.add_parser("diff", help="Compare two traces of the same query.")
+    diff.add_argument("trace_a", help="Baseline trace .npz file")
+    diff.add_argument("trace_b", help="Candidate trace .npz file")
+    for p in (heat, diff):
+        p.add_argument("--map", dest="map_path", help="Map to draw underneath; the traced map by default.")
+        p.add_argument("--output", "-o", dest="output_path", help="PNG path; ./assets by default.")
+    args = parser.parse_args(argv)
+
+    from .visualize import render_expansion_heatmap, render_trace_diff
+
+    try:
+        if args.command == "heatmap":
+            trace = load_trace(args.trace)
+            grid = _load_background(args.map_path or trace.meta.get("map_path"), bool(trace.meta.get("weighted")))  # type: ignore[arg-type]
+            saved = render_expansion_heatmap(
+                grid,
+                trace.heatmap((grid.height, grid.width)),
+                start=tuple(trace.meta["start"]) if "start" in trace.meta else None,  # type: ignore[arg-type]
+                goal=tuple(trace.meta["goal"]) if "goal" in trace.meta else None,  # type: ignore[arg-type]
+                output_path=args.output_path,
+                title=f"{trace.meta.get('engine', 'search')}: {len(trace.expansions)} expansions",
+            )
+            print(f"Expansions: {len(trace.expansions)}, jumps: {len(trace.jumps)}")
+        else:
+            a, b = load_trace(args.trace_a), load_trace(args.trace_b)
+            grid = _load_background(args.map_path or a.meta.get("map_path"), bool(a.meta.get("weighted")))  # type: ignore[arg-type]
+            result = diff_traces(a, b)
+            label_a, label_b = a.meta.get("engine", "a"), b.meta.get("engine", "b")
+            saved = render_trace_diff(
+                grid,
+                result.delta[: grid.height, : grid.width],
+                start=tuple(a.meta["start"]) if "start" in a.meta else None,  # type: ignore[arg-type]
+                goal=tuple(a.meta["goal"]) if "goal" in a.meta else None,  # type: ignore[arg-type]
+                output_path=args.output_path,
+                title=f"{label_b} - {label_a}: {result.expansions_b} vs {result.expansions_a} expansions",
+            )
+            print(f"{label_a}: {result.expansions_a} expansions, {label_b}: {result.expansions_b} expansions")
+            print(f"Cells only in {label_a}: {result.only_a}, only in {label_b}: {result.only_b}, "
+                  f"both: {result.both} (overlap {result.overlap:.1%})")
+    except (OSError, ValueError, KeyError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+    print(f"Saved visualization to: {saved}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
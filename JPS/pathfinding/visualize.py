@@ -109,30 +109,7 @@ def _patch_linewidth(cell_points: float, base: float, *, min_w: float, max_w: fl
     return max(min_w, min(max_w, cell_points * base))
 
 
-def render_grid_path(
-    grid: GridLike,
-    path: List[Tuple[int, int]],
-    *,
-    jump_points: Optional[List[Tuple[int, int]]] = None,
-    start: Optional[Tuple[int, int]] = None,
-    goal: Optional[Tuple[int, int]] = None,
-    output_path: Optional[str] = None,
-    title: str = "",
-    show: bool = False,
-) -> str:
-    path_for_plot = path or []
-    if start is None and path_for_plot:
-        start = path_for_plot[0]
-    if goal is None and path_for_plot:
-        goal = path_for_plot[-1]
-
-    max_side = max(grid.width, grid.height)
-    base_size = 6.0
-    scale = max(1.0, max_side / 256.0)
-    figsize = (base_size * scale, base_size * scale)
-
-    fig, ax = plt.subplots(figsize=figsize, dpi=500)
-
+def _draw_background(ax: plt.Axes, grid: GridLike, grid_lines: bool = True) -> None:
     if isinstance(grid, WeightedGridMap):
         img, colors = _build_weighted_terrain_image(grid)
         cmap = plt.matplotlib.colors.ListedColormap(colors)
@@ -156,13 +133,48 @@ def render_grid_path(
     ax.set_xlim(0, grid.width)
     ax.set_ylim(grid.height, 0)
 
-    ax.set_xticks(np.arange(0, grid.width + 1), minor=True)
-    ax.set_yticks(np.arange(0, grid.height + 1), minor=True)
-    
-    ax.grid(which="minor", color="#b0b0b0", linewidth=0.4, zorder=1)
+    if grid_lines:
+        ax.set_xticks(np.arange(0, grid.width + 1), minor=True)
+        ax.set_yticks(np.arange(0, grid.height + 1), minor=True)
+        ax.grid(which="minor", color="#b0b0b0", linewidth=0.4, zorder=1)
 
     ax.tick_params(which="both", bottom=False, left=False, labelbottom=False, labelleft=False)
 
+
+def _default_output_path(grid: GridLike, kind: str) -> str:
+    root = os.path.dirname(os.path.dirname(__file__))
+    out_dir = os.path.join(root, "assets")
+    os.makedirs(out_dir, exist_ok=True)
+    ts = time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join(out_dir, f"{ts}_{kind}_{grid.width}x{grid.height}.png")
+
+
+def render_grid_path(
+    grid: GridLike,
+    path: List[Tuple[int, int]],
+    *,
+    jump_points: Optional[List[Tuple[int, int]]] = None,
+    start: Optional[Tuple[int, int]] = None,
+    goal: Optional[Tuple[int, int]] = None,
+    output_path: Optional[str] = None,
+    title: str = "",
+    show: bool = False,
+) -> str:
+    path_for_plot = path or []
+    if start is None and path_for_plot:
+        start = path_for_plot[0]
+    if goal is None and path_for_plot:
+        goal = path_for_plot[-1]
+
+    max_side = max(grid.width, grid.height)
+    base_size = 6.0
+    scale = max(1.0, max_side / 256.0)
+    figsize = (base_size * scale, base_size * scale)
+
+    fig, ax = plt.subplots(figsize=figsize, dpi=500)
+
+    _draw_background(ax, grid)
+
     cell_points = _cell_size_points(ax, grid)
     circle_radius = 0.13
 
@@ -200,12 +212,7 @@ def render_grid_path(
         ax.set_title(title)
 
     if output_path is None:
-        root = os.path.dirname(os.path.dirname(__file__))
-        out_dir = os.path.join(root, "assets")
-        os.makedirs(out_dir, exist_ok=True)
-        ts = time.strftime("%Y%m%d_%H%M%S")
-        fname = f"{ts}_grid_{grid.width}x{grid.height}.png"
-        output_path = os.path.join(out_dir, fname)
+        output_path = _default_output_path(grid, "grid")
 
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     fig.savefig(output_path, bbox_inches="tight")
@@ -213,3 +220,80 @@ def render_grid_path(
         plt.close(fig)
 
     return os.path.abspath(output_path)
+
+
+def _render_overlay(
+    grid: GridLike,
+    overlay: np.ma.MaskedArray,
+    cmap: str,
+    norm: mcolors.Normalize,
+    label: str,
+    start: Optional[Tuple[int, int]],
+    goal: Optional[Tuple[int, int]],
+    output_path: Optional[str],
+    title: str,
+    kind: str,
+) -> str:
+    # Overlays are drawn at a lower resolution than render_grid_path and
+    # without cell grid lines, since traces usually come from large maps.
+    max_side = max(grid.width, grid.height)
+    side = 6.0 * max(1.0, max_side / 512.0)
+    fig, ax = plt.subplots(figsize=(side * 1.15, side), dpi=200)
+    _draw_background(ax, grid, grid_lines=max_side <= 64)
+    image = ax.imshow(
+        overlay,
+        origin="upper",
+        extent=(0, grid.width, grid.height, 0),
+        interpolation="none",
+        cmap=cmap,
+        norm=norm,
+        alpha=0.85,
+        zorder=2,
+    )
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04, label=label)
+    for point, color in ((start, "#00bfff"), (goal, "#ff1493")):
+        if point is not None:
+            ax.add_patch(Circle((point[0] + 0.5, point[1] + 0.5), radius=max(0.4, max_side / 150.0),
+                                facecolor=color, edgecolor="black", linewidth=0.8, zorder=4))
+    if title:
+        ax.set_title(title)
+
+    if output_path is None:
+        output_path = _default_output_path(grid, kind)
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    fig.savefig(output_path, bbox_inches="tight")
+    plt.close(fig)
+    return os.path.abspath(output_path)
+
+
+def render_expansion_heatmap(
+    grid: GridLike,
+    heat: np.ndarray,
+    *,
+    start: Optional[Tuple[int, int]] = None,
+    goal: Optional[Tuple[int, int]] = None,
+    output_path: Optional[str] = None,
+    title: str = "",
+) -> str:
+    # `heat` holds expansions per cell (SearchTrace heatmap); log-scaled so
+    # that single expansions stay visible next to hot spots.
+    overlay = np.ma.masked_less_equal(heat, 0)
+    norm = mcolors.LogNorm(vmin=1, vmax=max(2, int(heat.max())))
+    return _render_overlay(grid, overlay, "inferno", norm, "expansions", start, goal, output_path, title, "heatmap")
+
+
+def render_trace_diff(
+    grid: GridLike,
+    delta: np.ndarray,
+    *,
+    start: Optional[Tuple[int, int]] = None,
+    goal: Optional[Tuple[int, int]] = None,
+    output_path: Optional[str] = None,
+    title: str = "",
+) -> str:
+    # `delta` is candidate minus baseline expansions per cell: red cells were
+    # expanded more by the candidate, blue ones more by the baseline.
+    overlay = np.ma.masked_equal(delta, 0)
+    bound = max(1, int(np.abs(delta).max()))
+    norm = mcolors.TwoSlopeNorm(vmin=-bound, vcenter=0, vmax=bound)
+    return _render_overlay(grid, overlay, "coolwarm", norm, "expansions (b - a)", start, goal, output_path, title, "trace_diff")
@@ -3,11 +3,14 @@ from __future__ import annotations
 import json
 import math
 import os
-from dataclasses import dataclass
-from typing import Iterable, List, Optional, Tuple
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 import random
 
+from .grid import EditSubscription, _new_subscriptions
+
 def _deterministic_weight(ch: str) -> float:
     return 1.0 + (ord(ch) % 9)
 
@@ -60,6 +63,11 @@ class WeightedGridMap:
     walkable: List[List[bool]]  # walkable[y][x]
     weights: List[List[float]]  # weights[y][x]
     chars: Optional[List[List[str]]] = None
+    dirty: Set[Tuple[int, int]] = field(default_factory=set, init=False, repr=False, compare=False)
+    _subscriptions: "weakref.WeakSet[EditSubscription]" = field(
+        default_factory=_new_subscriptions, init=False, repr=False, compare=False
+    )
+    _min_cost: Optional[float] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         if len(self.walkable) != self.height:
@@ -178,12 +186,99 @@ class WeightedGridMap:
                     yield (x + dx, y + dy)
 
     def min_cell_cost(self) -> float:
-        best = math.inf
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.walkable[y][x]:
-                    best = min(best, self.weights[y][x])
-        return best
+        # Cached because the weighted heuristics call this per node; edits made
+        # through set_weight/set_walkable keep the cache consistent.
+        if self._min_cost is None:
+            best = math.inf
+            for y in range(self.height):
+                for x in range(self.width):
+                    if self.walkable[y][x]:
+                        best = min(best, self.weights[y][x])
+            self._min_cost = best
+        return self._min_cost
+
+    def _update_cell(self, x: int, y: int, walkable: bool, weight: float) -> bool:
+        if not self.in_bounds(x, y):
+            raise ValueError(f"Cell ({x}, {y}) is out of bounds")
+        old_walkable, old_weight = self.walkable[y][x], self.weights[y][x]
+        if old_walkable == walkable and old_weight == weight:
+            return False
+        self.walkable[y][x] = walkable
+        self.weights[y][x] = weight
+        if self.chars is not None and old_walkable != walkable:
+            self.chars[y][x] = "." if walkable else "#"
+        if self._min_cost is not None:
+            if walkable and weight < self._min_cost:
+                self._min_cost = weight
+            elif old_walkable and old_weight <= self._min_cost:
+                self._min_cost = None
+        self._mark_dirty(x, y)
+        return True
+
+    def set_walkable(self, x: int, y: int, walkable: bool, weight: float = 1.0) -> bool:
+        if walkable:
+            if not (0.0 < weight < math.inf):
+                raise ValueError("Walkable cells need a positive finite weight")
+            if self.is_walkable(x, y):
+                return False
+            return self._update_cell(x, y, True, float(weight))
+        return self._update_cell(x, y, False, math.inf)
+
+    def set_weight(self, x: int, y: int, weight: float) -> bool:
+        if weight == math.inf:
+            return self.set_walkable(x, y, False)
+        if not self.is_walkable(x, y):
+            raise ValueError(f"Cell ({x}, {y}) is blocked; use set_walkable to open it")
+        if weight <= 0.0:
+            raise ValueError("Weights must be positive")
+        return self._update_cell(x, y, True, float(weight))
+
+    def apply_edits(self, edits: Iterable[Tuple[int, int, float]]) -> Set[Tuple[int, int]]:
+        # Each edit is (x, y, weight); math.inf blocks the cell.
+        changed: Set[Tuple[int, int]] = set()
+        for x, y, weight in edits:
+            if weight == math.inf:
+                updated = self.set_walkable(x, y, False)
+            elif self.is_walkable(x, y):
+                updated = self.set_weight(x, y, weight)
+            else:
+                updated = self.set_walkable(x, y, True, weight)
+            if updated:
+                changed.add((x, y))
+        return changed
+
+    def _mark_dirty(self, x: int, y: int) -> None:
+        self.dirty.add((x, y))
+        for subscription in self._subscriptions:
+            subscription.cells.add((x, y))
+
+    def subscribe_edits(self) -> EditSubscription:
+        subscription = EditSubscription()
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def take_dirty(self) -> Set[Tuple[int, int]]:
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {k: v for k, v in self.__dict__.items() if k != "_subscriptions"}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._subscriptions = _new_subscriptions()
+
+    def dirty_region(self) -> Optional[Tuple[int, int, int, int]]:
+        if not self.dirty:
+            return None
+        xs = [x for x, _ in self.dirty]
+        ys = [y for _, y in self.dirty]
+        return (
+            max(0, min(xs) - 1),
+            max(0, min(ys) - 1),
+            min(self.width - 1, max(xs) + 1),
+            min(self.height - 1, max(ys) + 1),
+        )
 
     def transition_cost(self, x: int, y: int, nx: int, ny: int) -> float:
         if not self.valid_step(x, y, nx - x, ny - y):
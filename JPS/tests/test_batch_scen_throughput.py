@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+import unittest
+from typing import Iterable, List
+
+from pathfinding.batch import BatchQuery, iter_batch, solve_batch
+from pathfinding.grid import GridMap, load_scenarios
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+MAPS_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "maps")
+EXAMPLE_DIR = os.path.join(MAPS_ROOT, "example")
+
+SCEN_DIRS: List[str] = [
+    "maze-scen",
+    "random-scen",
+    "room-scen",
+]
+
+MAX_PROBLEMS_PER_SCEN = 50
+MAX_WORKERS = os.cpu_count() or 1
+
+
+def _iter_scen_files() -> Iterable[str]:
+    for scen_dir in SCEN_DIRS:
+        full_dir = os.path.join(MAPS_ROOT, scen_dir)
+        if not os.path.isdir(full_dir):
+            continue
+        for name in sorted(os.listdir(full_dir)):
+            if name.lower().endswith(".scen"):
+                yield os.path.join(full_dir, name)
+
+
+def _example_queries(count: int) -> List[BatchQuery]:
+    grid_path = os.path.join(EXAMPLE_DIR, "grid.map")
+    weighted_path = os.path.join(EXAMPLE_DIR, "weighted_grid.map")
+    terrain_path = os.path.join(EXAMPLE_DIR, "terrain_weights.json")
+    grid = GridMap.from_movingai_map(grid_path)
+    wgrid = WeightedGridMap.from_movingai_map(weighted_path, terrain_weights_path=terrain_path)
+
+    def free_cell(g) -> tuple:
+        while True:
+            x, y = random.randrange(g.width), random.randrange(g.height)
+            if g.is_walkable(x, y):
+                return x, y
+
+    queries: List[BatchQuery] = []
+    for i in range(count):
+        if i % 2 == 0:
+            algorithm = random.choice(["astar", "jps"])
+            queries.append(BatchQuery(grid_path, free_cell(grid), free_cell(grid), algorithm))
+        else:
+            algorithm = random.choice(["astarw", "jpsw"])
+            queries.append(
+                BatchQuery(weighted_path, free_cell(wgrid), free_cell(wgrid), algorithm, terrain_weights_path=terrain_path)
+            )
+    return queries
+
+
+class BatchQueryTests(unittest.TestCase):
+    def test_pool_matches_inline(self) -> None:
+        random.seed(29)
+        queries = _example_queries(60)
+        inline = solve_batch(queries, workers=0)
+        pooled = solve_batch(queries, workers=2, chunk_size=8)
+        self.assertEqual(len(pooled), len(queries))
+        for i, (a, b) in enumerate(zip(inline, pooled)):
+            with self.subTest(index=i, algorithm=queries[i].algorithm):
+                self.assertEqual(b.index, i)
+                self.assertIsNone(b.error)
+                if math.isinf(a.cost):
+                    self.assertTrue(math.isinf(b.cost))
+                else:
+                    self.assertTrue(math.isclose(a.cost, b.cost, rel_tol=1e-6, abs_tol=1e-6))
+
+    def test_stream_yields_every_query_once(self) -> None:
+        random.seed(30)
+        queries = _example_queries(20)
+        indices = sorted(result.index for result in iter_batch(queries, workers=2, chunk_size=3))
+        self.assertEqual(indices, list(range(len(queries))))
+
+    def test_unknown_algorithm(self) -> None:
+        query = BatchQuery(os.path.join(EXAMPLE_DIR, "grid.map"), (0, 0), (1, 1), "dijkstra")
+        with self.assertRaises(ValueError):
+            solve_batch([query], workers=0)
+
+    def test_scen_throughput_scaling(self) -> None:
+        queries: List[BatchQuery] = []
+        for scen_path in _iter_scen_files():
+            for prob in load_scenarios(scen_path)[-MAX_PROBLEMS_PER_SCEN:]:
+                queries.append(BatchQuery(prob.map_path, (prob.start_x, prob.start_y), (prob.goal_x, prob.goal_y)))
+        if not queries:
+            self.skipTest("MovingAI .scen sets are not available")
+
+        rows = []
+        for workers in range(1, MAX_WORKERS + 1):
+            start_time = time.perf_counter()
+            results = solve_batch(queries, workers=workers)
+            elapsed_time = time.perf_counter() - start_time
+            self.assertEqual(len(results), len(queries))
+            rows.append({
+                "workers": workers,
+                "queries": len(queries),
+                "elapsed_time": elapsed_time,
+                "throughput": len(queries) / elapsed_time,
+            })
+        save_rows(rows, "test_batch_scen_throughput")
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import cli
+from benchmarks.harness import MapSet, ScenarioSet, SyntheticSet, run_benchmark, summarize
+from pathfinding.astar import astar_search
+from pathfinding.grid import GridMap
+
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "maps", "example")
+
+
+class BenchmarkHarnessTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.runner = CliRunner()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write_scen(self, wrong_last: bool = False) -> str:
+        # Scenario lines next to the example map, optimal lengths from A*.
+        map_path = os.path.join(EXAMPLE_DIR, "grid.map")
+        grid = GridMap.from_movingai_map(map_path)
+        free = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+        pairs = [(free[0], free[-1]), (free[1], free[len(free) // 2]), (free[-2], free[3])]
+        lines = ["version 1"]
+        for i, (start, goal) in enumerate(pairs):
+            _, cost, _, _ = astar_search(grid, start, goal)
+            if wrong_last and i == len(pairs) - 1:
+                cost += 1.0
+            lines.append(f"0\t{os.path.relpath(map_path, self.tmp.name)}\t{grid.width}\t{grid.height}\t{start[0]}\t{start[1]}\t{goal[0]}\t{goal[1]}\t{cost}")
+        scen_path = os.path.join(self.tmp.name, "example.map.scen")
+        with open(scen_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return scen_path
+
+    def test_summary_percentiles_and_checks(self) -> None:
+        measurements = run_benchmark(
+            [ScenarioSet(self.write_scen()), SyntheticSet("random:24:0.2", queries=5, seed=1)],
+            ["astar", "jps", "astarw"],
+            warmup=0,
+            repeat=3,
+        )
+        self.assertEqual(len(measurements), 3 * (3 + 5))
+        rows = summarize(measurements)
+        self.assertEqual(len(rows), 6)
+        for row in rows:
+            with self.subTest(engine=row["engine"], source=row["source"]):
+                self.assertLessEqual(row["p50"], row["p95"])
+                self.assertLessEqual(row["p95"], row["p99"])
+                self.assertEqual(row["samples"], 3 * row["queries"])
+                self.assertEqual(row["mismatches"], 0)
+                # Scenario lengths are unit-cost, so A*W on the scenario is unchecked.
+                expected_checked = 0 if (row["engine"], row["source"]) == ("astarw", "example.map") else row["queries"]
+                self.assertEqual(row["checked"], expected_checked)
+        with self.assertRaises(TypeError):
+            MapSet("empty")  # type: ignore[abstract]
+
+    def test_cli_writes_json(self) -> None:
+        out_path = os.path.join(self.tmp.name, "report.json")
+        result = self.runner.invoke(
+            cli,
+            ["run", "-s", self.write_scen(), "--synthetic", "random:16:0.1", "--queries", "3", "-e", "jps", "--repeat", "2", "--per-query", "-o", out_path],
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        with open(out_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertEqual(report["settings"]["repeat"], 2)
+        self.assertTrue(report["settings"]["gc_disabled"])
+        self.assertIn("cpu_count", report["machine"])
+        self.assertEqual(len(report["queries"]), 6)
+        self.assertTrue(all(len(q["times"]) == 2 and q["correct"] for q in report["queries"]))
+
+    def test_cli_flags_wrong_lengths_and_bad_arguments(self) -> None:
+        result = self.runner.invoke(cli, ["run", "-s", self.write_scen(wrong_last=True), "-e", "astar", "--repeat", "1"])
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("1 queries did not match", result.output)
+        self.assertNotEqual(self.runner.invoke(cli, ["run", "-e", "astar"]).exit_code, 0)
+        self.assertNotEqual(self.runner.invoke(cli, ["run", "--synthetic", "random:16:0.1", "--repeat", "0"]).exit_code, 0)
+        self.assertNotEqual(self.runner.invoke(cli, ["run", "--synthetic", "maze:16"]).exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
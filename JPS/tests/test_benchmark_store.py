@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import unittest
+from typing import List
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import cli
+from benchmarks.harness import QueryMeasurement, SyntheticSet, run_benchmark
+from benchmarks.store import BenchmarkStore, compare_revisions, machine_fingerprint
+
+
+def fake_measurements(rng: random.Random, slowdown: dict, samples: int = 30) -> List[QueryMeasurement]:
+    measurements = []
+    for engine in ("astar", "jps", "jpsw"):
+        for map_name in ("a.map", "b.map"):
+            factor = slowdown.get(engine, 1.0)
+            times = [factor * rng.lognormvariate(-6.0, 0.1) for _ in range(samples)]
+            measurements.append(QueryMeasurement(engine, "set", map_name, (0, 0), (1, 1), None, 1.0, 10, times, bucket=3))
+    return measurements
+
+
+class BenchmarkStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "bench.sqlite")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_compare_flags_only_real_changes(self) -> None:
+        rng = random.Random(42)
+        with BenchmarkStore(self.db) as store:
+            store.record_run(fake_measurements(rng, {}), revision="aaaa1111", created=1.0)
+            store.record_run(fake_measurements(rng, {}), revision="aaaa1111", created=2.0)
+            store.record_run(fake_measurements(rng, {"jps": 1.3, "jpsw": 0.7}), revision="bbbb2222", created=3.0)
+            self.assertEqual(store.resolve_revision("bbbb"), "bbbb2222")
+            self.assertEqual(store.latest_revision(), "bbbb2222")
+            results = compare_revisions(store, "aaaa1111", "bbbb2222", machine=machine_fingerprint())
+        self.assertEqual(len(results), 6)
+        for row in results:
+            with self.subTest(engine=row.engine, map=row.map_name):
+                self.assertEqual(row.bucket, 3)
+                self.assertEqual((row.baseline_samples, row.candidate_samples), (60, 30))
+                self.assertEqual(row.regression, row.engine == "jps")
+                self.assertEqual(row.improvement, row.engine == "jpsw")
+
+    def test_store_errors(self) -> None:
+        with BenchmarkStore(self.db) as store:
+            with self.assertRaises(ValueError):
+                store.latest_revision()
+            store.record_run([], revision="abc1", created=1.0)
+            store.record_run([], revision="abc2", created=2.0)
+            with self.assertRaises(ValueError):
+                store.resolve_revision("abc")
+            with self.assertRaises(ValueError):
+                store.resolve_revision("zzz")
+            with self.assertRaises(ValueError):
+                compare_revisions(store, "abc1", "abc2", alpha=0.0)
+
+    def test_cli_record_compare_and_trend(self) -> None:
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["run", "--synthetic", "random:16:0.1", "--queries", "4", "-e", "astar", "--repeat", "3", "--record", "--db", self.db, "-o", os.devnull]
+        )
+        self.assertEqual(result.exit_code, 0, result.output)
+        with BenchmarkStore(self.db) as store:
+            revision = store.latest_revision()
+            rng = random.Random(7)
+            store.record_run(fake_measurements(rng, {}), revision="base0000", created=0.0)
+            store.record_run(fake_measurements(rng, {"astar": 2.0}), revision="cand0000")
+
+        result = runner.invoke(cli, ["compare", "-b", "base", "-c", "cand", "--db", self.db])
+        self.assertEqual(result.exit_code, 1)
+        self.assertEqual(result.output.count("REGRESSION"), 2)
+
+        result = runner.invoke(cli, ["compare", "-b", revision[:12], "-c", revision[:12], "--db", self.db])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertNotIn("REGRESSION", result.output)
+
+        result = runner.invoke(cli, ["trend", "-e", "astar", "--db", self.db, "--title", "test_benchmark_trend"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        out_path = result.output.strip().split("Saved trend plot to ")[-1]
+        self.assertTrue(os.path.isfile(out_path))
+        os.remove(out_path)
+
+    def test_records_real_measurements(self) -> None:
+        measurements = run_benchmark([SyntheticSet("random:12:0.1", queries=3, seed=2)], ["jps"], warmup=0, repeat=2)
+        with BenchmarkStore(self.db) as store:
+            store.record_run(measurements, revision="r1")
+            samples = store.samples("r1")
+        self.assertEqual(sum(len(v) for v in samples.values()), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+from tqdm import tqdm, trange
+import math
+import random
+import time
+import unittest
+from collections import defaultdict
+from typing import List, Tuple
+
+from pathfinding.astarw import astarw_search
+from pathfinding.ch import build_contraction_hierarchy, ch_search
+from pathfinding.jpsw import jump_point_search_weighted
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import get_mean_and_ci95, run_search, save_results, save_rows
+
+
+def generate_random_weighted_grid(width: int, height: int, obstacle_prob: float, terrain_symbols: str = "ABCDEF") -> WeightedGridMap:
+    while True:
+        rows: List[str] = []
+        for _ in range(height):
+            rows.append("".join("#" if random.random() < obstacle_prob else random.choice(terrain_symbols) for _ in range(width)))
+        grid = WeightedGridMap.from_ascii(rows)
+        if sum(row.count(True) for row in grid.walkable) >= 2:
+            return grid
+
+
+def pick_pairs(grid: WeightedGridMap, count: int) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    free = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.walkable[y][x]]
+    random.shuffle(free)
+    return [(free[i], free[i + 1]) for i in range(0, min(len(free) - 1, 2 * count), 2)]
+
+
+def path_cost(grid: WeightedGridMap, path: List[Tuple[int, int]]) -> float:
+    return sum(grid.transition_cost(a[0], a[1], b[0], b[1]) for a, b in zip(path, path[1:]))
+
+
+class CHRandomTests(unittest.TestCase):
+    def base_test_random_grids_ch_matches_astarw(self, probs, ns, num_samples, num_trials, name) -> None:
+        random.seed(7)
+        elapsed_times = defaultdict(list)
+        expanded_nodes = defaultdict(list)
+        build_stats = defaultdict(lambda: defaultdict(list))
+        for prob in tqdm(probs, desc="Probs", leave=False):
+            for n in tqdm(ns, desc="n", leave=False):
+                for _ in trange(num_trials, desc="Trials", leave=False):
+                    grid = generate_random_weighted_grid(n, n, obstacle_prob=prob)
+                    build_start = time.perf_counter()
+                    ch = build_contraction_hierarchy(grid)
+                    build_stats[(n, prob)]["build_time"].append(time.perf_counter() - build_start)
+                    build_stats[(n, prob)]["nbytes"].append(ch.nbytes())
+                    build_stats[(n, prob)]["shortcuts"].append(ch.shortcuts)
+
+                    for start, goal in tqdm(pick_pairs(grid, num_samples), desc="Samples", leave=False):
+                        path_a, cost_a = run_search(astarw_search, "astarw", grid, start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        path_j, cost_j = run_search(jump_point_search_weighted, "jpsw", grid, start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        path_c, cost_c = run_search(lambda _, s, g: ch_search(ch, s, g), "ch", grid, start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        if not path_a:
+                            self.assertFalse(path_c, "CH found a path where A*W did not")
+                            self.assertTrue(math.isinf(cost_c))
+                        else:
+                            self.assertTrue(path_c, "CH failed to find a path that A*W found")
+                            self.assertTrue(
+                                math.isclose(cost_a, cost_c, rel_tol=1e-6, abs_tol=1e-6),
+                                msg=f"Costs differ on size={n}, start={start}, goal={goal}: A*W={cost_a}, CH={cost_c}",
+                            )
+                            self.assertEqual(path_c[0], start)
+                            self.assertEqual(path_c[-1], goal)
+                            self.assertTrue(math.isclose(path_cost(grid, path_c), cost_c, rel_tol=1e-6, abs_tol=1e-6))
+        save_results(elapsed_times, expanded_nodes, name)
+
+        rows = []
+        for (n, prob), stats in build_stats.items():
+            row = {"n": n, "prob": prob}
+            for metric, values in stats.items():
+                row[f"mean_{metric}"] = sum(values) / len(values)
+                row[f"ci95_{metric}"] = get_mean_and_ci95(values)[1] if len(values) > 1 else float("nan")
+            rows.append(row)
+        save_rows(rows, f"{name}__build")
+
+    def test_random_small(self) -> None:
+        self.base_test_random_grids_ch_matches_astarw(
+            probs=(0.1, 0.25, 0.5),
+            ns=(8, 12, 20),
+            num_trials=5,
+            num_samples=10,
+            name="ch_vs_astarw_random_small",
+        )
+
+    def test_random_large(self) -> None:
+        self.base_test_random_grids_ch_matches_astarw(
+            probs=(0.1, 0.25),
+            ns=(32, 64),
+            num_trials=2,
+            num_samples=10,
+            name="ch_vs_astarw_random_large",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
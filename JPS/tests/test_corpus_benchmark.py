@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import cli
+from benchmarks.corpus import bucket_report, map_report, run_corpus
+from benchmarks.generators import write_map_set
+from benchmarks.harness import ScenarioSet
+from pathfinding.grid import load_scenarios
+
+
+class CorpusBenchmarkTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.scen_dir = os.path.join(self.tmp.name, "scen")
+        self.scens = [write_map_set(self.scen_dir, "random", 32, 0.1, seed, 6) for seed in (0, 1, 2)]
+        self.checkpoint = os.path.join(self.tmp.name, "corpus.jsonl")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_load_scenarios_keeps_bucket_column(self) -> None:
+        problems = load_scenarios(self.scens[0])
+        self.assertEqual(len(problems), 6)
+        for prob in problems:
+            self.assertEqual(prob.bucket, int(prob.optimal_length // 4))
+        path = os.path.join(self.tmp.name, "no_bucket.scen")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("version 1\nx\trandom-32-0.1-0.map\t32\t32\t0\t0\t1\t1\t1.4\n")
+        self.assertIsNone(load_scenarios(path)[0].bucket)
+
+    def test_scenario_set_carries_buckets(self) -> None:
+        for _, queries in ScenarioSet(self.scens[0]).maps():
+            self.assertTrue(all(q.bucket == int(q.optimal // 4) for q in queries))  # type: ignore[operator]
+
+    def test_run_corpus_measures_every_problem(self) -> None:
+        seen = []
+        measurements = run_corpus(
+            [self.scen_dir], ["astar", "jps"], self.checkpoint, progress=lambda scen, ms, done, total: seen.append((done, total))
+        )
+        self.assertEqual(len(measurements), 2 * 3 * 6)
+        self.assertEqual(seen, [(1, 3), (2, 3), (3, 3)])
+        self.assertTrue(all(m.correct for m in measurements))
+        self.assertEqual(len({m.map_name for m in measurements}), 3)
+        pooled = run_corpus([self.scen_dir], ["astar", "jps"], self.checkpoint + ".pool", processes=2)
+        key = lambda m: (m.engine, m.map_name, m.start, m.goal)  # noqa: E731
+        self.assertEqual(sorted(map(key, pooled)), sorted(map(key, measurements)))
+        with self.assertRaises(ValueError):
+            run_corpus([self.scen_dir], ["astar"], self.checkpoint, processes=0)
+
+    def test_checkpoint_resumes_after_interruption(self) -> None:
+        first = run_corpus([self.scens[0]], ["jps"], self.checkpoint)
+        # Simulate a run killed while the next file was being written.
+        with open(self.checkpoint, "a", encoding="utf-8") as f:
+            f.write('{"scen": "' + os.path.abspath(self.scens[1]) + '", "measurements": [{"eng')
+        measured = []
+        resumed = run_corpus([self.scen_dir], ["jps"], self.checkpoint, progress=lambda scen, ms, done, total: measured.append(scen))
+        self.assertEqual(measured, [os.path.abspath(path) for path in self.scens[1:]])
+        self.assertEqual(resumed[: len(first)], first)
+        self.assertEqual(len(resumed), 3 * 6)
+        again = run_corpus([self.scen_dir], ["jps"], self.checkpoint, progress=lambda *args: self.fail("nothing left to run"))
+        self.assertEqual(again, resumed)
+        with self.assertRaisesRegex(ValueError, "different settings"):
+            run_corpus([self.scen_dir], ["astar"], self.checkpoint)
+        self.assertEqual(len(run_corpus([self.scens[0]], ["astar"], self.checkpoint, fresh=True)), 6)
+
+    def test_reports_group_by_bucket_and_map(self) -> None:
+        measurements = run_corpus([self.scen_dir], ["astar", "jps"], self.checkpoint, repeat=2)
+        buckets = bucket_report(measurements)
+        self.assertEqual(sum(row["queries"] for row in buckets), len(measurements))  # type: ignore[misc]
+        self.assertEqual({row["engine"] for row in buckets}, {"astar", "jps"})
+        for row in buckets:
+            group = [m for m in measurements if m.engine == row["engine"] and m.bucket == row["bucket"]]
+            self.assertEqual(row["queries"], len(group))
+            self.assertAlmostEqual(row["mean_expanded"], sum(m.expanded for m in group) / len(group))  # type: ignore[arg-type]
+            self.assertLessEqual(row["p50_time"], row["p95_time"])  # type: ignore[operator]
+            self.assertEqual(row["mismatches"], 0)
+        maps = map_report(measurements)
+        self.assertEqual(len(maps), 2 * 3)
+        self.assertTrue(all(row["queries"] == 6 for row in maps))
+        measurements[0].bucket = None
+        self.assertEqual(bucket_report(measurements[:1])[0]["bucket"], -1)
+
+    def test_cli_corpus_writes_checkpoint(self) -> None:
+        args = ["corpus", "-s", self.scen_dir, "-e", "jps", "--checkpoint", self.checkpoint, "--title", "corpus_cli_test"]
+        result = CliRunner().invoke(cli, args)
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("bucket=", result.output)
+        with open(self.checkpoint, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(json.loads(lines[0])["settings"]["engines"], ["jps"])
+        self.assertEqual(len(lines), 1 + 3)
+        bad = CliRunner().invoke(cli, args[:-4] + ["-e", "astar", "--checkpoint", self.checkpoint])
+        self.assertNotEqual(bad.exit_code, 0)
+        self.assertIn("different settings", bad.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from tqdm import tqdm, trange
+import math
+import random
+import unittest
+from collections import defaultdict
+from typing import List, Tuple, Union
+
+from pathfinding.astar import astar_search
+from pathfinding.astarw import astarw_search
+from pathfinding.dstar_lite import DStarLite
+from pathfinding.grid import GridMap
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import run_search, save_results
+
+
+def generate_random_rows(width: int, height: int, block_prob: float, terrain_symbols: str) -> List[str]:
+    return [
+        "".join("#" if random.random() < block_prob else random.choice(terrain_symbols) for _ in range(width))
+        for _ in range(height)
+    ]
+
+
+def random_edits(
+    grid: Union[GridMap, WeightedGridMap], count: int, protected: Tuple[Tuple[int, int], ...], weights: Tuple[float, ...]
+) -> List[Tuple[int, int, object]]:
+    edits: List[Tuple[int, int, object]] = []
+    while len(edits) < count:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if (x, y) in protected:
+            continue
+        if isinstance(grid, WeightedGridMap):
+            edits.append((x, y, random.choice(weights)))
+        else:
+            edits.append((x, y, not grid.walkable[y][x]))
+    return edits
+
+
+class DStarLiteRandomTests(unittest.TestCase):
+    def base_test_edit_stream(self, weighted, probs, ns, num_trials, num_steps, edits_per_step, name) -> None:
+        random.seed(11)
+        elapsed_times = defaultdict(list)
+        expanded_nodes = defaultdict(list)
+        full_search = astarw_search if weighted else astar_search
+        full_name = "astarw_full" if weighted else "astar_full"
+        for prob in tqdm(probs, desc="Probs", leave=False):
+            for n in tqdm(ns, desc="n", leave=False):
+                for _ in trange(num_trials, desc="Trials", leave=False):
+                    rows = generate_random_rows(n, n, prob, "ABC" if weighted else ".")
+                    grid = WeightedGridMap.from_ascii(rows) if weighted else GridMap.from_ascii(rows)
+                    free = [(x, y) for y in range(n) for x in range(n) if grid.walkable[y][x]]
+                    if len(free) < 2:
+                        continue
+                    start, goal = random.sample(free, 2)
+                    planner = DStarLite(grid, start, goal)
+                    planner.plan()
+
+                    for _ in range(num_steps):
+                        grid.apply_edits(random_edits(grid, edits_per_step, (planner.start, goal), (math.inf, 3.0, 4.0, 5.0)))
+                        path_a, cost_a = run_search(full_search, full_name, grid, planner.start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        path_d, cost_d = run_search(lambda *_: planner.replan(), "dstar_lite", grid, planner.start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        if not path_a:
+                            self.assertFalse(path_d, "D* Lite found a path where full A* did not")
+                            self.assertTrue(math.isinf(cost_d))
+                        else:
+                            self.assertTrue(path_d, "D* Lite failed to find a path that full A* found")
+                            self.assertTrue(
+                                math.isclose(cost_a, cost_d, rel_tol=1e-6, abs_tol=1e-6),
+                                msg=f"Costs differ on size={n}, start={planner.start}, goal={goal}: full={cost_a}, D*Lite={cost_d}",
+                            )
+                            if len(path_d) > 1:
+                                planner.move_to(path_d[1])
+        save_results(elapsed_times, expanded_nodes, name)
+
+    def test_unweighted_edit_stream(self) -> None:
+        self.base_test_edit_stream(
+            weighted=False,
+            probs=(0.1, 0.25),
+            ns=(32, 64, 128),
+            num_trials=3,
+            num_steps=20,
+            edits_per_step=4,
+            name="dstar_lite_vs_astar_edit_stream",
+        )
+
+    def test_weighted_edit_stream(self) -> None:
+        self.base_test_edit_stream(
+            weighted=True,
+            probs=(0.1, 0.25),
+            ns=(16, 32, 64),
+            num_trials=3,
+            num_steps=10,
+            edits_per_step=4,
+            name="dstar_lite_vs_astarw_edit_stream",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from tqdm import tqdm
+import math
+import random
+import unittest
+from collections import defaultdict
+from typing import List
+
+from pathfinding.astar import AStarSearch
+from pathfinding.astarw import AStarWSearch
+from pathfinding.epea import DIRECTIONS, OSF_TABLE, EPEASearch, EPEAWSearch, osf_key
+from pathfinding.grid import GridMap
+from pathfinding.heuristics import octile_distance, step_cost
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import get_mean_and_ci95, save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+def peak_open_size(search) -> int:
+    peak = len(search.open_heap)
+    while not search.step():
+        peak = max(peak, len(search.open_heap))
+    return peak
+
+
+class EPEATests(unittest.TestCase):
+    def test_osf_table_matches_octile_deltas(self) -> None:
+        for x in range(-8, 9):
+            for y in range(-8, 9):
+                deltas = {(dx, dy): delta for delta, dx, dy in OSF_TABLE[osf_key(x, y, (0, 0))]}
+                for dx, dy in DIRECTIONS:
+                    expected = step_cost(dx, dy) + octile_distance((x + dx, y + dy), (0, 0)) - octile_distance((x, y), (0, 0))
+                    self.assertAlmostEqual(deltas[(dx, dy)], expected, places=9)
+
+    def check_against(self, grid, reference_cls, epea_cls, queries: int) -> None:
+        for i in range(queries):
+            start, goal = free_cell(grid), free_cell(grid)
+            with self.subTest(i=i, start=start, goal=goal):
+                reference = reference_cls(grid, start, goal)
+                reference.run()
+                search = epea_cls(grid, start, goal)
+                search.run()
+                self.assertEqual(bool(reference.path), bool(search.path))
+                if reference.path:
+                    self.assertTrue(math.isclose(reference.cost, search.cost, rel_tol=1e-6, abs_tol=1e-6))
+                    self.assertEqual(search.path[0], start)
+                    self.assertEqual(search.path[-1], goal)
+                    for (x, y), (nx, ny) in zip(search.path, search.path[1:]):
+                        self.assertTrue(grid.valid_step(x, y, nx - x, ny - y))
+
+    def test_unweighted_matches_astar(self) -> None:
+        random.seed(38)
+        for prob in (0.0, 0.2, 0.4):
+            self.check_against(generate_random_grid(30, 30, prob), AStarSearch, EPEASearch, queries=15)
+
+    def test_weighted_matches_astarw(self) -> None:
+        random.seed(39)
+        for prob in (0.0, 0.2, 0.4):
+            self.check_against(generate_random_weighted_grid(25, 25, prob), AStarWSearch, EPEAWSearch, queries=10)
+
+    def test_heap_traffic_vs_plain_engines(self) -> None:
+        random.seed(40)
+        rows = []
+        engines = (
+            ("astar", "epea", generate_random_grid, AStarSearch, EPEASearch),
+            ("astarw", "epeaw", generate_random_weighted_grid, AStarWSearch, EPEAWSearch),
+        )
+        for plain_name, epea_name, generate, plain_cls, epea_cls in engines:
+            for n in tqdm([64, 128, 256], desc="Sizes", leave=False):
+                for prob in (0.0, 0.1, 0.3):
+                    grid = generate(n, n, prob)
+                    measures = defaultdict(list)
+                    for _ in range(5):
+                        start, goal = free_cell(grid), free_cell(grid)
+                        plain = plain_cls(grid, start, goal)
+                        plain.run()
+                        search = epea_cls(grid, start, goal)
+                        search.run()
+                        self.assertTrue(math.isclose(plain.cost, search.cost, rel_tol=1e-6, abs_tol=1e-6) or plain.cost == search.cost)
+                        measures[(plain_name, "pushes")].append(plain.counter + 1)
+                        measures[(plain_name, "peak_open")].append(peak_open_size(plain_cls(grid, start, goal)))
+                        measures[(plain_name, "time")].append(plain.elapsed_time)
+                        measures[(epea_name, "pushes")].append(search.pushes)
+                        measures[(epea_name, "peak_open")].append(search.peak_open)
+                        measures[(epea_name, "time")].append(search.elapsed_time)
+                    for (search_name, metric), values in measures.items():
+                        mean, ci95 = get_mean_and_ci95(values)
+                        rows.append({"search_name": search_name, "n": n, "prob": prob, "metric": metric, "mean": mean, "ci95": ci95})
+        save_rows(rows, "epea_vs_astar_heap_traffic")
+
+
+if __name__ == "__main__":
+    unittest.main()
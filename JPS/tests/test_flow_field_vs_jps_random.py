@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from tqdm import tqdm
+import math
+import random
+import time
+import unittest
+from collections import defaultdict
+from typing import List
+
+from pathfinding.astarw import astarw_search
+from pathfinding.flow_field import FlowFieldCache, compute_flow_field
+from pathfinding.grid import GridMap
+from pathfinding.heuristics import step_cost
+from pathfinding.jps import jump_point_search
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cells(grid, count: int) -> list:
+    cells = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+    return random.sample(cells, min(count, len(cells)))
+
+
+class FlowFieldTests(unittest.TestCase):
+    def assert_path_valid(self, grid, path, cost) -> None:
+        for (x, y), (nx, ny) in zip(path, path[1:]):
+            self.assertTrue(grid.valid_step(x, y, nx - x, ny - y))
+        if isinstance(grid, WeightedGridMap):
+            total = sum(grid.transition_cost(x, y, nx, ny) for (x, y), (nx, ny) in zip(path, path[1:]))
+        else:
+            total = sum(step_cost(nx - x, ny - y) for (x, y), (nx, ny) in zip(path, path[1:]))
+        self.assertTrue(math.isclose(total, cost, rel_tol=1e-6, abs_tol=1e-6))
+
+    def test_unweighted_matches_jps(self) -> None:
+        random.seed(31)
+        for trial in range(20):
+            grid = generate_random_grid(40, 40, random.choice([0.1, 0.25, 0.35]))
+            goal, *agents = free_cells(grid, 21)
+            field = compute_flow_field(grid, goal)
+            self.assertEqual(field.distance.shape, (grid.height, grid.width))
+            for agent in agents:
+                with self.subTest(trial=trial, agent=agent, goal=goal):
+                    _, cost_j, _, _ = jump_point_search(grid, agent, goal)
+                    path = field.path_from(agent)
+                    if math.isinf(cost_j):
+                        self.assertFalse(path)
+                        self.assertTrue(math.isinf(field.cost_from(agent)))
+                        continue
+                    self.assertEqual(path[0], agent)
+                    self.assertEqual(path[-1], goal)
+                    self.assertTrue(math.isclose(field.cost_from(agent), cost_j, rel_tol=1e-6, abs_tol=1e-6))
+                    self.assert_path_valid(grid, path, cost_j)
+
+    def test_weighted_matches_astarw(self) -> None:
+        random.seed(32)
+        for trial in range(10):
+            grid = generate_random_weighted_grid(30, 30, 0.2)
+            goal, *agents = free_cells(grid, 11)
+            field = compute_flow_field(grid, goal)
+            for agent in agents:
+                with self.subTest(trial=trial, agent=agent, goal=goal):
+                    _, cost_a, _, _ = astarw_search(grid, agent, goal)
+                    path = field.path_from(agent)
+                    if math.isinf(cost_a):
+                        self.assertFalse(path)
+                        continue
+                    self.assertTrue(math.isclose(field.cost_from(agent), cost_a, rel_tol=1e-6, abs_tol=1e-6))
+                    self.assert_path_valid(grid, path, cost_a)
+
+    def test_cache_evicts_least_recently_used(self) -> None:
+        grid = GridMap.from_ascii(["......", "..#...", "......"])
+        cache = FlowFieldCache(grid, capacity=2)
+        a, b, c = (0, 0), (5, 0), (5, 2)
+        field_a = cache.get(a)
+        cache.get(b)
+        self.assertIs(cache.get(a), field_a)
+        cache.get(c)
+        self.assertEqual(list(cache.fields), [a, c])
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        path, cost = cache.path((5, 2), a)
+        self.assertEqual(path[0], (5, 2))
+        self.assertEqual(path[-1], a)
+        self.assertTrue(math.isclose(cost, 3 + 2 * math.sqrt(2.0)))
+        cache.invalidate()
+        self.assertFalse(cache.fields)
+
+    def test_many_agents_one_goal_vs_jps(self) -> None:
+        random.seed(33)
+        rows = []
+        for n in tqdm([64, 128, 256], desc="Sizes", leave=False):
+            for agents_count in (1, 10, 100):
+                timings = defaultdict(list)
+                expanded = defaultdict(list)
+                for _ in range(3):
+                    grid = generate_random_grid(n, n, 0.2)
+                    goal, *agents = free_cells(grid, agents_count + 1)
+
+                    start_time = time.perf_counter()
+                    total_expanded = 0
+                    for agent in agents:
+                        _, _, exp, _ = jump_point_search(grid, agent, goal)
+                        total_expanded += exp
+                    timings["jps"].append(time.perf_counter() - start_time)
+                    expanded["jps"].append(total_expanded)
+
+                    start_time = time.perf_counter()
+                    field = compute_flow_field(grid, goal)
+                    for agent in agents:
+                        field.path_from(agent)
+                    timings["flow_field"].append(time.perf_counter() - start_time)
+                    expanded["flow_field"].append(field.expanded)
+                for search_name, times in timings.items():
+                    rows.append({
+                        "n": n,
+                        "agents": agents_count,
+                        "search_name": search_name,
+                        "mean_times": sum(times) / len(times),
+                        "mean_expanded": sum(expanded[search_name]) / len(times),
+                    })
+        save_rows(rows, "test_flow_field_vs_jps_random")
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import time
+import unittest
+from typing import Iterable, List
+from unittest import mock
+
+from pathfinding.astar import astar_search
+from pathfinding.astarw import astarw_search
+from pathfinding.grid import GridMap, ScenarioProblem, load_scenarios
+from pathfinding import hda
+from pathfinding.hda import hda_search
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import get_mean_and_ci95, save_rows
+
+
+MAPS_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "maps")
+
+SCEN_DIRS: List[str] = [
+    "maze-scen",
+    "random-scen",
+    "room-scen",
+]
+
+HARDEST_PROBLEMS = 5
+MAX_WORKERS = max(2, os.cpu_count() or 1)
+
+
+def _iter_scen_files() -> Iterable[str]:
+    for scen_dir in SCEN_DIRS:
+        full_dir = os.path.join(MAPS_ROOT, scen_dir)
+        if not os.path.isdir(full_dir):
+            continue
+        for name in sorted(os.listdir(full_dir)):
+            if name.lower().endswith(".scen"):
+                yield os.path.join(full_dir, name)
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+_real_worker = hda._hda_worker
+
+
+def _crashing_worker(rank: int, *args) -> None:
+    if rank == 1:
+        os._exit(3)
+    _real_worker(rank, *args)
+
+
+def _raising_successors(grid, x, y):
+    raise KeyError((x, y))
+
+
+class HDATests(unittest.TestCase):
+    def check_against(self, grid, reference, queries: int) -> None:
+        for i in range(queries):
+            start, goal = free_cell(grid), free_cell(grid)
+            workers = random.choice([1, 2, 3])
+            with self.subTest(i=i, start=start, goal=goal, workers=workers):
+                _, cost_ref, _, _ = reference(grid, start, goal)
+                path, cost, _, _ = hda_search(grid, start, goal, workers=workers, batch_size=random.choice([1, 16]))
+                if math.isinf(cost_ref):
+                    self.assertFalse(path)
+                    self.assertTrue(math.isinf(cost))
+                    continue
+                self.assertTrue(math.isclose(cost_ref, cost, rel_tol=1e-6, abs_tol=1e-6))
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], goal)
+                for (x, y), (nx, ny) in zip(path, path[1:]):
+                    self.assertTrue(grid.valid_step(x, y, nx - x, ny - y))
+
+    def test_unweighted_matches_astar(self) -> None:
+        random.seed(39)
+        self.check_against(generate_random_grid(30, 30, 0.3), astar_search, queries=8)
+
+    def test_weighted_matches_astarw(self) -> None:
+        random.seed(40)
+        self.check_against(generate_random_weighted_grid(25, 25, 0.2), astarw_search, queries=6)
+
+    def test_start_is_goal_and_arguments(self) -> None:
+        grid = GridMap.from_ascii(["...", ".#."])
+        self.assertEqual(hda_search(grid, (0, 0), (0, 0), workers=2)[:2], ([(0, 0)], 0.0))
+        with self.assertRaises(ValueError):
+            hda_search(grid, (0, 0), (2, 1), batch_size=0)
+
+    def test_failed_worker_is_reported(self) -> None:
+        grid = GridMap.from_ascii(["." * 20] * 20)
+        start_time = time.perf_counter()
+        with mock.patch.object(hda, "_hda_worker", _crashing_worker):
+            with self.assertRaisesRegex(RuntimeError, "worker 1 exited with code 3"):
+                hda_search(grid, (0, 0), (19, 19), workers=2)
+        with mock.patch.object(hda, "successors", _raising_successors):
+            with self.assertRaisesRegex(RuntimeError, "KeyError"):
+                hda_search(grid, (0, 0), (19, 19), workers=2)
+        self.assertLess(time.perf_counter() - start_time, hda.JOIN_TIMEOUT)
+
+    def test_scen_speedup_vs_cores(self) -> None:
+        problems: List[ScenarioProblem] = []
+        for scen_path in _iter_scen_files():
+            problems.extend(load_scenarios(scen_path)[-1:])
+        if not problems:
+            self.skipTest("MovingAI .scen sets are not available")
+        problems = sorted(problems, key=lambda p: p.optimal_length)[-HARDEST_PROBLEMS:]
+
+        rows = []
+        for prob in problems:
+            grid = GridMap.from_movingai_map(prob.map_path)
+            start, goal = (prob.start_x, prob.start_y), (prob.goal_x, prob.goal_y)
+            _, cost_ref, _, astar_time = astar_search(grid, start, goal)
+            for workers in range(1, MAX_WORKERS + 1):
+                times = []
+                for _ in range(3):
+                    _, cost, expanded, elapsed_time = hda_search(grid, start, goal, workers=workers)
+                    self.assertTrue(math.isclose(cost_ref, cost, rel_tol=1e-6, abs_tol=1e-6))
+                    times.append(elapsed_time)
+                mean, ci95 = get_mean_and_ci95(times)
+                rows.append({
+                    "map": os.path.basename(prob.map_path),
+                    "optimal_length": prob.optimal_length,
+                    "workers": workers,
+                    "astar_time": astar_time,
+                    "mean_time": mean,
+                    "ci95_time": ci95,
+                    "expanded": expanded,
+                    "speedup": astar_time / mean,
+                })
+        save_rows(rows, "hda_speedup_movingai_scens")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from tqdm import tqdm, trange
+import math
+import pickle
+import random
+import time
+import unittest
+from collections import defaultdict
+from typing import List, Tuple
+
+from pathfinding.astar import astar_search
+from pathfinding.dstar_lite import DStarLite
+from pathfinding.grid import GridMap
+from pathfinding.jps import jump_point_search
+from pathfinding.jps_plus import JumpTable, jump_point_search_plus
+
+from benchmarks.helpers import run_search, save_results
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def random_edits(grid: GridMap, count: int) -> List[Tuple[int, int, bool]]:
+    return [
+        (random.randrange(grid.width), random.randrange(grid.height), random.random() > 0.5)
+        for _ in range(count)
+    ]
+
+
+class JumpTableIncrementalTests(unittest.TestCase):
+    def assert_tables_equal(self, incremental: JumpTable, fresh: JumpTable, ctx: str) -> None:
+        for direction, table in fresh.tables.items():
+            self.assertEqual(list(incremental.tables[direction]), list(table), f"direction={direction} {ctx}")
+
+    def test_open_door(self) -> None:
+        rows = [
+            ".....#.....",
+            ".....#.....",
+            ".....#.....",
+            ".....#.....",
+        ]
+        grid = GridMap.from_ascii(rows)
+        table = JumpTable(grid)
+        start, goal = (0, 0), (10, 0)
+        path, cost, _, _ = jump_point_search_plus(table, start, goal)
+        self.assertFalse(path)
+        self.assertTrue(math.isinf(cost))
+
+        grid.set_walkable(5, 2, True)
+        table.update()
+        self.assert_tables_equal(table, JumpTable(grid), "after opening the door")
+        _, cost_a, _, _ = astar_search(grid, start, goal)
+        path, cost, _, _ = jump_point_search_plus(table, start, goal)
+        self.assertTrue(path)
+        self.assertTrue(math.isclose(cost, cost_a, rel_tol=1e-6, abs_tol=1e-6))
+
+    def test_table_and_planner_on_one_grid_both_see_edits(self) -> None:
+        random.seed(5)
+        for _ in range(10):
+            grid = generate_random_grid(16, 16, 0.2)
+            free = [(x, y) for y in range(16) for x in range(16) if grid.walkable[y][x]]
+            start, goal = random.sample(free, 2)
+            table = JumpTable(grid)
+            planner = DStarLite(grid, start, goal)
+            planner.plan()
+            for step in range(8):
+                grid.apply_edits([(x, y, w) for x, y, w in random_edits(grid, 4) if (x, y) not in (start, goal)])
+                # Either consumer may catch up first without hiding edits from the other.
+                if step % 2:
+                    table.update()
+                    path_d, cost_d, _, _ = planner.replan()
+                else:
+                    path_d, cost_d, _, _ = planner.replan()
+                    table.update()
+                self.assert_tables_equal(table, JumpTable(grid), f"step={step}")
+                _, cost_a, _, _ = astar_search(grid, start, goal)
+                self.assertEqual(math.isinf(cost_a), math.isinf(cost_d))
+                if not math.isinf(cost_a):
+                    self.assertTrue(math.isclose(cost_a, cost_d, rel_tol=1e-6, abs_tol=1e-6))
+        self.assertFalse(grid.subscribe_edits().take())
+        self.assertEqual(pickle.loads(pickle.dumps(grid)), grid)
+
+    def test_random_edit_sequences_match_full_rebuild(self) -> None:
+        random.seed(3)
+        for _ in trange(40, desc="Grids", leave=False):
+            n = random.choice((5, 8, 13, 21))
+            grid = generate_random_grid(n, n, block_prob=random.choice((0.1, 0.25, 0.4)))
+            table = JumpTable(grid)
+            for step in range(15):
+                grid.apply_edits(random_edits(grid, random.randint(1, 6)))
+                table.update()
+                self.assert_tables_equal(table, JumpTable(grid), f"n={n} step={step}")
+
+                free = [(x, y) for y in range(n) for x in range(n) if grid.walkable[y][x]]
+                if len(free) < 2:
+                    continue
+                for _ in range(3):
+                    start, goal = random.sample(free, 2)
+                    _, cost_a, _, _ = astar_search(grid, start, goal)
+                    path_p, cost_p, _, _ = jump_point_search_plus(table, start, goal)
+                    if math.isinf(cost_a):
+                        self.assertFalse(path_p)
+                    else:
+                        self.assertTrue(math.isclose(cost_a, cost_p, rel_tol=1e-6, abs_tol=1e-6))
+
+    def test_update_cost_vs_rebuild(self) -> None:
+        random.seed(4)
+        elapsed_times = defaultdict(list)
+        expanded_nodes = defaultdict(list)
+        for n in tqdm((64, 128, 256), desc="n", leave=False):
+            grid = generate_random_grid(n, n, block_prob=0.2)
+            table = JumpTable(grid)
+            for _ in trange(10, desc="Edits", leave=False):
+                grid.apply_edits(random_edits(grid, 1))
+                key = f"jps_plus_update | n={n}"
+                update_start = time.perf_counter()
+                touched = table.update()
+                elapsed_times[key].append(time.perf_counter() - update_start)
+                expanded_nodes[key].append(touched)
+
+                key = f"jps_plus_rebuild | n={n}"
+                rebuild_start = time.perf_counter()
+                JumpTable(grid)
+                elapsed_times[key].append(time.perf_counter() - rebuild_start)
+                expanded_nodes[key].append(8 * n * n)
+
+                free = [(x, y) for y in range(n) for x in range(n) if grid.walkable[y][x]]
+                start, goal = random.sample(free, 2)
+                _, cost_j = run_search(jump_point_search, "jps", grid, start, goal, elapsed_times, expanded_nodes, n=n)
+                _, cost_p = run_search(lambda _, s, g: jump_point_search_plus(table, s, g), "jps_plus", grid, start, goal, elapsed_times, expanded_nodes, n=n)
+                if math.isinf(cost_j):
+                    self.assertTrue(math.isinf(cost_p))
+                else:
+                    self.assertTrue(math.isclose(cost_j, cost_p, rel_tol=1e-6, abs_tol=1e-6))
+        save_results(elapsed_times, expanded_nodes, "jps_plus_incremental_updates")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,10 +11,11 @@ from collections import defaultdict
 from typing import List, Tuple
 
 from pathfinding.astar import astar_search
+from pathfinding.fringe import fringe_search
 from pathfinding.grid import GridMap
 from pathfinding.jps import jump_point_search
 
-from benchmarks.helpers import run_search, save_results
+from benchmarks.helpers import run_search, run_search_memory, save_memory_scaling, save_results
 
 
 def generate_random_grid(width: int, height: int, block_prob: float) -> Tuple[GridMap, List[str]]:
@@ -36,10 +37,11 @@ def pick_random_free_cells(grid: GridMap, k: int) -> List[Tuple[int, int]]:
 
 
 class JPSRandomTests(unittest.TestCase):
-    def base_test_random_grids_jps_matches_astar(self, probs, ns, num_samples, num_trials, name) -> None:
+    def base_test_random_grids_jps_matches_astar(self, probs, ns, num_samples, num_trials, name, memory_samples) -> None:
         random.seed(0)
         elapsed_times = defaultdict(list)
         expanded_nodes = defaultdict(list)
+        memory_usage = defaultdict(list)
         for prob in tqdm(probs, desc="Probs", leave=False):
             for n in tqdm(ns, desc="n", leave=False):
                 for _ in trange(num_trials, desc="Trials", leave=False):
@@ -53,16 +55,28 @@ class JPSRandomTests(unittest.TestCase):
                     pairs = []
                     for i in range(0, len(samples) - 1, 2):
                         pairs.append((samples[i], samples[i + 1]))
-                    for start, goal in tqdm(pairs[:num_samples], desc="Samples", leave=False):
+                    for query_index, (start, goal) in enumerate(tqdm(pairs[:num_samples], desc="Samples", leave=False)):
                         path_a, cost_a = run_search(astar_search, "astar", grid, start, goal, elapsed_times, expanded_nodes, prob=prob, n=n)
                         path_j, cost_j = run_search(jump_point_search, "jps", grid, start, goal, elapsed_times, expanded_nodes, prob=prob, n=n)
+                        path_f, cost_f = run_search(fringe_search, "fringe", grid, start, goal, elapsed_times, expanded_nodes, prob=prob, n=n)
+                        # tracemalloc slows searches 5-10 times, so only the first
+                        # memory_samples queries of a trial are measured.
+                        if query_index < memory_samples:
+                            for search_func, search_name, cost in ((astar_search, "astar", cost_a), (jump_point_search, "jps", cost_j), (fringe_search, "fringe", cost_f)):
+                                _, cost_m = run_search_memory(search_func, search_name, grid, start, goal, memory_usage, prob=prob, n=n)
+                                self.assertEqual(cost_m, cost)
+                        self.assertEqual(bool(path_a), bool(path_f), "Fringe Search and A* disagree on reachability")
+                        if path_a:
+                            self.assertTrue(math.isclose(cost_a, cost_f, rel_tol=1e-6, abs_tol=1e-6))
                         if not path_a:
                             self.assertFalse(path_j, "JPS found a path where A* did not")
                             self.assertTrue(math.isinf(cost_j))
                         else:
                             self.assertTrue(path_j, "JPS failed to find a path that A* found")
                             self.assertTrue(math.isclose(cost_a, cost_j, rel_tol=1e-6, abs_tol=1e-6))
-        save_results(elapsed_times, expanded_nodes, name)
+        save_results(elapsed_times, expanded_nodes, name, memory_usage)
+        if memory_usage:
+            save_memory_scaling(memory_usage, name)
 
     def test_random_small(self) -> None:
         self.base_test_random_grids_jps_matches_astar(
@@ -71,6 +85,17 @@ class JPSRandomTests(unittest.TestCase):
             num_trials=10,
             num_samples=10,
             name="jps_vs_astar_random_small",
+            memory_samples=10,
+        )
+
+    def test_random_memory_scaling(self) -> None:
+        self.base_test_random_grids_jps_matches_astar(
+            probs=(0.1, 0.25),
+            ns=(32, 64, 128),
+            num_trials=5,
+            num_samples=2,
+            name="jps_vs_astar_random_memory",
+            memory_samples=2,
         )
 
     def test_random_large(self) -> None:
@@ -80,6 +105,7 @@ class JPSRandomTests(unittest.TestCase):
             num_trials=10,
             num_samples=10,
             name="jps_vs_astar_random_large",
+            memory_samples=0,
         )
 
 
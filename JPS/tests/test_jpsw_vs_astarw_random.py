@@ -8,6 +8,7 @@ from collections import defaultdict
 from typing import List, Tuple
 
 from pathfinding.astarw import astarw_search
+from pathfinding.fringe import fringe_search_weighted
 from pathfinding.jpsw import jump_point_search_weighted
 from pathfinding.weighted_grid import WeightedGridMap
 
@@ -66,6 +67,14 @@ class JPSWRandomTests(unittest.TestCase):
                     for start, goal in tqdm(pairs, desc="Samples", leave=False):
                         path_a, cost_a = run_search(astarw_search, "astarw", grid, start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
                         path_j, cost_j = run_search(jump_point_search_weighted, "jpsw", grid, start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        path_f, cost_f = run_search(fringe_search_weighted, "fringew", grid, start, goal, elapsed_times, expanded_nodes, n=n, prob=prob)
+                        self.assertEqual(bool(path_a), bool(path_f), "Fringe Search and A*W disagree on reachability")
+                        if path_a:
+                            self.assertTrue(
+                                math.isclose(cost_a, cost_f, rel_tol=1e-6, abs_tol=1e-6),
+                                msg=f"Costs differ on size={n}, start={start}, goal={goal}: "
+                                    f"A*W={cost_a}, Fringe={cost_f}",
+                            )
                         if not path_a:
                             self.assertFalse(path_j, "JPSW found a path where A*W did not")
                             self.assertTrue(math.isinf(cost_j))
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from tqdm import tqdm
+import math
+import random
+import time
+import unittest
+from collections import defaultdict
+from typing import List
+
+from pathfinding.astar import astar_search
+from pathfinding.astarw import astarw_search
+from pathfinding.flow_field import compute_flow_field
+from pathfinding.grid import GridMap
+from pathfinding.lss_lrta import MOVES_PER_CELL, LearnedHeuristic, LssLrtaAgent, lss_lrta_search
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import get_mean_and_ci95, save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+class LssLrtaTests(unittest.TestCase):
+    def check_trials(self, grid, optimal_search, queries: int) -> None:
+        for i in range(queries):
+            start, goal = free_cell(grid), free_cell(grid)
+            _, cost_opt, _, _ = optimal_search(grid, start, goal)
+            heuristic = LearnedHeuristic(grid, goal)
+            distance = compute_flow_field(grid, goal).distance
+            for trial in range(3):
+                lookahead = random.choice([1, 8, 32])
+                with self.subTest(i=i, trial=trial, lookahead=lookahead):
+                    path, cost, _, _ = lss_lrta_search(grid, start, goal, heuristic=heuristic, lookahead=lookahead)
+                    if math.isinf(cost_opt):
+                        self.assertFalse(path)
+                        self.assertTrue(math.isinf(cost))
+                        continue
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], goal)
+                    for (x, y), (nx, ny) in zip(path, path[1:]):
+                        self.assertTrue(grid.valid_step(x, y, nx - x, ny - y))
+                    self.assertGreaterEqual(cost, cost_opt - 1e-6)
+                    # Learning must keep the heuristic admissible on solvable cells.
+                    for y in range(grid.height):
+                        for x in range(grid.width):
+                            if math.isfinite(distance[y, x]):
+                                self.assertLessEqual(heuristic((x, y)), distance[y, x] + 1e-6)
+
+    def test_unweighted_trials(self) -> None:
+        random.seed(36)
+        self.check_trials(generate_random_grid(24, 24, 0.3), astar_search, queries=6)
+
+    def test_weighted_trials(self) -> None:
+        random.seed(37)
+        self.check_trials(generate_random_weighted_grid(20, 20, 0.2), astarw_search, queries=4)
+
+    def test_argument_checks(self) -> None:
+        grid = GridMap.from_ascii(["...", "..."])
+        other = GridMap.from_ascii(["...", "..."])
+        with self.assertRaises(ValueError):
+            LssLrtaAgent(grid, (0, 0), (2, 1), lookahead=0)
+        with self.assertRaises(ValueError):
+            LssLrtaAgent(grid, (0, 0), (2, 1), heuristic=LearnedHeuristic(other, (2, 1)))
+        agent = LssLrtaAgent(grid, (0, 0), (2, 1), lookahead=1)
+        self.assertTrue(agent.move())
+        self.assertEqual(len(agent.move_times), 1)
+
+    def test_move_budget_bounds_unreachable_goals(self) -> None:
+        # The goal is walled in; lookahead 1 takes ~80k moves to raise h past
+        # cost_limit on this map.
+        rows = [list("." * 16) for _ in range(16)]
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                if dx or dy:
+                    rows[14 + dy][14 + dx] = "#"
+        grid = GridMap.from_ascii(["".join(row) for row in rows])
+        start_time = time.perf_counter()
+        path, cost, expanded, _ = lss_lrta_search(grid, (0, 0), (14, 14), lookahead=1)
+        self.assertFalse(path)
+        self.assertTrue(math.isinf(cost))
+        self.assertLessEqual(expanded, MOVES_PER_CELL * 16 * 16)
+        self.assertLess(time.perf_counter() - start_time, 5.0)
+
+        open_grid = GridMap.from_ascii(["." * 16] * 16)
+        self.assertEqual(lss_lrta_search(open_grid, (0, 0), (15, 15), lookahead=1, max_moves=3)[:2], ([], math.inf))
+        self.assertTrue(lss_lrta_search(open_grid, (0, 0), (15, 15), lookahead=1)[0])
+        with self.assertRaises(ValueError):
+            lss_lrta_search(open_grid, (0, 0), (15, 15), max_moves=0)
+
+    def test_first_move_latency_vs_astar(self) -> None:
+        random.seed(38)
+        rows = []
+        for n in tqdm([64, 128, 256], desc="Sizes", leave=False):
+            grid = generate_random_grid(n, n, 0.2)
+            measures = defaultdict(list)
+            for _ in range(5):
+                start, goal = free_cell(grid), free_cell(grid)
+                _, cost_opt, _, astar_time = astar_search(grid, start, goal)
+                if math.isinf(cost_opt) or cost_opt == 0:
+                    continue
+                measures["astar_time"].append(astar_time)
+                for lookahead in (8, 64):
+                    heuristic = LearnedHeuristic(grid, goal)
+                    for trial in range(3):
+                        agent = LssLrtaAgent(grid, start, goal, heuristic=heuristic, lookahead=lookahead)
+                        agent.run()
+                        key = f"lss_lrta_{lookahead}_trial{trial}"
+                        measures[f"{key}_first_move"].append(agent.move_times[0])
+                        measures[f"{key}_max_move"].append(max(agent.move_times))
+                        measures[f"{key}_cost_ratio"].append(agent.cost / cost_opt)
+            for key, values in measures.items():
+                mean, ci95 = get_mean_and_ci95(values)
+                rows.append({"n": n, "metric": key, "mean": mean, "ci95": ci95})
+        save_rows(rows, "lss_lrta_vs_astar_random")
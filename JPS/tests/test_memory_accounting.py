@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import math
+import random
+import sys
+import unittest
+from collections import defaultdict
+
+from pathfinding.astar import astar_search
+from pathfinding.engines import SEARCH_ENGINES, WEIGHTED_ENGINES
+from pathfinding.fringe import fringe_search
+from pathfinding.grid import GridMap
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import memory_columns, run_search_memory
+from benchmarks.memory import MemoryUsage, deep_sizeof, measure_memory, scaling_exponent
+
+WEIGHTS = {".": 1.0, ",": 3.0}
+
+
+def random_rows(rng: random.Random, n: int, block_prob: float):
+    return ["".join("#" if rng.random() < block_prob else rng.choice("..,") for _ in range(n)) for _ in range(n)]
+
+
+class MemoryAccountingTests(unittest.TestCase):
+    def test_deep_sizeof_counts_shared_objects_once(self) -> None:
+        cell = (1000, 2000)
+        shared = {cell: cell}
+        self.assertEqual(deep_sizeof(shared), sys.getsizeof(shared) + deep_sizeof(cell))
+        seen = set()
+        a, b = [cell], [cell]
+        self.assertGreater(deep_sizeof(a, seen), sys.getsizeof(a))
+        self.assertEqual(deep_sizeof(b, seen), sys.getsizeof(b))
+
+    def test_measured_runs_match_plain_runs(self) -> None:
+        rng = random.Random(0)
+        rows = random_rows(rng, 24, 0.2)
+        grid, wgrid = GridMap.from_ascii(rows), WeightedGridMap.from_ascii(rows, WEIGHTS)
+        free = [(x, y) for y in range(24) for x in range(24) if rows[y][x] != "#"]
+        for _ in range(5):
+            start, goal = rng.choice(free), rng.choice(free)
+            for name, search in SEARCH_ENGINES.items():
+                g = wgrid if name in WEIGHTED_ENGINES else grid
+                path, cost, expanded, _ = search(g, start, goal)
+                (path_m, cost_m, expanded_m, _), usage = measure_memory(search, g, start, goal)
+                self.assertEqual((path_m, expanded_m), (path, expanded), name)
+                self.assertTrue(math.isclose(cost_m, cost) or cost_m == cost == math.inf, name)
+                self.assertEqual(usage.expanded, expanded)
+                self.assertGreater(usage.peak_bytes, 0, name)
+                self.assertGreaterEqual(usage.peak_bytes, usage.retained_bytes, name)
+
+    def test_structures_are_sized_for_stepwise_engines(self) -> None:
+        grid = GridMap.from_ascii(["." * 16] * 16)
+        _, usage = measure_memory(astar_search, grid, (0, 0), (15, 12))
+        self.assertTrue({"open_heap", "g_scores", "closed", "parent_map"} <= set(usage.structure_bytes))
+        self.assertNotIn("path", usage.structure_bytes)
+        self.assertGreater(usage.structures_total, 0)
+        _, usage = measure_memory(fringe_search, grid, (0, 0), (15, 12))
+        self.assertEqual(usage.structure_bytes, {})
+
+    def test_bytes_per_expanded(self) -> None:
+        self.assertEqual(MemoryUsage(peak_bytes=1000, retained_bytes=0, expanded=4).bytes_per_expanded, 250.0)
+        self.assertEqual(MemoryUsage(peak_bytes=1000, retained_bytes=0, expanded=0).bytes_per_expanded, 1000.0)
+
+    def test_scaling_exponent(self) -> None:
+        self.assertAlmostEqual(scaling_exponent([8, 16, 32], [3 * s ** 2 for s in (8, 16, 32)]), 2.0)
+        self.assertTrue(math.isnan(scaling_exponent([8, 8], [1.0, 2.0])))
+
+    def test_memory_columns(self) -> None:
+        grid = GridMap.from_ascii(["." * 12] * 12)
+        memory_usage = defaultdict(list)
+        for goal in ((11, 11), (11, 0), (0, 11)):
+            run_search_memory(astar_search, "astar", grid, (0, 0), goal, memory_usage, n=12)
+        [(key, usages)] = memory_usage.items()
+        self.assertEqual(key, "astar | n=12")
+        columns = memory_columns(usages)
+        self.assertEqual(
+            set(columns),
+            {f"{s}_{m}" for s in ("mean", "ci95") for m in ("peak_bytes", "structure_bytes", "bytes_per_expanded")},
+        )
+        self.assertGreater(columns["mean_bytes_per_expanded"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
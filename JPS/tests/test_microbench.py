@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import cli
+from benchmarks.micro import CASES, MicroResult, load_baseline, measure_cases, reject_outliers, save_baseline
+
+
+class MicrobenchTests(unittest.TestCase):
+    def test_reject_outliers(self) -> None:
+        kept, outliers = reject_outliers([10.0, 10.5, 9.8, 10.2, 10.1, 55.0])
+        self.assertEqual(outliers, 1)
+        self.assertNotIn(55.0, kept)
+
+    def test_every_case_runs(self) -> None:
+        results = measure_cases(list(CASES), samples=2, min_time=0.001)
+        self.assertEqual(set(results), set(CASES))
+        for name, values in results.items():
+            self.assertEqual(len(values), 2)
+            self.assertTrue(all(v >= 0.0 for v in values), name)
+        self.assertGreater(max(results["jpsw.prune_neighbors_weighted"]), max(results["grid.valid_step"]))
+
+    def test_baseline_is_per_machine(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            save_baseline(path, "m1", [MicroResult("grid.valid_step", 100.0, 101.0, 1.0, 99.0, 5, 0)], "abc")
+            save_baseline(path, "m2", [MicroResult("grid.valid_step", 200.0, 201.0, 1.0, 199.0, 5, 0)], "abc")
+            self.assertEqual(load_baseline(path, "m1"), {"grid.valid_step": 100.0})
+            self.assertEqual(load_baseline(path, "m2"), {"grid.valid_step": 200.0})
+            self.assertEqual(load_baseline(path, "m3"), {})
+
+    def test_micro_command_compares_with_baseline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "baseline.json")
+            out = os.path.join(tmp, "micro.json")
+            args = ["micro", "-c", "heuristics.octile_distance", "--processes", "1", "--samples", "2",
+                    "--min-time", "0.001", "--baseline", path]
+            result = CliRunner().invoke(cli, args + ["--save-baseline"])
+            self.assertEqual(result.exit_code, 0, result.output)
+            result = CliRunner().invoke(cli, args + ["-o", out])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertIn("baseline=", result.output)
+            with open(out, "r", encoding="utf-8") as f:
+                report = json.load(f)
+            self.assertIsNotNone(report["results"][0]["ratio"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,7 @@ from typing import Union, Literal
 import random
 
 from pathfinding.astar import astar_search
+from pathfinding.fringe import fringe_search
 from pathfinding.grid import GridMap, load_scenarios
 from pathfinding.jps import jump_point_search
 
@@ -77,6 +78,18 @@ class MovingAIScenBenchmarkTests(unittest.TestCase):
                     n = grid.height
                     path_a, cost_a = run_search(astar_search, "astar", grid, start, goal, elapsed_times, expanded_nodes, n=n, scen_dir=scen_dir)
                     path_j, cost_j = run_search(jump_point_search, "jps", grid, start, goal, elapsed_times, expanded_nodes, n=n, scen_dir=scen_dir)
+                    path_f, cost_f = run_search(fringe_search, "fringe", grid, start, goal, elapsed_times, expanded_nodes, n=n, scen_dir=scen_dir)
+                    self.assertEqual(
+                        bool(path_a),
+                        bool(path_f),
+                        f"Fringe Search и A* расходятся в достижимости ({scen_path}, index={idx})",
+                    )
+                    if path_a:
+                        self.assertTrue(
+                            math.isclose(cost_a, cost_f, rel_tol=1e-6, abs_tol=1e-6),
+                            f"Fringe Search дал другую стоимость: A*={cost_a}, Fringe={cost_f} "
+                            f"({scen_path}, index={idx})",
+                        )
                     if not path_a:
                         self.assertFalse(
                             path_j,
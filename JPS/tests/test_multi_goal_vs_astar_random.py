@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from tqdm import tqdm
+import math
+import random
+import time
+import unittest
+from collections import defaultdict
+from typing import List
+
+from pathfinding.engines import get_engine
+from pathfinding.grid import GridMap
+from pathfinding.multi_goal import all_goals_search, nearest_goal_search
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cells(grid, count: int) -> list:
+    cells = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+    return random.sample(cells, min(count, len(cells)))
+
+
+def close(a: float, b: float) -> bool:
+    return a == b or math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-6)
+
+
+class MultiGoalTests(unittest.TestCase):
+    def check_against_independent(self, grid, algorithm: str, trials: int, goals_count: int) -> None:
+        search, _ = get_engine(algorithm)
+        for trial in range(trials):
+            start, *goals = free_cells(grid, goals_count + 1)
+            costs = {goal: search(grid, start, goal)[1] for goal in goals}
+            best = min(costs.values())
+
+            with self.subTest(algorithm=algorithm, trial=trial, mode="nearest"):
+                path, cost, _, _ = nearest_goal_search(grid, start, goals, algorithm)
+                self.assertTrue(close(cost, best))
+                if path:
+                    self.assertEqual(path[0], start)
+                    self.assertIn(path[-1], goals)
+                    self.assertTrue(close(costs[path[-1]], best))
+
+            with self.subTest(algorithm=algorithm, trial=trial, mode="all"):
+                paths, all_costs, _, _ = all_goals_search(grid, start, goals, algorithm)
+                self.assertEqual(set(paths), set(goals))
+                for goal in goals:
+                    self.assertTrue(close(all_costs[goal], costs[goal]), f"goal={goal}")
+                    if paths[goal]:
+                        self.assertEqual(paths[goal][0], start)
+                        self.assertEqual(paths[goal][-1], goal)
+
+    def test_unweighted_engines(self) -> None:
+        random.seed(32)
+        for block_prob in (0.1, 0.3):
+            grid = generate_random_grid(40, 40, block_prob)
+            for algorithm in ("astar", "jps"):
+                self.check_against_independent(grid, algorithm, trials=8, goals_count=8)
+
+    def test_weighted_engines(self) -> None:
+        random.seed(33)
+        grid = generate_random_weighted_grid(24, 24, 0.15)
+        for algorithm in ("astarw", "jpsw"):
+            self.check_against_independent(grid, algorithm, trials=5, goals_count=6)
+
+    def test_errors_and_edge_cases(self) -> None:
+        grid = GridMap.from_ascii(["...", ".#.", "..."])
+        path, cost, _, _ = nearest_goal_search(grid, (0, 0), [(0, 0), (2, 2)], "astar")
+        self.assertEqual((path, cost), ([(0, 0)], 0.0))
+        paths, costs, _, _ = all_goals_search(grid, (0, 0), [(1, 1), (2, 0)], "jps")
+        self.assertEqual(paths[(1, 1)], [])
+        self.assertTrue(math.isinf(costs[(1, 1)]))
+        self.assertEqual(costs[(2, 0)], 2.0)
+        with self.assertRaises(ValueError):
+            nearest_goal_search(grid, (0, 0), [], "astar")
+        with self.assertRaises(ValueError):
+            nearest_goal_search(grid, (0, 0), [(2, 2)], "astarw")
+        with self.assertRaises(ValueError):
+            nearest_goal_search(grid, (0, 0), [(2, 2)], "dijkstra")
+
+    def test_speedup_vs_independent_calls(self) -> None:
+        random.seed(34)
+        rows = []
+        for algorithm in tqdm(("astar", "jps"), desc="Algorithms", leave=False):
+            search, _ = get_engine(algorithm)
+            for goals_count in (5, 20, 50):
+                timings = defaultdict(list)
+                expanded = defaultdict(list)
+                for _ in range(3):
+                    grid = generate_random_grid(96, 96, 0.2)
+                    start, *goals = free_cells(grid, goals_count + 1)
+
+                    start_time = time.perf_counter()
+                    results = [search(grid, start, goal) for goal in goals]
+                    timings["independent"].append(time.perf_counter() - start_time)
+                    expanded["independent"].append(sum(r[2] for r in results))
+
+                    _, _, exp, elapsed_time = nearest_goal_search(grid, start, goals, algorithm)
+                    timings["nearest"].append(elapsed_time)
+                    expanded["nearest"].append(exp)
+
+                    _, _, exp, elapsed_time = all_goals_search(grid, start, goals, algorithm)
+                    timings["all"].append(elapsed_time)
+                    expanded["all"].append(exp)
+                for mode, times in timings.items():
+                    rows.append({
+                        "search_name": algorithm,
+                        "goals": goals_count,
+                        "mode": mode,
+                        "mean_times": sum(times) / len(times),
+                        "mean_expanded": sum(expanded[mode]) / len(times),
+                    })
+        save_rows(rows, "test_multi_goal_vs_independent")
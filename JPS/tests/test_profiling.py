@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from pathfinding import cli
+from pathfinding.astar import astar_search
+from pathfinding.grid import GridMap
+from pathfinding.jps import jump_point_search
+from pathfinding.profiling import SamplingProfiler, format_top, profile_search, repeat_search
+
+from benchmarks.generators import write_map_set
+
+OPEN_ROWS = ["." * 48] * 48
+
+
+def busy(seconds: float) -> int:
+    count = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        count += 1
+    return count
+
+
+class ProfilingTests(unittest.TestCase):
+    def test_repeat_search_aggregates_runs(self) -> None:
+        grid = GridMap.from_ascii(OPEN_ROWS)
+        path, cost, expanded, _ = jump_point_search(grid, (0, 0), (47, 30))
+        run = repeat_search(jump_point_search, grid, (0, 0), (47, 30), 4)
+        self.assertEqual(len(run.times), 4)
+        self.assertEqual(run.result[:3], (path, cost, expanded))
+        self.assertEqual(run.stats["expanded"], expanded)
+        self.assertGreater(run.stats["jump_calls"], 0)
+        self.assertLessEqual(min(run.times), run.median_time)
+        with self.assertRaises(ValueError):
+            repeat_search(jump_point_search, grid, (0, 0), (47, 30), 0)
+
+    def test_sampler_stacks_start_at_profiled_code(self) -> None:
+        with SamplingProfiler(0.001) as sampler:
+            busy(0.2)
+        self.assertGreater(sum(sampler.samples.values()), 10)
+        for stack in sampler.samples:
+            self.assertTrue(stack.startswith("busy (test_profiling.py:"), stack)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "busy.folded")
+            sampler.write_folded(path)
+            with open(path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        self.assertEqual(len(lines), len(sampler.samples))
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertEqual(sampler.samples[stack], int(count))
+
+    def test_profile_search_writes_both_outputs(self) -> None:
+        grid = GridMap.from_ascii(OPEN_ROWS)
+        with tempfile.TemporaryDirectory() as tmp:
+            pstats_path, folded_path, profile = profile_search(
+                astar_search, grid, (0, 0), (47, 47), 2, os.path.join(tmp, "out", "astar")
+            )
+            self.assertEqual(pstats_path, os.path.join(tmp, "out", "astar.pstats"))
+            loaded = pstats.Stats(pstats_path)
+            self.assertTrue(any(func[2] == "astar_search" for func in loaded.stats))  # type: ignore[attr-defined]
+            self.assertTrue(os.path.isfile(folded_path))
+        self.assertIn("valid_step", format_top(profile, limit=50))
+
+    def test_cli_profiles_a_scenario_index(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            scen_path = write_map_set(tmp, "random", 64, 0.1, 0, 4)
+            prefix = os.path.join(tmp, "jps")
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                code = cli.main(["--scenario", scen_path, "--index", "1", "--algorithm", "jps", "--repeat", "3", "--profile", prefix])
+            self.assertEqual(code, 0)
+            text = out.getvalue()
+            self.assertIn("mean of 3 runs", text)
+            self.assertIn("jump_calls=", text)
+            self.assertIn("Phases: setup", text)
+            self.assertIn("(match, error", text)
+            self.assertTrue(os.path.isfile(prefix + ".pstats"))
+            self.assertTrue(os.path.isfile(prefix + ".folded"))
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(cli.main(["--scenario", scen_path, "--repeat", "0"]), 1)
+                self.assertEqual(cli.main(["--scenario", scen_path, "--repeat", "2", "--epsilon", "0.5"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
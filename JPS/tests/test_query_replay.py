@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from benchmarks.__main__ import cli
+from benchmarks.replay import LoggedQuery, latency_histogram, read_query_log, replay, write_query_log
+from pathfinding.engines import get_engine
+from pathfinding.grid import GridMap
+from pathfinding.weighted_grid import WeightedGridMap
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "maps", "example")
+GRID_MAP = os.path.join(EXAMPLE_DIR, "grid.map")
+WEIGHTED_MAP = os.path.join(EXAMPLE_DIR, "weighted_grid.map")
+
+
+class QueryReplayTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        grid = GridMap.from_movingai_map(GRID_MAP)
+        free = [(x, y) for y in range(grid.height) for x in range(grid.width) if grid.is_walkable(x, y)]
+        self.queries = [
+            LoggedQuery(GRID_MAP, free[0], free[-1], "jps", 100.0),
+            LoggedQuery(GRID_MAP, free[1], free[len(free) // 2], "astar", 100.05),
+            LoggedQuery(WEIGHTED_MAP, (0, 0), (0, 7), "astarw", 100.1),
+        ]
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def write_log(self, lines) -> str:
+        path = os.path.join(self.tmp.name, "queries.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(line) for line in lines) + "\n")
+        return path
+
+    def test_log_round_trip_and_parsing(self) -> None:
+        path = os.path.join(self.tmp.name, "round_trip.jsonl")
+        write_query_log(path, self.queries)
+        self.assertEqual(read_query_log(path), self.queries)
+        path = self.write_log([
+            {"map": "b.map", "start": [1, 2], "goal": [3, 4], "timestamp": "2025-01-01T00:00:01Z"},
+            {"map": "a.map", "start": [0, 0], "goal": [5, 5], "algorithm": "jps", "timestamp": "2025-01-01T00:00:00+00:00"},
+        ])
+        queries = read_query_log(path, map_dir="/data/maps")
+        self.assertEqual([q.map_path for q in queries], ["/data/maps/a.map", "/data/maps/b.map"])
+        self.assertEqual(queries[1].timestamp - queries[0].timestamp, 1.0)
+        self.assertIsNone(queries[1].algorithm)
+        self.assertEqual(read_query_log(path)[0].map_path, os.path.join(self.tmp.name, "a.map"))
+        for bad in ({"map": "a.map", "start": [0], "goal": [1, 1], "timestamp": 0}, {"map": "a.map", "start": [0, 0], "goal": [1, 1]}):
+            with self.assertRaisesRegex(ValueError, ":2: invalid query record"):
+                read_query_log(self.write_log([{"map": "a.map", "start": [0, 0], "goal": [1, 1], "timestamp": 0}, bad]))
+
+    def test_replay_matches_direct_searches(self) -> None:
+        for concurrency in (1, 2):
+            with self.subTest(concurrency=concurrency):
+                results, wall_time = replay(self.queries, concurrency=concurrency)
+                self.assertEqual([r.index for r in results], [0, 1, 2])
+                self.assertGreater(wall_time, 0.0)
+                for q, r in zip(self.queries, results):
+                    self.assertEqual(r.engine, q.algorithm)
+                    self.assertGreaterEqual(r.latency, 0.0)
+                    search, weighted = get_engine(q.algorithm)  # type: ignore[arg-type]
+                    grid = WeightedGridMap.from_movingai_map(q.map_path) if weighted else GridMap.from_movingai_map(q.map_path)
+                    _, cost, expanded, _ = search(grid, q.start, q.goal)
+                    self.assertTrue(math.isclose(r.cost, cost))
+                    self.assertEqual(r.expanded, expanded)
+
+    def test_engine_override_and_original_timing(self) -> None:
+        queries = self.queries[:2]
+        results, _ = replay(queries, engine="astar")
+        self.assertEqual({r.engine for r in results}, {"astar"})
+        _, wall_time = replay(queries, engine="astar", timing="original")
+        self.assertGreaterEqual(wall_time, 0.05)
+        _, fast = replay(queries, engine="astar", timing="original", speed=100.0)
+        self.assertLess(fast, wall_time)
+        with self.assertRaisesRegex(ValueError, "no algorithm"):
+            replay([LoggedQuery(GRID_MAP, (1, 1), (1, 7), None, 0.0)])
+        with self.assertRaises(ValueError):
+            replay(queries, timing="poisson")
+
+    def test_latency_histogram(self) -> None:
+        latencies = [0.001, 0.002, 0.004, 0.008, 0.1]
+        histogram = latency_histogram(latencies, bins=4)
+        self.assertEqual(len(histogram), 4)
+        self.assertEqual(sum(count for _, _, count in histogram), len(latencies))
+        self.assertAlmostEqual(histogram[0][0], 0.001)
+        self.assertAlmostEqual(histogram[-1][1], 0.1)
+        self.assertEqual(sum(count for _, _, count in latency_histogram([0.5, 0.5], bins=3)), 2)
+        self.assertEqual(latency_histogram([]), [])
+
+    def test_cli_replay_writes_report(self) -> None:
+        log_path = os.path.join(self.tmp.name, "log.jsonl")
+        write_query_log(log_path, self.queries)
+        out_path = os.path.join(self.tmp.name, "replay.json")
+        result = CliRunner().invoke(cli, ["replay", log_path, "--bins", "4", "--per-query", "-o", out_path])
+        self.assertEqual(result.exit_code, 0, result.output)
+        with open(out_path, encoding="utf-8") as f:
+            report = json.load(f)
+        summary = report["summary"]
+        self.assertEqual(summary["queries"], 3)
+        self.assertEqual(sum(b["count"] for b in summary["histogram"]), 3)
+        self.assertLessEqual(summary["latency"]["p50"], summary["latency"]["max"])
+        self.assertEqual(summary["engines"], ["astar", "astarw", "jps"])
+        self.assertEqual(len(report["queries"]), 3)
+        bad = CliRunner().invoke(cli, ["replay", log_path, "-c", "0"])
+        self.assertNotEqual(bad.exit_code, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from tqdm import tqdm
+import math
+import random
+import time
+import unittest
+from typing import List
+
+import numpy as np
+
+from pathfinding.flow_field import compute_flow_field
+from pathfinding.grid import GridMap
+from pathfinding.heuristics import step_cost
+from pathfinding.reachability import BoundedDijkstra, reachable_within
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+class BoundedDijkstraTests(unittest.TestCase):
+    def check_queries(self, grid, queries: int, max_budget: float) -> None:
+        ranges = BoundedDijkstra(grid)
+        for i in range(queries):
+            start = free_cell(grid)
+            budget = random.uniform(0.0, max_budget)
+            distance = compute_flow_field(grid, start).distance
+            with self.subTest(i=i, start=start, budget=budget):
+                mask, cost, _, _ = ranges.search(start, budget, track_parents=True)
+                expected = distance <= budget
+                self.assertTrue(np.array_equal(mask, expected))
+                self.assertTrue(np.allclose(cost[mask], distance[mask]))
+                self.assertTrue(np.all(np.isinf(cost[~mask])))
+
+                ys, xs = np.nonzero(mask)
+                for x, y in random.sample(list(zip(xs.tolist(), ys.tolist())), min(5, len(xs))):
+                    path = ranges.path_to((x, y))
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], (x, y))
+                    if isinstance(grid, WeightedGridMap):
+                        total = sum(grid.transition_cost(*a, *b) for a, b in zip(path, path[1:]))
+                    else:
+                        total = sum(step_cost(b[0] - a[0], b[1] - a[1]) for a, b in zip(path, path[1:]))
+                    self.assertTrue(math.isclose(total, cost[y, x], rel_tol=1e-6, abs_tol=1e-6))
+
+    def test_unweighted_matches_full_dijkstra(self) -> None:
+        random.seed(33)
+        self.check_queries(generate_random_grid(40, 40, 0.25), queries=20, max_budget=25.0)
+
+    def test_weighted_matches_full_dijkstra(self) -> None:
+        random.seed(34)
+        self.check_queries(generate_random_weighted_grid(40, 40, 0.2), queries=20, max_budget=40.0)
+
+    def test_buffers_are_reused_and_reset(self) -> None:
+        grid = GridMap.from_ascii(["......", "......", "......"])
+        ranges = BoundedDijkstra(grid)
+        buffer = ranges.cost
+        mask, _, _, _ = ranges.search((0, 0), 10.0)
+        self.assertEqual(int(mask.sum()), 18)
+        mask, cost, _, _ = ranges.search((5, 2), 1.0)
+        self.assertIs(cost, buffer)
+        self.assertIs(mask, ranges.mask)
+        self.assertEqual(int(mask.sum()), 3)
+        self.assertTrue(np.array_equal(mask, np.isfinite(cost)))
+        with self.assertRaises(ValueError):
+            ranges.path_to((5, 1))
+        mask, cost, _, _ = reachable_within(grid, (0, 0), 0.0)
+        self.assertEqual(int(mask.sum()), 1)
+        self.assertIsNot(cost, buffer)
+
+    def test_latency_reused_vs_fresh(self) -> None:
+        random.seed(35)
+        rows = []
+        for n in tqdm([128, 256, 512], desc="Sizes", leave=False):
+            grid = generate_random_weighted_grid(n, n, 0.2)
+            ranges = BoundedDijkstra(grid)
+            for budget in (5.0, 15.0, 40.0):
+                starts = [free_cell(grid) for _ in range(10)]
+                start_time = time.perf_counter()
+                for start in starts:
+                    ranges.search(start, budget)
+                reused = (time.perf_counter() - start_time) / len(starts)
+                start_time = time.perf_counter()
+                for start in starts:
+                    reachable_within(grid, start, budget)
+                fresh = (time.perf_counter() - start_time) / len(starts)
+                rows.append({"n": n, "budget": budget, "mean_reused_time": reused, "mean_fresh_time": fresh})
+        save_rows(rows, "test_reachability_latency")
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import random
+import unittest
+from collections import defaultdict
+from typing import List
+
+from pathfinding.astar import AStarSearch, astar_search
+from pathfinding.astarw import AStarWSearch, astarw_search
+from pathfinding.engines import INSTRUMENTED_ENGINES, get_engine
+from pathfinding.grid import GridMap
+from pathfinding import jps, jpsw
+from pathfinding.jps import DIRECTIONS_8, jump_point_search
+from pathfinding.jpsw import jump_point_search_weighted
+from pathfinding.stats import SearchStats, mean_stats
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import run_search_stats, save_stats
+
+WEIGHTS = {".": 1.0, ",": 2.0, "~": 4.0}
+
+
+def random_rows(rng: random.Random, n: int, block_prob: float) -> List[str]:
+    return ["".join("#" if rng.random() < block_prob else rng.choice("..,~") for _ in range(n)) for _ in range(n)]
+
+
+class SearchStatsTests(unittest.TestCase):
+    def test_instrumented_runs_match_plain_runs(self) -> None:
+        rng = random.Random(0)
+        search_stats = defaultdict(list)
+        for prob in (0.1, 0.3):
+            for _ in range(15):
+                rows = random_rows(rng, 32, prob)
+                grid, wgrid = GridMap.from_ascii(rows), WeightedGridMap.from_ascii(rows, WEIGHTS)
+                free = [(x, y) for y in range(32) for x in range(32) if rows[y][x] != "#"]
+                start, goal = rng.choice(free), rng.choice(free)
+                for name, search, g in (
+                    ("astar", astar_search, grid),
+                    ("jps", jump_point_search, grid),
+                    ("astarw", astarw_search, wgrid),
+                    ("jpsw", jump_point_search_weighted, wgrid),
+                ):
+                    plain = search(g, start, goal)
+                    path, cost = run_search_stats(search, name, g, start, goal, search_stats, prob=prob)
+                    stats = search_stats[f"{name} | prob={prob}"][-1]
+                    self.assertEqual((path, cost), tuple(plain[:2]))
+                    self.assertEqual(stats.expanded, plain[2])
+                    self.assertGreaterEqual(stats.pops, stats.expanded)
+                    self.assertGreaterEqual(stats.pushes, stats.pops - stats.stale_pops)
+                    self.assertGreater(stats.search_time, 0.0)
+                    if name.startswith("jps") and stats.expanded > 1:
+                        self.assertGreater(stats.jump_calls, 0)
+                        self.assertGreaterEqual(stats.jump_steps, stats.jump_calls - 8 * stats.expanded)
+                    if name == "jpsw" and stats.expanded > 1:
+                        self.assertGreater(stats.local_dijkstra_runs, 0)
+                    if not name.startswith("jps"):
+                        self.assertEqual(stats.jump_calls, 0)
+        save_stats(search_stats, "search_stats_random")
+
+    def test_plain_search_is_not_instrumented(self) -> None:
+        grid = GridMap.from_ascii(["....", "....", "...."])
+        search = AStarSearch(grid, (0, 0), (3, 2))
+        self.assertIsNone(search.stats)
+        self.assertNotIn("_search", vars(search))
+        stats = SearchStats()
+        search = AStarSearch(grid, (0, 0), (3, 2), stats)
+        search.step(1)
+        search.run()
+        self.assertEqual(stats.expanded, search.expanded)
+        self.assertAlmostEqual(stats.total_time, search.elapsed_time, delta=1e-4)
+
+    def test_astar_counts_reopened_entries_as_stale(self) -> None:
+        # Obstacles make A* lower the g of queued cells, leaving outdated heap
+        # entries behind; both A* variants must skip and count them alike.
+        rng = random.Random(1)
+        rows = random_rows(rng, 40, 0.3)
+        grid, wgrid = GridMap.from_ascii(rows), WeightedGridMap.from_ascii(rows, WEIGHTS)
+        free = [(x, y) for y in range(40) for x in range(40) if rows[y][x] != "#"]
+        for search_cls, g in ((AStarSearch, grid), (AStarWSearch, wgrid)):
+            stale = 0
+            for _ in range(10):
+                stats = SearchStats()
+                search = search_cls(g, rng.choice(free), rng.choice(free), stats)
+                search.run()
+                self.assertEqual(stats.expanded, len(search.closed), search_cls.__name__)
+                self.assertEqual(stats.pops, stats.expanded + stats.stale_pops, search_cls.__name__)
+                stale += stats.stale_pops
+            self.assertGreater(stale, 0, search_cls.__name__)
+
+    def test_counting_jump_matches_jump(self) -> None:
+        rng = random.Random(45)
+        for _ in range(6):
+            rows = random_rows(rng, 24, 0.2)
+            grid, wgrid = GridMap.from_ascii(rows), WeightedGridMap.from_ascii(rows, WEIGHTS)
+            free = [(x, y) for y in range(24) for x in range(24) if rows[y][x] != "#"]
+            goal = rng.choice(free)
+            for module, g in ((jps, grid), (jpsw, wgrid)):
+                for _ in range(60):
+                    (x, y), (dx, dy) = rng.choice(free), rng.choice(DIRECTIONS_8)
+                    stats = SearchStats()
+                    jp = module.counting_jump(stats)(g, x, y, dx, dy, goal)
+                    self.assertEqual(jp, module.jump(g, x, y, dx, dy, goal), (module.__name__, x, y, dx, dy))
+                    self.assertGreaterEqual(stats.jump_calls, 1)
+                    if jp is not None and (dx == 0 or dy == 0):
+                        self.assertEqual(stats.jump_steps, max(abs(jp[0] - x), abs(jp[1] - y)))
+
+    def test_mean_stats(self) -> None:
+        means = mean_stats([SearchStats(expanded=2, pushes=4), SearchStats(expanded=4, pushes=6)])
+        self.assertEqual(means["expanded"], 3)
+        self.assertEqual(means["pushes"], 5)
+        self.assertEqual(SearchStats(expanded=1).add(SearchStats(expanded=2)).expanded, 3)
+        with self.assertRaises(ValueError):
+            mean_stats([])
+
+    def test_registry_engines_accept_stats(self) -> None:
+        grid = GridMap.from_ascii(["...", "...", "..."])
+        wgrid = WeightedGridMap.from_ascii(["...", "...", "..."], WEIGHTS)
+        for name in INSTRUMENTED_ENGINES:
+            search, weighted = get_engine(name)
+            stats = SearchStats()
+            search(wgrid if weighted else grid, (0, 0), (2, 2), stats=stats)
+            self.assertGreater(stats.expanded, 0, name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+
+from pathfinding import cli, trace as trace_cli
+from pathfinding.astar import AStarSearch, astar_search
+from pathfinding.epea import EPEASearch
+from pathfinding.engines import INSTRUMENTED_ENGINES, get_engine
+from pathfinding.grid import GridMap
+from pathfinding.jps import jump_point_search
+from pathfinding.trace import SearchTrace, TraceData, diff_traces, load_trace, trace_search
+from pathfinding.weighted_grid import WeightedGridMap
+
+WEIGHTS = {".": 1.0, ",": 2.0, "~": 4.0}
+EXAMPLE_MAP = os.path.join(os.path.dirname(__file__), os.pardir, "maps", "example", "grid.map")
+
+
+def random_rows(rng: random.Random, n: int, block_prob: float):
+    return ["".join("#" if rng.random() < block_prob else rng.choice("..,~") for _ in range(n)) for _ in range(n)]
+
+
+class SearchTraceTests(unittest.TestCase):
+    def test_traces_follow_the_search(self) -> None:
+        rng = random.Random(3)
+        for _ in range(10):
+            rows = random_rows(rng, 30, 0.2)
+            grids = {False: GridMap.from_ascii(rows), True: WeightedGridMap.from_ascii(rows, WEIGHTS)}
+            free = [(x, y) for y in range(30) for x in range(30) if rows[y][x] != "#"]
+            start, goal = rng.choice(free), rng.choice(free)
+            for engine in sorted(INSTRUMENTED_ENGINES):
+                search, weighted = get_engine(engine)
+                plain = search(grids[weighted], start, goal)
+                result, recorded = trace_search(engine, grids[weighted], start, goal)
+                self.assertEqual(result[:3], plain[:3], engine)
+                expansions, jumps = recorded.to_arrays()
+                self.assertEqual(len(expansions), plain[2], engine)
+                if plain[2]:
+                    self.assertEqual(tuple(expansions[0][["x", "y"]]), start)
+                    self.assertEqual(expansions["g"][0], 0.0)
+                if plain[1] != float("inf"):
+                    self.assertEqual(tuple(expansions[-1][["x", "y"]]), goal)
+                    self.assertAlmostEqual(expansions["g"][-1], plain[1], places=9)
+                if engine.startswith("jps"):
+                    expanded = expansions[jumps["step"]]
+                    np.testing.assert_array_equal(expanded["x"], jumps["ox"])
+                    np.testing.assert_array_equal(expanded["y"], jumps["oy"])
+                else:
+                    self.assertEqual(len(jumps), 0)
+
+    def test_fringe_and_epea_trace_natively(self) -> None:
+        rows = random_rows(random.Random(5), 24, 0.15)
+        grids = {False: GridMap.from_ascii(rows), True: WeightedGridMap.from_ascii(rows, WEIGHTS)}
+        free = [(x, y) for y in range(24) for x in range(24) if rows[y][x] != "#"]
+        start, goal = free[0], free[-1]
+        for engine in ("fringe", "fringew", "epea", "epeaw"):
+            search, weighted = get_engine(engine)
+            plain = search(grids[weighted], start, goal)
+            result, recorded = trace_search(engine, grids[weighted], start, goal)
+            self.assertEqual(result[:3], plain[:3], engine)
+            expansions, jumps = recorded.to_arrays()
+            self.assertEqual(len(expansions), plain[2], engine)
+            self.assertEqual(tuple(expansions[0][["x", "y"]]), start)
+            self.assertEqual(expansions["g"][0], 0.0)
+            self.assertFalse(np.isnan(expansions["h"]).any())
+            self.assertEqual(len(jumps), 0)
+        # Only engines with a counted path get stats alongside a trace.
+        self.assertIsNone(EPEASearch(grids[False], start, goal, SearchTrace()).stats)
+        self.assertIsNotNone(AStarSearch(grids[False], start, goal, trace=SearchTrace()).stats)
+
+    def test_save_load_heatmap_and_diff(self) -> None:
+        grid = GridMap.from_ascii(["......", ".##...", "......", "...#..", "......"])
+        traces = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, search in (("astar", astar_search), ("jps", jump_point_search)):
+                recorded = SearchTrace()
+                search(grid, (0, 0), (5, 4), trace=recorded)
+                path = os.path.join(tmp, f"{name}.npz")
+                recorded.save(path, engine=name, width=grid.width, height=grid.height)
+                traces[name] = load_trace(path)
+                self.assertEqual(traces[name].meta["engine"], name)
+                self.assertEqual(len(traces[name].expansions), recorded.expansions)
+        astar, jps = traces["astar"], traces["jps"]
+        heat = astar.heatmap()
+        self.assertEqual(heat.shape, (5, 6))
+        self.assertEqual(int(heat.sum()), len(astar.expansions))
+        order = astar.first_expansion()
+        self.assertEqual(order[0, 0], 0)
+        self.assertEqual(int((order >= 0).sum()), int((heat > 0).sum()))
+        diff = diff_traces(astar, jps)
+        self.assertEqual(diff.both + diff.only_a, int((heat > 0).sum()))
+        self.assertEqual(int(diff.delta.sum()), len(jps.expansions) - len(astar.expansions))
+        self.assertEqual(diff_traces(astar, astar).overlap, 1.0)
+        empty = TraceData(astar.expansions[:0], astar.jumps[:0], {})
+        self.assertEqual(empty.shape, (0, 0))
+
+    def test_cli_records_and_renders(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = {}
+            for algorithm in ("astar", "jps"):
+                paths[algorithm] = os.path.join(tmp, f"{algorithm}.npz")
+                code = cli.main([
+                    "--map", EXAMPLE_MAP, "--start-x", "1", "--start-y", "1", "--goal-x", "1", "--goal-y", "7",
+                    "--algorithm", algorithm, "--trace", paths[algorithm],
+                ])
+                self.assertEqual(code, 0)
+            heatmap = os.path.join(tmp, "heat.png")
+            self.assertEqual(trace_cli.main(["heatmap", paths["astar"], "-o", heatmap]), 0)
+            self.assertTrue(os.path.isfile(heatmap))
+            diff = os.path.join(tmp, "diff.png")
+            self.assertEqual(trace_cli.main(["diff", paths["astar"], paths["jps"], "-o", diff]), 0)
+            self.assertTrue(os.path.isfile(diff))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import math
+import os
+import pickle
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+import psutil
+
+from pathfinding.astar import astar_search
+from pathfinding.astarw import astarw_search
+from pathfinding.grid import GridMap
+from pathfinding.jps import jump_point_search
+from pathfinding.jps_plus import JumpTable, jump_point_search_plus
+from pathfinding.jpsw import jump_point_search_weighted
+from pathfinding.shared_grid import SharedGrid, SharedGridHandle, acquire_grid, attached_count, release_grid
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+def _worker_uss_delta(handle: SharedGridHandle, pickled: bytes, use_shared: bool) -> int:
+    process = psutil.Process()
+    before = process.memory_full_info().uss
+    if use_shared:
+        grid = acquire_grid(handle).grid
+    else:
+        grid = pickle.loads(pickled)
+    # Touch every cell, as a search over the whole map would.
+    sum(1 for row in grid.walkable for cell in row if cell)
+    sum(w for row in grid.weights for w in row)
+    delta = process.memory_full_info().uss - before
+    if use_shared:
+        del grid
+        release_grid(handle)
+    return delta
+
+
+class SharedGridTests(unittest.TestCase):
+    def test_engines_on_attached_grid(self) -> None:
+        random.seed(30)
+        grid = generate_random_grid(48, 48, 0.25)
+        table = JumpTable(grid)
+        with SharedGrid(grid, tables=table.export_tables()) as shared:
+            attached = acquire_grid(shared.handle)
+            agrid = attached.grid
+            atable = JumpTable.from_tables(agrid, attached.tables)
+            for i in range(30):
+                start, goal = free_cell(grid), free_cell(grid)
+                with self.subTest(i=i, start=start, goal=goal):
+                    _, cost, _, _ = astar_search(grid, start, goal)
+                    for search in (astar_search, jump_point_search):
+                        _, shared_cost, _, _ = search(agrid, start, goal)
+                        self.assertTrue(math.isclose(cost, shared_cost) or cost == shared_cost)
+                    _, plus_cost, _, _ = jump_point_search_plus(atable, start, goal)
+                    self.assertTrue(math.isclose(cost, plus_cost) or cost == plus_cost)
+            del agrid, atable
+            release_grid(shared.handle)
+
+    def test_weighted_engines_on_attached_grid(self) -> None:
+        random.seed(31)
+        grid = generate_random_weighted_grid(40, 40, 0.2)
+        with SharedGrid(grid) as shared:
+            agrid = acquire_grid(shared.handle).grid
+            self.assertEqual(agrid.min_cell_cost(), grid.min_cell_cost())
+            for i in range(30):
+                start, goal = free_cell(grid), free_cell(grid)
+                with self.subTest(i=i, start=start, goal=goal):
+                    _, cost, _, _ = astarw_search(grid, start, goal)
+                    for search in (astarw_search, jump_point_search_weighted):
+                        _, shared_cost, _, _ = search(agrid, start, goal)
+                        self.assertTrue(math.isclose(cost, shared_cost, rel_tol=1e-6) or cost == shared_cost)
+            del agrid
+            release_grid(shared.handle)
+
+    def test_reference_counting_and_read_only(self) -> None:
+        grid = GridMap.from_ascii(["....", ".#..", "...."])
+        with SharedGrid(grid) as shared:
+            first = acquire_grid(shared.handle)
+            second = acquire_grid(shared.handle)
+            self.assertIs(first, second)
+            self.assertEqual(attached_count(), 1)
+            with self.assertRaises(TypeError):
+                first.grid.set_walkable(1, 1, True)
+
+            release_grid(shared.handle)
+            self.assertFalse(first.grid.is_walkable(1, 1))
+            release_grid(shared.handle)
+            self.assertEqual(attached_count(), 0)
+            with self.assertRaises(ValueError):
+                first.grid.is_walkable(0, 0)
+            with self.assertRaises(ValueError):
+                release_grid(shared.handle)
+
+    def test_worker_memory_is_flat(self) -> None:
+        random.seed(32)
+        grid = generate_random_weighted_grid(512, 512, 0.2)
+        pickled = pickle.dumps(grid)
+        rows = []
+        with SharedGrid(grid) as shared:
+            for workers in range(1, min(4, os.cpu_count() or 1) + 1):
+                for use_shared in (True, False):
+                    with ProcessPoolExecutor(max_workers=workers) as pool:
+                        futures = [
+                            pool.submit(_worker_uss_delta, shared.handle, pickled, use_shared) for _ in range(workers)
+                        ]
+                        deltas = [f.result() for f in futures]
+                    rows.append({
+                        "workers": workers,
+                        "mode": "shared" if use_shared else "pickle",
+                        "mean_uss_delta": sum(deltas) / len(deltas),
+                        "total_uss_delta": sum(deltas),
+                    })
+        save_rows(rows, "test_shared_grid__worker_memory")
+
+        for workers in {row["workers"] for row in rows}:
+            shared_row, pickle_row = [row for row in rows if row["workers"] == workers]
+            self.assertLess(shared_row["mean_uss_delta"], pickle_row["mean_uss_delta"] / 4)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+import unittest
+from typing import List
+
+from pathfinding.astar import AStarSearch, astar_search
+from pathfinding.astarw import AStarWSearch
+from pathfinding.grid import GridMap
+from pathfinding.heuristics import octile_distance
+from pathfinding.jps import JumpPointSearch
+from pathfinding.jpsw import JumpPointSearchWeighted
+from pathfinding.path_utils import expand_path
+from pathfinding.stepwise import StepwiseSearch
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+class StepwiseSearchTests(unittest.TestCase):
+    def check_engine(self, search_cls, grid, queries: int) -> None:
+        for i in range(queries):
+            start, goal = free_cell(grid), free_cell(grid)
+            with self.subTest(engine=search_cls.__name__, i=i, start=start, goal=goal):
+                one_shot = search_cls(grid, start, goal)
+                self.assertTrue(one_shot.run())
+                path, cost, expanded, _ = one_shot.result()
+
+                sliced = search_cls(grid, start, goal)
+                steps = 0
+                while not sliced.step(max_expansions=7):
+                    steps += 1
+                    self.assertLessEqual(sliced.expanded, 7 * steps)
+                    partial = sliced.partial_path()
+                    self.assertEqual(partial[0], start)
+                    full = expand_path(partial)
+                    for (x, y), (nx, ny) in zip(full, full[1:]):
+                        self.assertTrue(grid.valid_step(x, y, nx - x, ny - y))
+                    self.assertEqual(octile_distance(sliced.best_node, goal), octile_distance(partial[-1], goal))
+
+                self.assertEqual(sliced.result()[:3], (path, cost, expanded))
+                if path:
+                    self.assertEqual(sliced.partial_path(), path)
+
+    def test_unweighted_engines(self) -> None:
+        random.seed(35)
+        grid = generate_random_grid(40, 40, 0.25)
+        for search_cls in (AStarSearch, JumpPointSearch):
+            self.check_engine(search_cls, grid, queries=10)
+
+    def test_weighted_engines(self) -> None:
+        random.seed(36)
+        grid = generate_random_weighted_grid(30, 30, 0.2)
+        for search_cls in (AStarWSearch, JumpPointSearchWeighted):
+            self.check_engine(search_cls, grid, queries=6)
+
+    def test_time_budget_and_wrapper(self) -> None:
+        grid = GridMap.from_ascii(["." * 30] * 30)
+        search = AStarSearch(grid, (0, 0), (29, 29))
+        self.assertFalse(search.run(time_budget=0.0))
+        self.assertEqual(search.expanded, 0)
+        self.assertEqual(search.partial_path(), [(0, 0)])
+        self.assertTrue(search.run(time_budget=10.0))
+        self.assertTrue(search.step())
+        _, cost, expanded, _ = astar_search(grid, (0, 0), (29, 29))
+        self.assertEqual((search.cost, search.expanded), (cost, expanded))
+        self.assertTrue(math.isclose(cost, 29 * math.sqrt(2.0)))
+        with self.assertRaises(ValueError):
+            search.step(0)
+        with self.assertRaises(TypeError):
+            StepwiseSearch((0, 0), (29, 29))  # type: ignore[abstract]
+
+    def test_single_steps_cost_about_as_much_as_one_run(self) -> None:
+        # Driving a search one expansion at a time may add a constant per step,
+        # never work that grows with the closed set.
+        def best_time(drive) -> float:
+            times = []
+            for _ in range(3):
+                start_time = time.perf_counter()
+                drive()
+                times.append(time.perf_counter() - start_time)
+            return min(times)
+
+        def single_steps(search) -> None:
+            while not search.step(1):
+                pass
+
+        random.seed(38)
+        grid = generate_random_grid(120, 120, 0.25)
+        wgrid = generate_random_weighted_grid(120, 120, 0.25)
+        for search_cls, g in ((AStarSearch, grid), (JumpPointSearch, grid), (AStarWSearch, wgrid)):
+            start = free_cell(g)
+            while True:
+                goal = free_cell(g)
+                search = search_cls(g, start, goal)
+                search.run()
+                if search.path and abs(start[0] - goal[0]) + abs(start[1] - goal[1]) > 100:
+                    break
+            plain = best_time(lambda: search_cls(g, start, goal).run())
+            sliced = best_time(lambda: single_steps(search_cls(g, start, goal)))
+            self.assertLess(sliced, 3 * plain + 0.01, (search_cls.__name__, search.expanded))
+
+    def test_frame_budget_time_slicing(self) -> None:
+        random.seed(37)
+        rows = []
+        grid = generate_random_grid(160, 160, 0.2)
+        for agents in (10, 50):
+            for frame_budget in (0.002, 0.008):
+                searches = [JumpPointSearch(grid, free_cell(grid), free_cell(grid)) for _ in range(agents)]
+                frames = 0
+                worst_frame = 0.0
+                pending = list(searches)
+                while pending:
+                    frames += 1
+                    frame_start = time.perf_counter()
+                    slice_budget = frame_budget / len(pending)
+                    pending = [s for s in pending if not s.run(time_budget=slice_budget)]
+                    worst_frame = max(worst_frame, time.perf_counter() - frame_start)
+                rows.append({
+                    "agents": agents,
+                    "frame_budget": frame_budget,
+                    "frames": frames,
+                    "worst_frame": worst_frame,
+                    "total_search_time": sum(s.elapsed_time for s in searches),
+                })
+        save_rows(rows, "stepwise_frame_slicing")
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from tqdm import tqdm
+import math
+import os
+import random
+import unittest
+from collections import defaultdict
+from pathlib import Path
+from typing import Iterable, List
+
+from pathfinding.engines import get_engine
+from pathfinding.grid import GridMap, load_scenarios
+from pathfinding.suboptimal import BOUNDED_ENGINES, get_bounded_engine
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import get_mean_and_ci95, save_rows
+
+
+MAPS_ROOT = os.path.join(os.path.dirname(os.path.dirname(__file__)), "maps")
+
+SCEN_DIRS: List[str] = [
+    "maze-scen",
+    "random-scen",
+    "room-scen",
+]
+
+EPSILONS: List[float] = [0.0, 0.05, 0.1, 0.25, 0.5, 1.0]
+MAX_PROBLEMS_PER_SCEN = 3
+
+
+def _iter_scen_files() -> Iterable[str]:
+    for scen_dir in SCEN_DIRS:
+        full_dir = os.path.join(MAPS_ROOT, scen_dir)
+        if not os.path.isdir(full_dir):
+            continue
+        for name in sorted(os.listdir(full_dir)):
+            if name.lower().endswith(".scen"):
+                yield os.path.join(full_dir, name)
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+class BoundedSuboptimalTests(unittest.TestCase):
+    def check_bounds(self, grid, algorithm: str, mode: str, queries: int) -> None:
+        optimal, _ = get_engine(algorithm)
+        bounded = get_bounded_engine(algorithm, mode)
+        for i in range(queries):
+            start, goal = free_cell(grid), free_cell(grid)
+            _, cost_opt, _, _ = optimal(grid, start, goal)
+            for epsilon in EPSILONS:
+                with self.subTest(algorithm=algorithm, mode=mode, i=i, epsilon=epsilon):
+                    path, cost, _, _, bound = bounded(grid, start, goal, epsilon)
+                    self.assertLessEqual(bound, 1.0 + epsilon + 1e-9)
+                    self.assertGreaterEqual(bound, 1.0)
+                    if math.isinf(cost_opt):
+                        self.assertFalse(path)
+                        continue
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], goal)
+                    self.assertLessEqual(cost, bound * cost_opt + 1e-6)
+                    if epsilon == 0.0:
+                        self.assertTrue(math.isclose(cost, cost_opt, rel_tol=1e-6, abs_tol=1e-6))
+
+    def test_unweighted_bounds(self) -> None:
+        random.seed(34)
+        grid = generate_random_grid(48, 48, 0.25)
+        for algorithm, mode in (("astar", "wastar"), ("astar", "focal"), ("jps", "wastar")):
+            self.check_bounds(grid, algorithm, mode, queries=10)
+
+    def test_weighted_bounds(self) -> None:
+        random.seed(35)
+        grid = generate_random_weighted_grid(28, 28, 0.2)
+        for algorithm, mode in (("astarw", "wastar"), ("astarw", "focal"), ("jpsw", "wastar")):
+            self.check_bounds(grid, algorithm, mode, queries=5)
+
+    def test_invalid_arguments(self) -> None:
+        grid = GridMap.from_ascii(["..", ".."])
+        with self.assertRaises(ValueError):
+            get_bounded_engine("jps", "focal")
+        with self.assertRaises(ValueError):
+            get_bounded_engine("astar", "wastar")(grid, (0, 0), (1, 1), -0.1)
+
+    def test_tradeoff_on_movingai(self) -> None:
+        problems = []
+        for scen_path in _iter_scen_files():
+            scen_dir = Path(scen_path).parent.stem.split("-")[0]
+            problems.extend((scen_dir, prob) for prob in load_scenarios(scen_path)[-MAX_PROBLEMS_PER_SCEN:])
+        if not problems:
+            self.skipTest("MovingAI .scen sets are not available")
+
+        grids = {}
+        measures = defaultdict(lambda: defaultdict(list))
+        for scen_dir, prob in tqdm(problems, desc="Problems", leave=False):
+            if prob.map_path not in grids:
+                grids[prob.map_path] = GridMap.from_movingai_map(prob.map_path)
+            grid = grids[prob.map_path]
+            start, goal = (prob.start_x, prob.start_y), (prob.goal_x, prob.goal_y)
+            for (algorithm, mode), search in BOUNDED_ENGINES.items():
+                if algorithm not in {"astar", "jps"}:
+                    continue
+                for epsilon in EPSILONS:
+                    _, cost, expanded, elapsed_time, bound = search(grid, start, goal, epsilon)
+                    if math.isinf(cost) or prob.optimal_length <= 0:
+                        continue
+                    key = (scen_dir, algorithm, mode, epsilon)
+                    measures[key]["times"].append(elapsed_time)
+                    measures[key]["expanded"].append(expanded)
+                    measures[key]["cost_ratio"].append(cost / prob.optimal_length)
+                    measures[key]["bound"].append(bound)
+
+        rows = []
+        for (scen_dir, algorithm, mode, epsilon), values in measures.items():
+            row = {"scen_dir": scen_dir, "search_name": f"{algorithm}-{mode}", "epsilon": epsilon}
+            for metric in ("times", "expanded", "cost_ratio"):
+                mean, ci95 = get_mean_and_ci95(values[metric])
+                row[f"mean_{metric}"] = mean
+                row[f"ci95_{metric}"] = ci95
+            row["max_bound"] = max(values["bound"])
+            rows.append(row)
+        save_rows(rows, "suboptimal_tradeoff_movingai")
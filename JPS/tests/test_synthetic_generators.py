@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from click.testing import CliRunner
+
+from benchmarks import generators
+from benchmarks.__main__ import cli
+from benchmarks.generators import BLOCKED, GENERATORS, TERRAIN_WEIGHTS, generate, optimal_lengths, sample_queries, write_map_set
+from pathfinding.astar import astar_search
+from pathfinding.astarw import astarw_search
+from pathfinding.grid import GridMap, load_scenarios
+from pathfinding.weighted_grid import WeightedGridMap
+
+
+class SyntheticGeneratorTests(unittest.TestCase):
+    def test_generators_are_seeded(self) -> None:
+        for generator in GENERATORS:
+            first = generate(generator, 50, 30, 0.2, seed=7)
+            self.assertEqual(first.shape, (30, 50))
+            np.testing.assert_array_equal(first, generate(generator, 50, 30, 0.2, seed=7))
+            self.assertFalse(np.array_equal(first, generate(generator, 50, 30, 0.2, seed=8)), generator)
+
+    def test_oracle_matches_astar(self) -> None:
+        for generator in GENERATORS:
+            for density in (0.0, 0.25):
+                codes = generate(generator, 36, 28, density, seed=3)
+                queries = sample_queries(codes, 12, np.random.default_rng(5))
+                lengths = optimal_lengths(codes, queries)
+                rows = [row.tobytes().decode("ascii") for row in codes]
+                weighted = WeightedGridMap.from_ascii(rows, TERRAIN_WEIGHTS)
+                unit = GridMap.from_ascii([row.replace("@", "#") for row in rows])
+                for (start, goal), length in zip(queries, lengths):
+                    checks = [astarw_search(weighted, start, goal)[1]]
+                    if generator != "terrain":
+                        checks.append(astar_search(unit, start, goal)[1])
+                    for cost in checks:
+                        if math.isinf(length):
+                            self.assertTrue(math.isinf(cost))
+                        else:
+                            self.assertAlmostEqual(cost, length, places=6, msg=f"{generator} {start}->{goal}")
+
+    def test_oracle_graph_is_compact_and_batch_independent(self) -> None:
+        codes = generate("terrain", 40, 24, 0.2, seed=4)
+        graph = generators._grid_graph(generators.cell_weights(codes))
+        self.assertEqual(graph.indices.dtype, np.int32)
+        self.assertEqual(graph.indptr.dtype, np.int32)
+        self.assertEqual((graph != graph.T).nnz, 0)
+        queries = sample_queries(codes, 20, np.random.default_rng(6))
+        lengths = optimal_lengths(codes, queries)
+        with mock.patch.object(generators, "GRAPH_BAND_CELLS", 7), mock.patch.object(generators, "ORACLE_BATCH_BYTES", 1):
+            self.assertEqual(optimal_lengths(codes, queries), lengths)
+
+    def test_written_files_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            scen_path = write_map_set(tmp, "rooms", 48, 0.1, seed=2, queries=10)
+            problems = load_scenarios(scen_path)
+            self.assertTrue(problems)
+            grid = GridMap.from_movingai_map(problems[0].map_path)
+            weighted = WeightedGridMap.from_movingai_map(problems[0].map_path)
+            codes = generate("rooms", 48, 48, 0.1, seed=2)
+            for prob in problems:
+                self.assertNotEqual(codes[prob.start_y, prob.start_x], BLOCKED)
+                _, cost, _, _ = astar_search(grid, (prob.start_x, prob.start_y), (prob.goal_x, prob.goal_y))
+                self.assertAlmostEqual(cost, prob.optimal_length, places=6)
+                _, cost, _, _ = astarw_search(weighted, (prob.start_x, prob.start_y), (prob.goal_x, prob.goal_y))
+                self.assertAlmostEqual(cost, prob.optimal_length, places=6)
+
+    def test_sweep_command(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = CliRunner().invoke(cli, [
+                "sweep", "-g", "maze", "--size", "24", "--size", "32", "--density", "0.1",
+                "-e", "astar", "-e", "jps", "--queries", "3", "--repeat", "1",
+                "--cache-dir", tmp, "--title", "test_sweep_maze",
+            ])
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertTrue(os.path.isfile(os.path.join(tmp, "terrain_weights.json")))
+        self.assertIn("Saved scaling plot", result.output)
+
+
+if __name__ == "__main__":
+    unittest.main()
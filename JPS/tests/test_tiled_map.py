@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import math
+import os
+import random
+import resource
+import tempfile
+import unittest
+from typing import List
+
+import psutil
+from tqdm import trange
+
+from pathfinding.engines import get_engine
+from pathfinding.grid import GridMap
+from pathfinding.tiled_map import COMPRESSIONS, TiledMap, convert_movingai_map, plan_corridor, write_tiled_map
+from pathfinding.weighted_grid import WeightedGridMap
+
+from benchmarks.helpers import save_rows
+
+
+EXAMPLE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "maps", "example")
+
+
+def generate_random_grid(width: int, height: int, block_prob: float) -> GridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join("." if random.random() > block_prob else "#" for _ in range(width)))
+    return GridMap.from_ascii(rows)
+
+
+def generate_random_weighted_grid(width: int, height: int, block_prob: float) -> WeightedGridMap:
+    rows: List[str] = []
+    for _ in range(height):
+        rows.append("".join(random.choice("...,,~") if random.random() > block_prob else "#" for _ in range(width)))
+    return WeightedGridMap.from_ascii(rows, {".": 1.0, ",": 2.0, "~": 4.0})
+
+
+def free_cell(grid) -> tuple:
+    while True:
+        x, y = random.randrange(grid.width), random.randrange(grid.height)
+        if grid.is_walkable(x, y):
+            return x, y
+
+
+def write_random_movingai_map(path: str, size: int, block_prob: float) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"type octile\nheight {size}\nwidth {size}\nmap\n")
+        for _ in range(size):
+            f.write("".join("." if random.random() > block_prob else "@" for _ in range(size)) + "\n")
+
+
+class TiledMapTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def check_engines(self, grid, algorithms, queries: int) -> None:
+        for compression in COMPRESSIONS:
+            out_dir = os.path.join(self.tmp.name, compression)
+            write_tiled_map(grid, out_dir, tile_size=8, compression=compression)
+            with TiledMap(out_dir, cache_tiles=4) as tiled:
+                for y in range(grid.height):
+                    for x in range(grid.width):
+                        self.assertEqual(tiled.is_walkable(x, y), grid.is_walkable(x, y))
+                for i in range(queries):
+                    start, goal = free_cell(grid), free_cell(grid)
+                    for algorithm in algorithms:
+                        with self.subTest(compression=compression, algorithm=algorithm, i=i):
+                            search, _ = get_engine(algorithm)
+                            _, cost_ref, _, _ = search(grid, start, goal)
+                            _, cost, _, _ = search(tiled, start, goal)
+                            if math.isinf(cost_ref):
+                                self.assertTrue(math.isinf(cost))
+                            else:
+                                self.assertTrue(math.isclose(cost_ref, cost, rel_tol=1e-6, abs_tol=1e-6))
+                self.assertGreater(tiled.evictions, 0)
+
+    def test_unweighted_engines_read_through_tiles(self) -> None:
+        random.seed(40)
+        self.check_engines(generate_random_grid(37, 29, 0.3), ("astar", "jps"), queries=8)
+
+    def test_weighted_engines_read_through_tiles(self) -> None:
+        random.seed(41)
+        self.check_engines(generate_random_weighted_grid(30, 26, 0.2), ("astarw", "jpsw"), queries=6)
+
+    def test_convert_matches_loaders(self) -> None:
+        grid_path = os.path.join(EXAMPLE_DIR, "grid.map")
+        weighted_path = os.path.join(EXAMPLE_DIR, "weighted_grid.map")
+        terrain_path = os.path.join(EXAMPLE_DIR, "terrain_weights.json")
+        grid = GridMap.from_movingai_map(grid_path)
+        wgrid = WeightedGridMap.from_movingai_map(weighted_path, terrain_weights_path=terrain_path)
+        convert_movingai_map(grid_path, os.path.join(self.tmp.name, "grid"), tile_size=16)
+        convert_movingai_map(
+            weighted_path, os.path.join(self.tmp.name, "weighted"), tile_size=16, weighted=True, terrain_weights_path=terrain_path
+        )
+        with TiledMap(os.path.join(self.tmp.name, "grid")) as tiled:
+            self.assertEqual((tiled.width, tiled.height), (grid.width, grid.height))
+            for y in range(grid.height):
+                self.assertEqual([tiled.walkable[y][x] for x in range(grid.width)], grid.walkable[y])
+        with TiledMap(os.path.join(self.tmp.name, "weighted")) as tiled:
+            self.assertEqual(tiled.min_cell_cost(), wgrid.min_cell_cost())
+            for y in range(wgrid.height):
+                self.assertEqual([tiled.weights[y][x] for x in range(wgrid.width)], wgrid.weights[y])
+
+    def test_corridor_planner(self) -> None:
+        random.seed(42)
+        grid = generate_random_grid(96, 96, 0.25)
+        out_dir = os.path.join(self.tmp.name, "corridor")
+        write_tiled_map(grid, out_dir, tile_size=8)
+        for i in range(10):
+            start, goal = free_cell(grid), free_cell(grid)
+            with self.subTest(i=i, start=start, goal=goal), TiledMap(out_dir) as tiled:
+                _, cost_ref, _, _ = get_engine("astar")[0](grid, start, goal)
+                plan = plan_corridor(tiled, start, goal)
+                if math.isinf(cost_ref):
+                    self.assertFalse(plan.path)
+                    continue
+                self.assertGreaterEqual(plan.cost, cost_ref - 1e-6)
+                self.assertEqual(plan.path[0], start)
+                self.assertEqual(plan.path[-1], goal)
+                for (x, y), (nx, ny) in zip(plan.path, plan.path[1:]):
+                    self.assertTrue(grid.valid_step(x, y, nx - x, ny - y))
+                self.assertEqual(plan.tile_loads, tiled.tile_loads)
+                self.assertLessEqual(plan.tile_loads, plan.corridor_tiles)
+        with TiledMap(out_dir) as tiled, self.assertRaises(ValueError):
+            plan_corridor(tiled, (0, 0), (1, 1), margin=-1)
+
+    def test_large_map_corridor_queries(self) -> None:
+        random.seed(43)
+        size, tile_size = 1024, 64
+        map_path = os.path.join(self.tmp.name, "large.map")
+        write_random_movingai_map(map_path, size, 0.15)
+        rows = []
+        for compression in COMPRESSIONS:
+            out_dir = os.path.join(self.tmp.name, f"large-{compression}")
+            convert_movingai_map(map_path, out_dir, tile_size=tile_size, compression=compression)
+            # Queries are drawn through a separate map so that sampling does not
+            # warm the tile cache of the planner.
+            with TiledMap(out_dir, cache_tiles=32) as sampler:
+                queries = [(free_cell(sampler), free_cell(sampler)) for _ in range(5)]
+            for i in trange(len(queries), desc=compression, leave=False):
+                with TiledMap(out_dir, cache_tiles=32) as tiled:
+                    start, goal = queries[i]
+                    plan = plan_corridor(tiled, start, goal)
+                    rows.append({
+                        "compression": compression,
+                        "query": i,
+                        "cost": plan.cost,
+                        "expanded": plan.expanded,
+                        "elapsed_time": plan.elapsed_time,
+                        "tile_loads": plan.tile_loads,
+                        "corridor_tiles": plan.corridor_tiles,
+                        "total_tiles": tiled.tiles_x * tiled.tiles_y,
+                        "attempts": plan.attempts,
+                        "rss_mb": psutil.Process().memory_info().rss / 2**20,
+                        # ru_maxrss is the peak of the whole test process so far.
+                        "process_peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+                    })
+        save_rows(rows, "tiled_map_corridor_queries")
+
+
+if __name__ == "__main__":
+    unittest.main()